@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to traverse STAC catalogs using the ML-AOI extension.
+"""
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+import pystac
+from pystac.utils import make_absolute_href
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Split, ML_AOI_SplitType, add_ml_aoi_prefix
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+
+
+def get_bbox_2d(bbox: Sequence[float]) -> List[float]:
+    """
+    Obtain the 2D ``[minx, miny, maxx, maxy]`` extent of a STAC bounding box, ignoring elevations of a 3D one.
+    """
+    if len(bbox) == 6:
+        return [bbox[0], bbox[1], bbox[3], bbox[4]]
+    return list(bbox)
+
+
+def resolve_ml_aoi_splits(split: Optional[Union[ML_AOI_SplitType, Iterable[ML_AOI_SplitType]]]) -> Optional[Set[str]]:
+    """
+    Obtain the values of one or more ML-AOI splits, or ``None`` when no split is requested.
+
+    Raises:
+        ValueError: If any of the splits is not a valid ML-AOI split.
+    """
+    if split is None:
+        return None
+    if isinstance(split, str):
+        split = [split]
+    return {ML_AOI_Split(_split).value for _split in split}
+
+
+def _get_collection_splits(data: dict[str, Any]) -> Optional[Set[str]]:
+    """
+    Obtain the splits declared by a STAC Collection from its summaries or its ``self`` link.
+    """
+    splits = (data.get("summaries") or {}).get(ML_AOI_SPLIT_FIELD)
+    if isinstance(splits, list):
+        return set(splits)
+    for link in data.get("links", []):
+        if link.get("rel") == pystac.RelType.SELF and ML_AOI_SPLIT_FIELD in link:
+            return {link[ML_AOI_SPLIT_FIELD]}
+    return None
+
+
+def iter_items_by_split(
+    root_href: str,
+    split: Optional[Union[ML_AOI_SplitType, Iterable[ML_AOI_SplitType]]] = ML_AOI_Split.TRAIN,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> Iterator[pystac.Item]:
+    """
+    Iterate lazily over the STAC Items of a catalog matching the requested ML-AOI split.
+
+    Catalogs and Collections are walked depth-first by reading their JSON documents one at a time, such that only the
+    pending links are kept in memory. Sub-catalogs are pruned without being opened when their ``child`` link defines
+    a mismatching ``ml-aoi:split``. Collections are also pruned, without opening any of their Items, when their
+    ``ml-aoi:split`` summaries, or the ``ml-aoi:split`` of their ``self`` link, do not contain the requested split.
+
+    Args:
+        root_href: Location of the root STAC Catalog, Collection or Item.
+        split: ML-AOI split, or splits, of Items to retrieve. If ``None``, all Items are returned.
+        stac_io: I/O implementation to read STAC documents. Uses the default :class:`pystac.StacIO` if omitted.
+    Yields:
+        Matched STAC Items.
+    """
+    stac_io = stac_io or pystac.StacIO.default()
+    splits = resolve_ml_aoi_splits(split)
+    pending = [make_absolute_href(root_href)]
+    visited = set()
+    while pending:
+        href = pending.pop()
+        data = stac_io.read_json(href)
+        if data.get("type") == "Feature":
+            if splits is None or data.get("properties", {}).get(ML_AOI_SPLIT_FIELD) in splits:
+                yield pystac.Item.from_dict(data, href=href, preserve_dict=False)
+            continue
+        if href in visited:
+            continue
+        visited.add(href)
+        collection_splits = _get_collection_splits(data)
+        skip_items = splits is not None and collection_splits is not None and not collection_splits & splits
+        links = []
+        for link in data.get("links", []):
+            rel = link.get("rel")
+            if rel == pystac.RelType.ITEM and skip_items:
+                continue
+            if rel == pystac.RelType.CHILD:
+                link_split = link.get(ML_AOI_SPLIT_FIELD)
+                if splits is not None and link_split is not None and link_split not in splits:
+                    continue
+            elif rel != pystac.RelType.ITEM:
+                continue
+            links.append(make_absolute_href(link["href"], href))
+        # reverse to preserve the original order of links with the stack
+        pending.extend(reversed(links))
+
+
+def iter_stac_hrefs(root_href: str, stac_io: Optional[pystac.StacIO] = None) -> Iterator[str]:
+    """
+    Iterate lazily over the locations of all STAC Catalogs, Collections and Items of a catalog.
+
+    Only Catalogs and Collections are read to discover their links. Item locations are returned without being opened.
+
+    Args:
+        root_href: Location of the root STAC Catalog, Collection or Item.
+        stac_io: I/O implementation to read STAC documents. Uses the default :class:`pystac.StacIO` if omitted.
+    Yields:
+        Absolute STAC document locations.
+    """
+    stac_io = stac_io or pystac.StacIO.default()
+    pending = [make_absolute_href(root_href)]
+    visited = set()
+    while pending:
+        href = pending.pop()
+        if href in visited:
+            continue
+        visited.add(href)
+        yield href
+        data = stac_io.read_json(href)
+        if data.get("type") == "Feature":
+            continue
+        links = []
+        for link in data.get("links", []):
+            rel = link.get("rel")
+            link_href = make_absolute_href(link["href"], href)
+            if rel == pystac.RelType.ITEM:
+                yield link_href
+            elif rel == pystac.RelType.CHILD:
+                links.append(link_href)
+        pending.extend(reversed(links))
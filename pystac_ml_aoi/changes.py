@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to track modifications of ML-AOI STAC objects, and to save only the modified ones.
+"""
+import dataclasses
+import weakref
+from typing import Any, Iterable, List, Optional, Set, Union
+
+import pystac
+
+from pystac_ml_aoi.extensions.ml_aoi import _ML_AOI_CHANGE_TRACKERS, add_ml_aoi_prefix
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+
+TrackedObject = Union[pystac.Catalog, pystac.Item]
+
+
+@dataclasses.dataclass
+class ML_AOI_Changes:
+    """
+    Modifications of a STAC Item or Collection recorded by an :class:`ML_AOI_ChangeTracker`.
+    """
+    fields: bool = False
+    """
+    Whether ML-AOI properties of the Item, or ML-AOI summaries of the Collection, were modified.
+    """
+    assets: Set[str] = dataclasses.field(default_factory=set)
+    """
+    Keys of Assets for which ML-AOI fields were modified.
+    """
+    previous_href: Optional[str] = None
+    """
+    Location of the object before its first change of location, if it was moved.
+    """
+
+
+class ML_AOI_ChangeTracker:
+    """
+    Records the STAC objects modified through the ML-AOI extension while the tracker is active.
+
+    Modifications of ML-AOI fields applied with :meth:`ML_AOI_Extension.set_ml_aoi_property`, typed field properties,
+    :meth:`ML_AOI_Extension.apply` or :meth:`ML_AOI_Extension.apply_many` are recorded for the modified Items,
+    Collections, and owners of modified Assets. Changes of location applied with the ``set_self_href`` method of
+    ML-AOI Item and Collection extensions are also recorded. Other modifications, including changes of location
+    applied directly to the STAC objects, such as by :meth:`pystac.Catalog.normalize_hrefs`, must be reported with
+    :meth:`record`.
+
+    Tracked objects are referenced weakly, such that tracking does not retain objects that are no longer used.
+    """
+
+    def __init__(self) -> None:
+        self._changes: "weakref.WeakKeyDictionary[TrackedObject, ML_AOI_Changes]" = weakref.WeakKeyDictionary()
+
+    def __enter__(self) -> "ML_AOI_ChangeTracker":
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def __contains__(self, obj: TrackedObject) -> bool:
+        return obj in self._changes
+
+    def start(self) -> None:
+        """
+        Starts recording modifications. The tracker must remain referenced to remain active.
+        """
+        _ML_AOI_CHANGE_TRACKERS.add(self)
+
+    def stop(self) -> None:
+        """
+        Stops recording modifications. Already recorded modifications are preserved.
+        """
+        _ML_AOI_CHANGE_TRACKERS.discard(self)
+
+    @property
+    def active(self) -> bool:
+        return self in _ML_AOI_CHANGE_TRACKERS
+
+    def record(self, obj: Union[TrackedObject, pystac.Asset], previous_href: Optional[str] = None) -> None:
+        """
+        Records the modification of a STAC object, or of an Asset for which its owner is considered modified.
+
+        Args:
+            obj: Modified STAC object or Asset.
+            previous_href: Location of the object before it was moved, if its location was modified.
+        """
+        if isinstance(obj, pystac.Asset):
+            owner = obj.owner
+            if not isinstance(owner, (pystac.Item, pystac.Collection)):
+                return
+            changes = self._changes.setdefault(owner, ML_AOI_Changes())
+            changes.assets.update(key for key, asset in owner.assets.items() if asset is obj)
+            return
+        changes = self._changes.setdefault(obj, ML_AOI_Changes())
+        if previous_href is None:
+            changes.fields = True
+        elif changes.previous_href is None:
+            changes.previous_href = previous_href
+
+    def get_changes(self, obj: TrackedObject) -> Optional[ML_AOI_Changes]:
+        """
+        Obtains the modifications recorded for the STAC object, if any.
+        """
+        return self._changes.get(obj)
+
+    @property
+    def modified(self) -> List[TrackedObject]:
+        """
+        STAC objects for which modifications were recorded.
+        """
+        return list(self._changes.keys())
+
+    def clear(self, objects: Optional[Iterable[TrackedObject]] = None) -> None:
+        """
+        Discards the recorded modifications of the STAC objects, or of all objects if omitted.
+        """
+        if objects is None:
+            self._changes.clear()
+            return
+        for obj in objects:
+            self._changes.pop(obj, None)
+
+
+def _include_self_link(obj: TrackedObject, catalog_type: Optional[pystac.CatalogType]) -> bool:
+    """
+    Indicates whether the object is saved with its ``self`` link, following :meth:`pystac.Catalog.save`.
+    """
+    if catalog_type == pystac.CatalogType.ABSOLUTE_PUBLISHED:
+        return True
+    if catalog_type == pystac.CatalogType.RELATIVE_PUBLISHED:
+        return obj.get_root() is obj
+    return False
+
+
+def _update_child_link_split(parent: pystac.Catalog, collection: pystac.Collection) -> bool:
+    """
+    Updates the ``ml-aoi:split`` of the parent ``child`` link of a Collection after its splits were modified.
+
+    Returns:
+        Whether the link was modified.
+    """
+    summaries = collection.summaries.get_list(ML_AOI_SPLIT_FIELD) or []
+    href = collection.get_self_href()
+    for link in parent.links:
+        if link.rel != pystac.RelType.CHILD or ML_AOI_SPLIT_FIELD not in link.extra_fields:
+            continue
+        if link.target is not collection and link.get_absolute_href() != href:
+            continue
+        if len(summaries) == 1:
+            if link.extra_fields[ML_AOI_SPLIT_FIELD] == summaries[0]:
+                return False
+            link.extra_fields[ML_AOI_SPLIT_FIELD] = summaries[0]
+        else:
+            del link.extra_fields[ML_AOI_SPLIT_FIELD]
+        return True
+    return False
+
+
+def save_ml_aoi_changes(
+    tracker: ML_AOI_ChangeTracker,
+    catalog_type: Optional[pystac.CatalogType] = None,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> List[str]:
+    """
+    Saves only the STAC objects modified since they were last saved, along with the parents referencing them.
+
+    Objects are written at their current self location. In addition to modified objects, the parent of a moved object
+    is rewritten since its link to the object changed, as well as the children of a moved Catalog or Collection, for
+    which links to their parent changed. The parent of a Collection is also rewritten when its ``child`` link defines
+    an ``ml-aoi:split`` that no longer matches the Collection summaries. Documents at previous locations of moved
+    objects are not removed. Saved objects are cleared from the tracker.
+
+    Args:
+        tracker: Tracker of modified STAC objects.
+        catalog_type:
+            Type of the catalog, which determines whether ``self`` links are written as in
+            :meth:`pystac.Catalog.save`. Defaults to the type of the root catalog of every object.
+        stac_io: I/O implementation to write STAC documents.
+    Returns:
+        Locations of the written STAC documents.
+    Raises:
+        pystac.STACError: If a modified object does not have any self location.
+    """
+    modified = tracker.modified
+    pending = {id(obj): obj for obj in modified}
+    for obj in modified:
+        changes = tracker.get_changes(obj)
+        parent = obj.get_parent()
+        if changes.previous_href is not None:
+            if parent is not None:
+                pending[id(parent)] = parent
+            if isinstance(obj, pystac.Catalog):
+                for child in [*obj.get_children(), *obj.get_items()]:
+                    pending[id(child)] = child
+        if changes.fields and isinstance(obj, pystac.Collection) and parent is not None:
+            if _update_child_link_split(parent, obj):
+                pending[id(parent)] = parent
+
+    hrefs = []
+    for obj in pending.values():
+        href = obj.get_self_href()
+        if href is None:
+            raise pystac.STACError(f"Self HREF must be set to save the modified STAC object '{obj.id}'.")
+        root = obj.get_root()
+        obj_type = catalog_type or (root.catalog_type if root is not None else None)
+        obj.save_object(include_self_link=_include_self_link(obj, obj_type), stac_io=stac_io)
+        hrefs.append(href)
+    tracker.clear(pending.values())
+    return hrefs
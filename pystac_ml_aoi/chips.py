@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to cut fixed-size training chips from ML-AOI Items on the pixel grid of their reference Asset.
+"""
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pystac
+import shapely
+
+from pystac_ml_aoi.extensions.ml_aoi import (
+    ML_AOI_Resampling,
+    ML_AOI_ResamplingType,
+    ML_AOI_Role,
+    ML_AOI_Split,
+    add_ml_aoi_prefix
+)
+from pystac_ml_aoi.grid import (
+    ML_AOI_Grid,
+    find_ml_aoi_reference_asset,
+    get_ml_aoi_grid,
+    get_ml_aoi_grid_window,
+    get_ml_aoi_read_windows,
+    plan_ml_aoi_alignment
+)
+from pystac_ml_aoi.resampling import resample_ml_aoi_array
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_CHIP_SIZE = 256
+
+ChipEdges = Literal["pad", "shift", "drop"]
+Window = Tuple[int, int, int, int]
+
+
+class ML_AOI_ChipAsset(NamedTuple):
+    """
+    Region of an Asset covered by a chip.
+    """
+    asset_key: str
+    role: Optional[ML_AOI_Role]
+    window: Tuple[float, float, float, float]
+    """
+    Exact ``(col_off, row_off, width, height)`` region of the Asset, in its own pixels, covered by the chip.
+    """
+    read_window: Window
+    """
+    Integer ``(col_off, row_off, width, height)`` pixels of the Asset to read, expanded to contain the exact window
+    and clipped to the Asset extent. Empty when the chip does not overlap the Asset.
+    """
+    resampling_method: ML_AOI_Resampling
+    aligned: bool
+    """
+    Whether the Asset could be aligned to the reference grid. See :class:`pystac_ml_aoi.grid.ML_AOI_AssetAlignment`.
+    """
+
+
+class ML_AOI_Chip(NamedTuple):
+    """
+    Fixed-size chip of an ML-AOI Item on the pixel grid of its reference Asset.
+    """
+    item_id: str
+    split: Optional[ML_AOI_Split]
+    reference_key: str
+    window: Window
+    """
+    Integer ``(col_off, row_off, width, height)`` pixels of the reference grid covered by the chip, which can extend
+    beyond the grid extent at its edges.
+    """
+    bounds: Tuple[float, float, float, float]
+    """
+    Bounding box of the chip, in the coordinates of the reference grid.
+    """
+    coverage: float
+    """
+    Fraction of the chip area within both the reference grid extent and the Item geometry.
+    """
+    assets: Dict[str, ML_AOI_ChipAsset]
+    """
+    Regions of the reference, feature and label Assets covered by the chip.
+    """
+    mask: Optional[np.ndarray]
+    """
+    Chip pixels within both the reference grid extent and the Item geometry, if requested.
+    """
+
+
+class ML_AOI_ChipArrays(NamedTuple):
+    """
+    Arrays of the Assets of an ML-AOI Item chip, aligned on the reference grid.
+    """
+    chip: ML_AOI_Chip
+    arrays: Dict[str, np.ma.MaskedArray]
+    """
+    Arrays of shape ``(..., size, size)`` of aligned Assets, masked outside the Asset extent and the Item geometry.
+    """
+
+
+ML_AOI_ArrayReader = Callable[[pystac.Item, str, Window], np.ndarray]
+"""
+Reads the ``(col_off, row_off, width, height)`` pixels of an Item Asset as an array of shape ``(..., height, width)``.
+Invalid pixels can be indicated by returning a masked array.
+"""
+
+
+class ML_AOI_NumpyArrayReader:
+    """
+    Array reader of Item Assets loaded in memory, such as local arrays or memory-mapped files.
+    """
+
+    def __init__(self, arrays: Mapping[str, Mapping[str, np.ndarray]]) -> None:
+        """
+        Args:
+            arrays: Arrays of shape ``(..., rows, cols)``, by Item ID and Asset key.
+        """
+        self.arrays = arrays
+
+    def __call__(self, item: pystac.Item, asset_key: str, window: Window) -> np.ndarray:
+        col_off, row_off, width, height = window
+        return self.arrays[item.id][asset_key][..., row_off:row_off + height, col_off:col_off + width]
+
+
+def _get_chip_geometry(item: pystac.Item, asset: pystac.Asset, grid: ML_AOI_Grid) -> Optional[shapely.Geometry]:
+    """
+    Obtains the Item geometry in the coordinates of the reference grid.
+
+    The ``proj:geometry`` of the Projection Extension is used when available. Otherwise, the Item geometry can only be
+    used with reference grids in geographic coordinates, since it would require a reprojection.
+    """
+    fields = {**item.properties, **asset.extra_fields}
+    if fields.get("proj:geometry"):
+        return shapely.geometry.shape(fields["proj:geometry"])
+    if item.geometry is not None and grid.epsg in (None, 4326):
+        return shapely.geometry.shape(item.geometry)
+    return None
+
+
+def _get_chip_offsets(start: int, length: int, extent: int, size: int, stride: int, edges: ChipEdges) -> List[int]:
+    """
+    Obtains the chip offsets along one axis, such that chips cover the requested range.
+    """
+    count = 1 if length <= size else math.ceil((length - size) / stride) + 1
+    offsets = start + stride * np.arange(count if length > 0 else 0)
+    if edges == "shift":
+        offsets = np.unique(np.clip(offsets, 0, max(extent - size, 0)))
+    elif edges == "drop":
+        offsets = offsets[offsets + size <= extent]
+    return offsets.tolist()
+
+
+def _get_chip_mask(grid: ML_AOI_Grid, window: Window, geometry: Optional[shapely.Geometry]) -> np.ndarray:
+    a, _, c, _, e, f = grid.transform
+    rows, cols = grid.shape
+    col_off, row_off, width, height = window
+    col = np.arange(col_off, col_off + width)
+    row = np.arange(row_off, row_off + height)
+    mask = ((row >= 0) & (row < rows))[:, None] & ((col >= 0) & (col < cols))[None, :]
+    if geometry is not None:
+        x, y = np.meshgrid(c + a * (col + 0.5), f + e * (row + 0.5))
+        mask &= shapely.contains_xy(geometry, x, y)
+    return mask
+
+
+def _iter_item_chips(
+    item: pystac.Item,
+    size: int,
+    stride: int,
+    edges: ChipEdges,
+    min_coverage: float,
+    use_geometry: bool,
+    masks: bool,
+    default_resampling: ML_AOI_ResamplingType,
+) -> Iterator[ML_AOI_Chip]:
+    ref_key = find_ml_aoi_reference_asset(item)
+    ref_asset = item.assets[ref_key] if ref_key is not None else None
+    grid = get_ml_aoi_grid(ref_asset, item) if ref_asset is not None else None
+    if grid is None:
+        return
+    if grid.transform[0] == 0 or grid.transform[4] == 0:
+        raise ValueError(
+            f"Invalid 'proj:transform' of reference Asset '{ref_key}' of Item '{item.id}' "
+            f"defining pixels of zero width or height: {grid.transform}."
+        )
+    split = item.properties.get(ML_AOI_SPLIT_FIELD)
+    split = ML_AOI_Split(split) if split is not None else None
+    rows, cols = grid.shape
+
+    # restrict the chips to the Item geometry, for which only intersection tests are repeated
+    geometry = _get_chip_geometry(item, ref_asset, grid) if use_geometry else None
+    extent = shapely.box(*grid.bounds)
+    if geometry is not None:
+        extent = shapely.intersection(extent, geometry)
+        if extent.is_empty:
+            return
+        shapely.prepare(extent)
+        col_off, row_off, width, height = get_ml_aoi_grid_window(grid, extent.bounds)
+    else:
+        col_off, row_off, width, height = 0, 0, cols, rows
+
+    # all Assets are aligned at once, after which windows of every chip are offsets of the reference grid windows
+    plan = plan_ml_aoi_alignment([item], default_resampling=default_resampling, include_labels=True)
+    asset_keys = [ref_key] + plan.asset_keys
+    roles = [item.assets[key].extra_fields.get(ML_AOI_ROLE_FIELD) for key in asset_keys]
+    roles = [ML_AOI_Role(role) if role is not None else None for role in roles]
+    methods = [ML_AOI_Resampling.NEAR] + plan.resampling_methods
+    aligned = np.concatenate([[True], plan.aligned])
+    origins = np.concatenate([[[0.0, 0.0]], plan.windows[:, :2]])
+    scales = np.concatenate([[[1.0, 1.0]], plan.scales])
+    shapes = np.zeros((len(asset_keys), 2), dtype=np.int64)
+    for index, key in enumerate(asset_keys):
+        asset_grid = get_ml_aoi_grid(item.assets[key], item) if aligned[index] else None
+        shapes[index] = asset_grid.shape if asset_grid is not None else (0, 0)
+
+    a, _, c, _, e, f = grid.transform
+    col_offsets = _get_chip_offsets(col_off, width, cols, size, stride, edges)
+    for chip_row in _get_chip_offsets(row_off, height, rows, size, stride, edges):
+        for chip_col in col_offsets:
+            x0, x1 = sorted((c + a * chip_col, c + a * (chip_col + size)))
+            y0, y1 = sorted((f + e * chip_row, f + e * (chip_row + size)))
+            chip_box = shapely.box(x0, y0, x1, y1)
+            if not shapely.intersects(extent, chip_box):
+                continue
+            coverage = shapely.intersection(extent, chip_box).area / chip_box.area
+            if coverage <= 0 or coverage < min_coverage:
+                continue
+            window = (chip_col, chip_row, size, size)
+            windows = np.column_stack([
+                origins + np.array([chip_col, chip_row]) * scales,
+                np.full((len(asset_keys), 2), size) * scales,
+            ])
+            read_windows = get_ml_aoi_read_windows(windows, shapes)
+            assets = {
+                key: ML_AOI_ChipAsset(
+                    asset_key=key,
+                    role=roles[index],
+                    window=tuple(windows[index].tolist()),
+                    read_window=tuple(read_windows[index].tolist()),
+                    resampling_method=methods[index],
+                    aligned=bool(aligned[index]),
+                )
+                for index, key in enumerate(asset_keys)
+            }
+            yield ML_AOI_Chip(
+                item_id=item.id,
+                split=split,
+                reference_key=ref_key,
+                window=window,
+                bounds=(x0, y0, x1, y1),
+                coverage=coverage,
+                assets=assets,
+                mask=_get_chip_mask(grid, window, geometry) if masks else None,
+            )
+
+
+def _get_stride(size: int, stride: Optional[int], overlap: Optional[int]) -> int:
+    if size < 1:
+        raise ValueError("Chip size must be a positive number of pixels.")
+    if stride is not None and overlap is not None:
+        raise ValueError("Only one of chip stride or overlap can be specified.")
+    stride = size - (overlap or 0) if stride is None else stride
+    if stride < 1:
+        raise ValueError("Chip stride must be a positive number of pixels, and overlap must be less than chip size.")
+    return stride
+
+
+def iter_ml_aoi_chips(
+    items: Iterable[pystac.Item],
+    size: int = ML_AOI_CHIP_SIZE,
+    stride: Optional[int] = None,
+    overlap: Optional[int] = None,
+    edges: ChipEdges = "pad",
+    min_coverage: float = 0.0,
+    use_geometry: bool = True,
+    masks: bool = False,
+    default_resampling: ML_AOI_ResamplingType = ML_AOI_Resampling.NEAR,
+) -> Iterator[ML_AOI_Chip]:
+    """
+    Iterate lazily over fixed-size chips of ML-AOI Items on the pixel grid of their reference Asset.
+
+    Chips are laid out from the top-left pixel of the reference grid region covering the Item geometry, and only
+    chips intersecting the geometry are produced. The Item geometry is obtained from ``proj:geometry`` when defined,
+    or otherwise from the Item itself when the reference grid is in geographic coordinates. Otherwise, chips cover the
+    whole reference grid. For every chip, the windows of the reference Asset and of all feature and label Assets are
+    obtained with :func:`pystac_ml_aoi.grid.plan_ml_aoi_alignment`, such that no raster is opened.
+
+    Items are processed one at a time, and their chips are generated as they are consumed, such that memory does not
+    depend on the number of Items nor on their size. Items without a reference grid do not produce any chip.
+
+    Args:
+        items: ML-AOI Items to cut into chips.
+        size: Number of reference grid pixels along both sides of chips.
+        stride: Number of reference grid pixels between consecutive chips. Defaults to the chip size.
+        overlap: Number of reference grid pixels shared by consecutive chips, as an alternative to the stride.
+        edges:
+            Handling of chips extending beyond the reference grid extent. With ``pad``, chips keep their layout and
+            pixels beyond the extent are masked. With ``shift``, chips are moved back within the extent, overlapping
+            their neighbours. With ``drop``, they are discarded.
+        min_coverage: Minimum fraction of the chip area within both the grid extent and the Item geometry.
+        use_geometry: Whether to restrict chips to the Item geometry, or cover the whole reference grid.
+        masks: Whether to compute the mask of chip pixels within both the grid extent and the Item geometry.
+        default_resampling: Resampling method of feature and label Assets that do not define any.
+    Yields:
+        Chips, ordered by Item, then by rows and columns of the reference grid.
+    Raises:
+        ValueError: If chip options are invalid, or if the reference grid of an Item has pixels of zero size.
+    """
+    stride = _get_stride(size, stride, overlap)
+    if edges not in ("pad", "shift", "drop"):
+        raise ValueError(f"Unknown chip edges handling '{edges}'. Expected one of 'pad', 'shift' or 'drop'.")
+    for item in items:
+        yield from _iter_item_chips(item, size, stride, edges, min_coverage, use_geometry, masks, default_resampling)
+
+
+def iter_ml_aoi_chip_arrays(
+    items: Iterable[pystac.Item],
+    reader: ML_AOI_ArrayReader,
+    size: int = ML_AOI_CHIP_SIZE,
+    stride: Optional[int] = None,
+    overlap: Optional[int] = None,
+    edges: ChipEdges = "pad",
+    min_coverage: float = 0.0,
+    use_geometry: bool = True,
+    default_resampling: ML_AOI_ResamplingType = ML_AOI_Resampling.NEAR,
+) -> Iterator[ML_AOI_ChipArrays]:
+    """
+    Iterate lazily over the Asset arrays of fixed-size chips of ML-AOI Items, aligned on their reference grid.
+
+    Chips are generated by :func:`iter_ml_aoi_chips`. For every chip, only the pixels of each Asset covering it are
+    read, after which they are resampled onto the chip pixels with the ML-AOI resampling method of the Asset using
+    :func:`pystac_ml_aoi.resampling.resample_ml_aoi_array`. Pixels outside the Asset extent or the Item geometry are
+    masked. Arrays of Assets that do not overlap a chip are fully masked, with the same leading dimensions and type as
+    the Asset. Assets that cannot be aligned to the reference grid are omitted.
+
+    Args:
+        items: ML-AOI Items to cut into chips.
+        reader: Reader of Asset pixels, such as :class:`ML_AOI_NumpyArrayReader`.
+        size: Number of reference grid pixels along both sides of chips.
+        stride: Number of reference grid pixels between consecutive chips. Defaults to the chip size.
+        overlap: Number of reference grid pixels shared by consecutive chips, as an alternative to the stride.
+        edges: Handling of chips extending beyond the reference grid extent. See :func:`iter_ml_aoi_chips`.
+        min_coverage: Minimum fraction of the chip area within both the grid extent and the Item geometry.
+        use_geometry: Whether to restrict chips to the Item geometry, or cover the whole reference grid.
+        default_resampling: Resampling method of feature and label Assets that do not define any.
+    Yields:
+        Chip arrays, ordered by Item, then by rows and columns of the reference grid.
+    """
+    for item in items:
+        chips = iter_ml_aoi_chips(
+            [item], size, stride, overlap, edges, min_coverage, use_geometry,
+            masks=True, default_resampling=default_resampling,
+        )
+        layouts: Dict[str, Tuple[Tuple[int, ...], np.dtype]] = {}  # leading dimensions and type of Asset arrays
+        for chip in chips:
+            arrays = {}
+            for key, asset in chip.assets.items():
+                if not asset.aligned:
+                    continue
+                col_off, row_off, width, height = asset.read_window
+                if not width or not height:
+                    if key not in layouts:
+                        # chip not overlapping the Asset, for which a single pixel is read to obtain its array layout
+                        sample = np.ma.asarray(reader(item, key, (0, 0, 1, 1)))
+                        sample = resample_ml_aoi_array(sample, (1, 1), asset.resampling_method)
+                        layouts[key] = (sample.shape[:-2], sample.dtype)
+                    bands, dtype = layouts[key]
+                    arrays[key] = np.ma.masked_all((*bands, size, size), dtype=dtype)
+                    continue
+                data = np.ma.asarray(reader(item, key, asset.read_window))
+                window = (asset.window[0] - col_off, asset.window[1] - row_off, *asset.window[2:])
+                array = resample_ml_aoi_array(data, (size, size), asset.resampling_method, window=window)
+                array[..., ~chip.mask] = np.ma.masked
+                arrays[key] = array
+                layouts[key] = (array.shape[:-2], array.dtype)
+            yield ML_AOI_ChipArrays(chip=chip, arrays=arrays)
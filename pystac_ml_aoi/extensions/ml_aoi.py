@@ -4,13 +4,39 @@
 Utilities to extend :mod:`pystac` objects with STAC ML-AOI extension.
 """
 import abc
+import contextlib
+import contextvars
+import copy
+import enum
+import functools
+import inspect
 import json
 import os
-from typing import Any, Generic, Iterable, List, Literal, Optional, Protocol, TypeVar, Union, cast, get_args
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    overload
+)
 
 import pystac
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, model_validator
 from pydantic.fields import FieldInfo
+from pydantic_core import ErrorDetails
 from pystac.extensions import item_assets
 from pystac.extensions.base import (  # generic pystac.STACObject
     ExtensionManagementMixin,
@@ -19,9 +45,10 @@ from pystac.extensions.base import (  # generic pystac.STACObject
     SummariesExtension
 )
 from pystac.extensions.hooks import ExtensionHooks
-from pystac.utils import StringEnum
+from pystac.utils import StringEnum, is_absolute_href, make_absolute_href
 
 T = TypeVar("T", pystac.Collection, pystac.Item, pystac.Asset, item_assets.AssetDefinition)
+V = TypeVar("V")
 SchemaName = Literal["ml-aoi"]
 
 AnySummary = Union[list[Any], pystac.RangeSummary[Any], dict[str, Any], None]
@@ -29,11 +56,9 @@ AnySummary = Union[list[Any], pystac.RangeSummary[Any], dict[str, Any], None]
 _PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../.."))
 ML_AOI_SCHEMA_PATH = os.path.join(_PROJECT_ROOT, "json-schema/schema.json")
 
-with open(ML_AOI_SCHEMA_PATH, mode="r", encoding="utf-8") as schema_file:
-    ML_AOI_SCHEMA = json.load(schema_file)
-
 ML_AOI_SCHEMA_ID: SchemaName = get_args(SchemaName)[0]
-ML_AOI_SCHEMA_URI: str = ML_AOI_SCHEMA["$id"].split("#")[0]
+# this is automatically updated by 'make bump', and must match the '$id' of the schema (see 'get_ml_aoi_schema')
+ML_AOI_SCHEMA_URI: str = "https://stac-extensions.github.io/ml-aoi/v0.2.0/schema.json"
 ML_AOI_PREFIX = f"{ML_AOI_SCHEMA_ID}:"
 ML_AOI_PROPERTY = f"{ML_AOI_SCHEMA_ID}_".replace("-", "_")
 
@@ -110,6 +135,29 @@ ML_AOI_ResamplingType = Union[
     ]
 ]
 
+
+@functools.lru_cache(maxsize=None)
+def get_ml_aoi_schema() -> dict[str, Any]:
+    """
+    Loads the ML-AOI JSON schema definition.
+
+    The schema is only parsed on first use to avoid the cost of the file read when importing the module.
+    """
+    with open(ML_AOI_SCHEMA_PATH, mode="r", encoding="utf-8") as schema_file:
+        return json.load(schema_file)
+
+
+def __getattr__(name: str) -> Any:
+    # lazy module attribute (PEP 562) for backward compatibility with the previously preloaded schema
+    if name == "ML_AOI_SCHEMA":
+        return get_ml_aoi_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:  # declared for static analysis, resolved by '__getattr__'
+    ML_AOI_SCHEMA: dict[str, Any]
+
+
 # pystac references
 SCHEMA_URI = ML_AOI_SCHEMA_URI
 SCHEMA_URIS = [SCHEMA_URI]
@@ -120,12 +168,22 @@ def add_ml_aoi_prefix(name: str) -> str:
     return ML_AOI_PREFIX + name if "datetime" not in name else name
 
 
+ML_AOI_ASSET_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_ASSET_REFERENCE_GRID_FIELD = add_ml_aoi_prefix("reference-grid")
+ML_AOI_ASSET_RESAMPLING_FIELD = add_ml_aoi_prefix("resampling-method")
+
+
 class ML_AOI_BaseFields(BaseModel, validate_assignment=True):
     """
     ML-AOI base definition to validate fields and properties.
     """
 
-    model_config = ConfigDict(alias_generator=add_ml_aoi_prefix, populate_by_name=True, extra="ignore")
+    model_config = ConfigDict(
+        alias_generator=add_ml_aoi_prefix,
+        populate_by_name=True,
+        extra="ignore",
+        defer_build=True,  # validators are only compiled on first use of each model
+    )
 
     @model_validator(mode="after")
     def validate_one_of(self) -> "ML_AOI_BaseFields":
@@ -137,7 +195,7 @@ class ML_AOI_BaseFields(BaseModel, validate_assignment=True):
         # note:
         #   purposely omit 'by_alias=True' to have any fields defined, with/without extension prefix
         #   if the extension happened to use any non-prefixed field, they would be validated as well
-        fields = self.model_dump()
+        fields = self.__dict__  # equivalent to 'model_dump()' for the check, without serializing the values
         # fields = {
         #     f: v for f, v in fields.items()
         #     if f.startswith(ML_AOI_PREFIX) and f.replace(ML_AOI_PREFIX, "")
@@ -177,6 +235,260 @@ class ML_AOI_LinkFields(ML_AOI_BaseFields, validate_assignment=True):
     role: Optional[ML_AOI_Role]  # role is required since it is the only available field
 
 
+ML_AOI_Fields = Union[
+    ML_AOI_CollectionFields,
+    ML_AOI_ItemProperties,
+    ML_AOI_AssetFields,
+    ML_AOI_LinkFields,
+]
+
+
+_ML_AOI_FIELDS_MODELS: dict[type, Optional[Type[ML_AOI_BaseFields]]] = {}
+
+
+def _get_ml_aoi_fields_model(obj: Any) -> Optional[Type[ML_AOI_BaseFields]]:
+    # resolution cached by type since 'isinstance' checks of 'pystac.STACObject' classes are costly
+    obj_type = type(obj)
+    try:
+        return _ML_AOI_FIELDS_MODELS[obj_type]
+    except KeyError:
+        model = _ML_AOI_FIELDS_MODELS[obj_type] = _resolve_ml_aoi_fields_model(obj)
+        return model
+
+
+def _resolve_ml_aoi_fields_model(obj: Any) -> Optional[Type[ML_AOI_BaseFields]]:
+    if isinstance(obj, pystac.Collection):
+        return ML_AOI_CollectionFields
+    if isinstance(obj, pystac.Item):
+        return ML_AOI_ItemProperties
+    if isinstance(obj, pystac.Asset):
+        return ML_AOI_AssetFields
+    if isinstance(obj, pystac.Link):
+        return ML_AOI_LinkFields
+    return None
+
+
+_ML_AOI_ITEM_INDEXES: "weakref.WeakKeyDictionary[pystac.Item, Any]" = weakref.WeakKeyDictionary()
+"""
+Indexes (see :class:`pystac_ml_aoi.index.ML_AOI_CollectionIndex`) to maintain when ML-AOI fields of an Item change.
+"""
+_ML_AOI_CHANGE_TRACKERS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+"""
+Active trackers (see :class:`pystac_ml_aoi.changes.ML_AOI_ChangeTracker`) to notify when STAC objects are modified.
+"""
+
+
+class _ML_AOI_AssetLookup:
+    """
+    Cached view of the ML-AOI fields of the Assets of a STAC Item, and of the Asset keys matched by filters.
+
+    Fields of all Assets are collected in a single pass, such that repeated lookups of the same filters only
+    retrieve the previously matched Asset keys. The Assets themselves are not referenced, since they refer to their
+    owner Item, which would otherwise never be released from the weakly keyed cache of lookups.
+    """
+    __slots__ = ("assets_id", "fields", "results")
+
+    def __init__(self, assets: dict[str, pystac.Asset]) -> None:
+        self.assets_id = id(assets)
+        self.fields: dict[str, tuple[frozenset[str], Any, Any]] = {}  # key -> (roles, reference grid, resampling)
+        self.results: dict[tuple[Any, ...], List[str]] = {}
+        for key, asset in assets.items():
+            fields = asset.extra_fields
+            roles = fields.get(ML_AOI_ASSET_ROLE_FIELD) or []
+            resampling = fields.get(ML_AOI_ASSET_RESAMPLING_FIELD)
+            self.fields[key] = (
+                frozenset(_get_ml_aoi_enum_value(role) for role in ([roles] if isinstance(roles, str) else roles)),
+                fields.get(ML_AOI_ASSET_REFERENCE_GRID_FIELD),
+                _get_ml_aoi_enum_value(resampling),
+            )
+
+    def is_valid(self, assets: dict[str, pystac.Asset]) -> bool:
+        return id(assets) == self.assets_id and assets.keys() == self.fields.keys()
+
+    def get_keys(
+        self,
+        assets: dict[str, pystac.Asset],
+        roles: Optional[frozenset[str]],
+        reference_grid: Optional[bool],
+        resampling_method: Optional[str],
+        media_type: Optional[str],
+        asset_role: Optional[str],
+    ) -> List[str]:
+        query = (roles, reference_grid, resampling_method, media_type, asset_role)
+        keys = self.results.get(query)
+        if keys is None:
+            keys = self.results[query] = [
+                key
+                for key, (asset_roles, asset_grid, asset_resampling) in self.fields.items()
+                if (not roles or not roles.isdisjoint(asset_roles))
+                and (reference_grid is None or asset_grid == reference_grid)
+                and (resampling_method is None or asset_resampling == resampling_method)
+                and (media_type is None or assets[key].media_type == media_type)
+                and (asset_role is None or assets[key].has_role(asset_role))
+            ]
+        return keys
+
+
+_ML_AOI_ITEM_ASSET_LOOKUPS: "weakref.WeakKeyDictionary[pystac.Item, _ML_AOI_AssetLookup]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_ML_AOI_EXTENSION_MEMO_ATTRIBUTE = "_ml_aoi_extension_memo"
+
+
+class _ML_AOI_ExtensionMemo:
+    """
+    Extension memoized by :meth:`ML_AOI_Extension.ext` on the STAC object it extends.
+
+    The memo is stored on the object rather than in a module-level mapping, since the extension refers to the object,
+    which would then never be released. The resulting reference cycle is collected along with the object.
+    Deep copies and pickles of the object do not carry the memo, since its extension refers to the original object.
+    """
+    __slots__ = ("extension",)
+
+    def __init__(self, extension: Optional["ML_AOI_Extension[Any]"] = None) -> None:
+        self.extension = extension
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "_ML_AOI_ExtensionMemo":
+        return _ML_AOI_ExtensionMemo()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _ML_AOI_ExtensionMemo, ()
+
+
+def _get_ml_aoi_enum_value(value: Any) -> Any:
+    # enum members do not share the hash of their value
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _notify_ml_aoi_changed(obj: Any, previous_href: Optional[str] = None) -> None:
+    """
+    Records the modification of ML-AOI fields, or of the location, of a STAC object in all active change trackers.
+    """
+    for tracker in list(_ML_AOI_CHANGE_TRACKERS):
+        tracker.record(obj, previous_href=previous_href)
+
+
+def _rebase_ml_aoi_links(obj: pystac.STACObject, previous_href: Optional[str]) -> None:
+    """
+    Makes unresolved relative links of a moved STAC object absolute from its previous location.
+
+    Such links can then be written relative to the new location without resolving their targets.
+    """
+    if previous_href is None:
+        return
+    for link in obj.links:
+        if link.rel != pystac.RelType.SELF and not link.is_resolved() and not is_absolute_href(link.href):
+            link.target = make_absolute_href(link.href, previous_href)
+
+
+def _notify_ml_aoi_item_updated(obj: Any) -> None:
+    """
+    Updates any index, cached lookup or change tracker referencing the STAC Item, or the owner Item of an Asset,
+    after ML-AOI fields modifications.
+    """
+    if _ML_AOI_CHANGE_TRACKERS:
+        _notify_ml_aoi_changed(obj)
+    item = obj.owner if isinstance(obj, pystac.Asset) else obj
+    if not isinstance(item, pystac.Item):
+        return
+    _ML_AOI_ITEM_ASSET_LOOKUPS.pop(item, None)
+    index = _ML_AOI_ITEM_INDEXES.get(item)
+    if index is not None:
+        index.update_item(item)
+
+
+@functools.lru_cache(maxsize=None)
+def get_ml_aoi_field_aliases(model: Type[ML_AOI_BaseFields]) -> dict[str, str]:
+    """
+    Obtain the mapping of model field names to their ``ml-aoi:`` prefixed property names.
+
+    Explicit field aliases (e.g.: ``reference-grid``) are not resolved by the prefix alias generator.
+    The mapping is cached by model, and must not be modified.
+    """
+    aliases = {}
+    for name, field in model.model_fields.items():
+        alias = field.alias or name
+        aliases[name] = alias if alias.startswith(ML_AOI_PREFIX) else add_ml_aoi_prefix(alias)
+    return aliases
+
+
+class _ML_AOI_TrustedScope:
+    def __init__(self, validate: bool) -> None:
+        self.validate = validate
+        self.modified: dict[int, "ML_AOI_Extension"] = {}
+
+    def track(self, extension: "ML_AOI_Extension") -> None:
+        if self.validate:
+            container = getattr(extension, "summaries", None)
+            if container is None:
+                container = extension.properties
+            self.modified[id(container)] = extension
+
+
+_ML_AOI_TRUSTED_SCOPE: contextvars.ContextVar[Optional[_ML_AOI_TrustedScope]] = contextvars.ContextVar(
+    "ml_aoi_trusted_scope",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def ml_aoi_trusted(validate: bool = False) -> Iterator[None]:
+    """
+    Scope within which ML-AOI fields are written without any validation.
+
+    Within this scope, :meth:`ML_AOI_Extension.set_ml_aoi_property` and :meth:`ML_AOI_Extension.apply` assign the
+    ``ml-aoi:`` prefixed values directly. This is intended for pipelines processing STAC objects that were already
+    validated, such as when reopening Items of a catalog previously validated against the ML-AOI schema.
+
+    Args:
+        validate:
+            Validate once all ML-AOI fields of the modified objects when leaving the scope (e.g.: before saving them).
+            If the scope is exited by an error, this validation is skipped.
+    """
+    scope = _ML_AOI_TrustedScope(validate)
+    token = _ML_AOI_TRUSTED_SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        _ML_AOI_TRUSTED_SCOPE.reset(token)
+    for extension in scope.modified.values():
+        extension.validate_ml_aoi_fields()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ml_aoi_field_validator(model: Type[ML_AOI_BaseFields], field_name: str) -> Callable[[Any], None]:
+    """
+    Obtain a cached validator of a single ML-AOI field value.
+
+    Enum fields are checked by lookup against their allowed values. Any other value, or an enum mismatch to report,
+    is validated by a :class:`TypeAdapter` of the field annotation to produce the same errors as the model.
+    """
+    field = model.model_fields[field_name]
+    adapter = TypeAdapter(field.annotation)
+    enum_type = next(
+        (arg for arg in get_args(field.annotation) if isinstance(arg, type) and issubclass(arg, ExtendedEnum)),
+        None,
+    )
+    # enum members and their string values do not share the same hash, both must be looked up
+    allowed = frozenset([*enum_type, *(member.value for member in enum_type)]) if enum_type else frozenset()
+
+    def validate(value: Any) -> None:
+        try:
+            if value in allowed:
+                return
+        except TypeError:  # unhashable
+            pass
+        adapter.validate_python(value)
+
+    return validate
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ml_aoi_fields_list_adapter(model: Type[ML_AOI_BaseFields]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
 # class ML_AOI_MetaClass(type, abc.ABC):
 #     @property
 #     @abc.abstractmethod
@@ -187,12 +499,84 @@ class ML_AOI_MetaClass(Protocol):
     model: ML_AOI_BaseFields
 
 
+class ML_AOI_FieldProperty(Generic[V]):
+    """
+    Typed descriptor of an ML-AOI field of an extension.
+
+    Reading the descriptor converts the stored value to the field type. Assigning it validates the value against
+    the field and writes it to its ``ml-aoi:`` prefixed property, without resolving the attribute name.
+    """
+    __slots__ = ("name", "convert")
+
+    def __init__(self, convert: Callable[[Any], V]) -> None:
+        self.name = ""
+        self.convert = convert
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, extension: None, owner: Optional[type] = None) -> "ML_AOI_FieldProperty[V]":
+        ...
+
+    @overload
+    def __get__(self, extension: "ML_AOI_Extension[Any]", owner: Optional[type] = None) -> Optional[V]:
+        ...
+
+    def __get__(
+        self,
+        extension: Optional["ML_AOI_Extension[Any]"],
+        owner: Optional[type] = None,
+    ) -> Union["ML_AOI_FieldProperty[V]", Optional[V]]:
+        if extension is None:
+            return self
+        value = extension.get_ml_aoi_property(self.name, _ml_aoi_required=True)
+        return None if value is None else self.convert(value)
+
+    def __set__(self, extension: "ML_AOI_Extension[Any]", value: Optional[V]) -> None:
+        extension.set_ml_aoi_property(self.name, value, _ml_aoi_required=True)
+
+
+def _as_ml_aoi_splits(splits: Iterable[Any]) -> List[ML_AOI_Split]:
+    return [ML_AOI_Split(split) for split in splits]
+
+
 class ML_AOI_Extension(
     ML_AOI_MetaClass,
     Generic[T],
     ExtensionManagementMixin[Union[pystac.Asset, pystac.Item, pystac.Collection]],
     abc.ABC,
 ):
+    __slots__ = ("_ml_aoi_extension_state",)
+
+    _ml_aoi_extension_state: Optional[tuple[Any, List[str], int]]
+    """
+    Owner, ``stac_extensions`` and their size when the owner was last verified to declare the ML-AOI extension.
+    """
+
+    _ml_aoi_internal_attributes: frozenset[str] = frozenset()
+    """
+    Attributes of the extension assigned directly, without resolving ML-AOI fields (slots and data descriptors).
+    """
+
+    _ml_aoi_class_attributes: frozenset[str] = frozenset()
+    """
+    Attributes and annotations defined by the extension class and its bases.
+    """
+
+    def __init_subclass__(cls, *args: Any, **kwargs: Any) -> None:
+        super().__init_subclass__(*args, **kwargs)
+        internal = set()
+        annotations = set()
+        for klass in cls.__mro__:
+            internal.update(
+                name for name, attr in vars(klass).items()
+                if inspect.isdatadescriptor(attr) and not name.startswith("__")
+            )
+            annotations.update(vars(klass).get("__annotations__", {}))
+        cls._ml_aoi_internal_attributes = frozenset(internal)
+        cls._ml_aoi_class_attributes = frozenset(dir(cls)) | frozenset(annotations)
+
     @abc.abstractmethod
     def get_ml_aoi_property(self, prop_name: str, *, _ml_aoi_required: bool) -> Any:
         raise NotImplementedError
@@ -208,11 +592,42 @@ class ML_AOI_Extension(
     ) -> None:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def _write_ml_aoi_property(self, prop_name: str, value: Any) -> None:
+        """
+        Writes the value of a ``ml-aoi:`` prefixed property without any validation.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _dump_ml_aoi_fields(self) -> dict[str, Any]:
+        """
+        Obtains the ML-AOI fields currently defined by the extended object, mapped by their model field names.
+        """
+        raise NotImplementedError
+
+    def _ml_aoi_updated(self) -> None:
+        """
+        Hook called after ML-AOI fields of the extended object were modified.
+        """
+
+    def validate_ml_aoi_fields(self) -> None:
+        """
+        Validates all ML-AOI fields currently defined by the extended object.
+
+        Raises:
+            pydantic.ValidationError : If any of the fields is invalid, or if none are defined.
+        """
+        self.model.model_validate(self._dump_ml_aoi_fields())
+
     def __getitem__(self, prop_name):
         return self.get_ml_aoi_property(prop_name, _ml_aoi_required=False)
 
     def __setattr__(self, prop_name, value):
-        self.set_ml_aoi_property(prop_name, value, _ml_aoi_required=False, pop_if_none=True)
+        if prop_name in self._ml_aoi_internal_attributes:
+            object.__setattr__(self, prop_name, value)
+        else:
+            self.set_ml_aoi_property(prop_name, value, _ml_aoi_required=False, pop_if_none=True)
 
     @classmethod
     def _is_ml_aoi_property(cls, prop_name: str):
@@ -233,6 +648,10 @@ class ML_AOI_Extension(
 
     @classmethod
     def _validate_ml_aoi_property(cls, prop_name: str, value: Any) -> None:
+        if value is not None and prop_name in cls.model.model_fields:
+            _get_ml_aoi_field_validator(cls.model, prop_name)(value)
+            return
+        # 'None' must be validated against the full model since at least one field is required
         model = cls.model.model_construct()
         validator = cls.model.__pydantic_validator__
         validator.validate_assignment(model, prop_name, value)
@@ -254,10 +673,22 @@ class ML_AOI_Extension(
     ) -> None:
         """
         Applies ML-AOI Extension properties to the extended :class:`~pystac.Item` or :class:`~pystac.Asset`.
+
+        Within a :func:`ml_aoi_trusted` scope, the fields are written directly without validation.
         """
         if not fields:
             fields = {}
         fields.update(extra_fields)
+        trusted_scope = _ML_AOI_TRUSTED_SCOPE.get()
+        if trusted_scope is not None:
+            if isinstance(fields, BaseModel):
+                fields = fields.model_dump(by_alias=False)
+            aliases = get_ml_aoi_field_aliases(self.model)
+            for field, val in fields.items():
+                self._write_ml_aoi_property(aliases.get(field, field), val)
+            trusted_scope.track(self)
+            self._ml_aoi_updated()
+            return
         obj = (
             getattr(self, "collection", None) or
             getattr(self, "item", None) or
@@ -294,14 +725,131 @@ class ML_AOI_Extension(
         for field, val in data_json.items():
             prop_setter(field, val)
 
+    @classmethod
+    def apply_many(
+        cls,
+        objects: Sequence[Union[pystac.Collection, pystac.Item, pystac.Asset]],
+        fields: Union[ML_AOI_Fields, dict[str, Any], Sequence[Union[ML_AOI_Fields, dict[str, Any]]]],
+        add_if_missing: bool = False,
+    ) -> dict[int, List[ErrorDetails]]:
+        """
+        Applies ML-AOI Extension properties to many :class:`~pystac.Collection`, :class:`~pystac.Item` or
+        :class:`~pystac.Asset` at once.
+
+        Field payloads are validated together in a single pass for each type of STAC object. The resulting
+        ``ml-aoi:`` prefixed values are then written directly into the summaries, properties or fields of each object.
+        Objects for which validation failed are left untouched.
+
+        Args:
+            objects: STAC objects to extend with ML-AOI fields.
+            fields: ML-AOI fields applied to every object, or a sequence of fields matching each object by position.
+            add_if_missing: Whether to add the ML-AOI schema URI to the objects (or asset owners) if missing.
+        Returns:
+            Validation errors of objects that could not be updated, mapped by their position in ``objects``.
+        Raises:
+            pystac.ExtensionTypeError : If an invalid object type or fields definition is passed.
+        """
+        if isinstance(fields, (dict, ML_AOI_BaseFields)):
+            fields = [fields] * len(objects)
+        elif len(fields) != len(objects):
+            raise ValueError(
+                f"Mismatching number of ML-AOI fields ({len(fields)}) and STAC objects ({len(objects)})."
+            )
+
+        # payloads are grouped per model, and identical payload objects (e.g.: broadcast fields) are validated once
+        groups: dict[Type[ML_AOI_BaseFields], dict[int, List[int]]] = {}
+        payloads: dict[int, Union[ML_AOI_Fields, dict[str, Any]]] = {}
+        for index, (obj, obj_fields) in enumerate(zip(objects, fields)):
+            model = _get_ml_aoi_fields_model(obj)
+            if model is None or model is ML_AOI_LinkFields:
+                raise pystac.ExtensionTypeError(cls._ext_error_message(obj))
+            if isinstance(obj_fields, ML_AOI_BaseFields) and not isinstance(obj_fields, model):
+                raise pystac.ExtensionTypeError(
+                    f"Cannot use {obj_fields.__class__.__name__} with STAC Object {type(obj).__name__}"
+                )
+            if not add_if_missing or (model is ML_AOI_AssetFields and obj.owner is None):
+                # the schema URI is only added to objects that pass validation, but missing ones are reported early
+                cls._ensure_ml_aoi_schema(obj, add_if_missing)
+            payloads[id(obj_fields)] = obj_fields
+            groups.setdefault(model, {}).setdefault(id(obj_fields), []).append(index)
+
+        errors: dict[int, List[ErrorDetails]] = {}
+        for model, payload_indices in groups.items():
+            adapter = _get_ml_aoi_fields_list_adapter(model)
+            payload_ids = list(payload_indices)
+            try:
+                results = adapter.validate_python([payloads[payload_id] for payload_id in payload_ids])
+            except ValidationError as exc:
+                invalid = set()
+                for err in exc.errors():
+                    payload_id = payload_ids[err["loc"][0]]
+                    invalid.add(payload_id)
+                    err["loc"] = err["loc"][1:]
+                    for index in payload_indices[payload_id]:
+                        errors.setdefault(index, []).append(err)
+                # only valid payloads remain, they must succeed on this second pass
+                payload_ids = [payload_id for payload_id in payload_ids if payload_id not in invalid]
+                results = adapter.validate_python([payloads[payload_id] for payload_id in payload_ids])
+            aliases = get_ml_aoi_field_aliases(model)
+            data_json = adapter.dump_python(results, mode="json", by_alias=False)
+            for payload_id, data in zip(payload_ids, data_json):
+                data = {aliases[field]: val for field, val in data.items()}
+                for index in payload_indices[payload_id]:
+                    if add_if_missing:
+                        cls._ensure_ml_aoi_schema(objects[index], add_if_missing)
+                    cls._write_ml_aoi_fields(objects[index], model, data)
+        return errors
+
+    @classmethod
+    def _ensure_ml_aoi_schema(
+        cls,
+        obj: Union[pystac.Collection, pystac.Item, pystac.Asset],
+        add_if_missing: bool,
+    ) -> None:
+        """
+        Ensures that the STAC object, or the owner of the Asset, declares the ML-AOI schema URI.
+        """
+        if isinstance(obj, pystac.Asset):
+            cls.ensure_owner_has_extension(obj, add_if_missing)
+        elif not cls.has_extension(obj):
+            cls.ensure_has_extension(obj, add_if_missing)
+
+    @staticmethod
+    def _write_ml_aoi_fields(
+        obj: Union[pystac.Collection, pystac.Item, pystac.Asset],
+        model: Type[ML_AOI_BaseFields],
+        data: dict[str, Any],
+    ) -> None:
+        """
+        Writes pre-validated and aliased ML-AOI fields to the relevant container of the STAC object.
+
+        The fields model must correspond to the STAC object type, as resolved by :func:`_get_ml_aoi_fields_model`.
+        """
+        if model is ML_AOI_CollectionFields:
+            for field, val in data.items():
+                if val is None:
+                    obj.summaries.remove(field)
+                else:
+                    obj.summaries.add(field, list(val))  # avoid sharing the list between objects
+            if _ML_AOI_CHANGE_TRACKERS:
+                _notify_ml_aoi_changed(obj)
+            return
+        properties = obj.properties if model is ML_AOI_ItemProperties else obj.extra_fields
+        for field, val in data.items():
+            if val is None:
+                properties.pop(field, None)
+            else:
+                properties[field] = val
+        if _ML_AOI_ITEM_INDEXES or _ML_AOI_ITEM_ASSET_LOOKUPS or _ML_AOI_CHANGE_TRACKERS:
+            _notify_ml_aoi_item_updated(obj)
+
     @classmethod
     def get_schema_uri(cls) -> str:
         return SCHEMA_URI
 
     @classmethod
     def has_extension(cls, obj: S):
-        ext_uri = cls.get_schema_uri()
-        return obj.stac_extensions is not None and any(uri == ext_uri for uri in obj.stac_extensions)
+        return obj.stac_extensions is not None and cls.get_schema_uri() in obj.stac_extensions
 
     @classmethod
     def ext(cls, obj: T, add_if_missing: bool = False) -> "ML_AOI_Extension[T]":
@@ -314,20 +862,60 @@ class ML_AOI_Extension(
         Raises:
             pystac.ExtensionTypeError : If an invalid object type is passed.
         """
-        if isinstance(obj, pystac.Collection):
-            cls.ensure_has_extension(obj, add_if_missing)
-            return cast(ML_AOI_Extension[T], ML_AOI_CollectionExtension(obj))
-        elif isinstance(obj, pystac.Item):
-            cls.ensure_has_extension(obj, add_if_missing)
-            return cast(ML_AOI_Extension[T], ML_AOI_ItemExtension(obj))
-        elif isinstance(obj, pystac.Asset):
-            cls.ensure_owner_has_extension(obj, add_if_missing)
-            return cast(ML_AOI_Extension[T], ML_AOI_AssetExtension(obj))
-        # elif isinstance(obj, item_assets.AssetDefinition):
-        #     cls.ensure_owner_has_extension(obj, add_if_missing)
-        #     return cast(ML_AOI_Extension[T], ItemAssetsML_AOI_Extension(obj))
-        else:
+        ext_type = _ML_AOI_EXTENSION_TYPES.get(_get_ml_aoi_fields_model(obj))
+        if ext_type is None:
             raise pystac.ExtensionTypeError(cls._ext_error_message(obj))
+        memo = getattr(obj, _ML_AOI_EXTENSION_MEMO_ATTRIBUTE, None)
+        extension = memo.extension if isinstance(memo, _ML_AOI_ExtensionMemo) else None
+        if (
+            extension is None
+            or extension._get_ml_aoi_extended_object() is not obj  # memo shared by a shallow copy of the object
+            or not extension._is_ml_aoi_extension_current()
+        ):
+            extension = ext_type(obj)
+            setattr(obj, _ML_AOI_EXTENSION_MEMO_ATTRIBUTE, _ML_AOI_ExtensionMemo(extension))
+        extension._ensure_ml_aoi_extension(add_if_missing)
+        return cast(ML_AOI_Extension[T], extension)
+
+    def _is_ml_aoi_extension_current(self) -> bool:
+        """
+        Indicates whether the memoized extension still refers to the current containers of the extended object.
+        """
+        return True
+
+    def _get_ml_aoi_extended_object(self) -> Union[pystac.Item, pystac.Collection, pystac.Asset]:
+        """
+        Obtains the STAC object extended by this extension.
+        """
+        raise NotImplementedError
+
+    def _get_ml_aoi_extension_owner(self) -> Optional[Union[pystac.Item, pystac.Collection]]:
+        """
+        Obtains the STAC object that must declare the ML-AOI schema URI in its ``stac_extensions``.
+        """
+        raise NotImplementedError
+
+    def _ensure_ml_aoi_extension(self, add_if_missing: bool) -> None:
+        """
+        Ensures that the owner of the extended object declares the ML-AOI extension.
+
+        The result is cached until the ``stac_extensions`` of the owner are replaced or change size.
+        """
+        owner = self._get_ml_aoi_extension_owner()
+        extensions = owner.stac_extensions if owner is not None else None
+        state = self._ml_aoi_extension_state
+        if (
+            state is not None and extensions is not None
+            and state[0] is owner and state[1] is extensions and state[2] == len(extensions)
+        ):
+            return
+        if owner is None:
+            self.ensure_owner_has_extension(cast(pystac.Asset, self._get_ml_aoi_extended_object()), add_if_missing)
+            return  # nothing to cache
+        if add_if_missing or not self.has_extension(owner):
+            self.ensure_has_extension(owner, add_if_missing)
+        extensions = owner.stac_extensions
+        self._ml_aoi_extension_state = (owner, extensions, len(extensions))
 
     @classmethod
     def summaries(cls, obj: pystac.Collection, add_if_missing: bool = False) -> "ML_AOI_SummariesExtension":
@@ -343,9 +931,11 @@ class ML_AOI_PropertiesExtension(
     ML_AOI_Extension[T],
     abc.ABC,
 ):
+    __slots__ = ("properties", "additional_read_properties")
+
     def get_ml_aoi_property(self, prop_name: str, *, _ml_aoi_required: bool = True) -> list[Any]:
         self._retrieve_ml_aoi_property(prop_name, _ml_aoi_required=_ml_aoi_required)
-        return self.properties.get(prop_name)
+        return self.properties.get(get_ml_aoi_field_aliases(self.model).get(prop_name, prop_name))
 
     def set_ml_aoi_property(
         self,
@@ -359,12 +949,31 @@ class ML_AOI_PropertiesExtension(
         if field:
             # validation must be performed against the non-aliased field
             # then, apply the alias for the actual assignment of the property
-            self._validate_ml_aoi_property(prop_name, value)
-            prop_name = field.alias or prop_name
-        if prop_name in dir(self) or prop_name in self.__annotations__:
+            trusted_scope = _ML_AOI_TRUSTED_SCOPE.get()
+            if trusted_scope is None:
+                self._validate_ml_aoi_property(prop_name, value)
+            else:
+                trusted_scope.track(self)
+            prop_name = get_ml_aoi_field_aliases(self.model)[prop_name]
+        if prop_name in self._ml_aoi_class_attributes or prop_name in getattr(self, "__dict__", ()):
             object.__setattr__(self, prop_name, value)
         else:
             super()._set_property(prop_name, value, pop_if_none=pop_if_none)
+        if field:
+            self._ml_aoi_updated()
+
+    def _write_ml_aoi_property(self, prop_name: str, value: Any) -> None:
+        if value is None:
+            self.properties.pop(prop_name, None)
+        else:
+            self.properties[prop_name] = value
+
+    def _dump_ml_aoi_fields(self) -> dict[str, Any]:
+        return {
+            field: self.properties[prop_name]
+            for field, prop_name in get_ml_aoi_field_aliases(self.model).items()
+            if prop_name in self.properties
+        }
 
     def _set_property(
         self, prop_name: str, v: Any, pop_if_none: bool = True
@@ -388,13 +997,45 @@ class ML_AOI_ItemExtension(
     This class should generally not be instantiated directly. Instead, call
     :meth:`ML_AOI_Extension.ext` on an :class:`~pystac.Item` to extend it.
     """
+    __slots__ = ("item",)
+
     model = ML_AOI_ItemProperties
     item: pystac.Item
     properties: dict[str, Any]
 
+    split = ML_AOI_FieldProperty(ML_AOI_Split)
+
     def __init__(self, item: pystac.Item):
         self.properties = item.properties
+        self.additional_read_properties = None
         self.item = item
+        self._ml_aoi_extension_state = None
+
+    def _ml_aoi_updated(self) -> None:
+        _notify_ml_aoi_item_updated(self.item)
+
+    def _is_ml_aoi_extension_current(self) -> bool:
+        return self.properties is self.item.properties
+
+    def _get_ml_aoi_extension_owner(self) -> pystac.Item:
+        return self.item
+
+    def _get_ml_aoi_extended_object(self) -> pystac.Item:
+        return self.item
+
+    def set_self_href(self, href: Optional[str]) -> None:
+        """
+        Sets the absolute HREF that is represented by the ``rel == 'self'`` :class:`~pystac.Link`.
+
+        Unresolved relative links are kept pointing to the same targets from the new location. The change of location
+        is recorded by active change trackers, such that the Item and its parent are saved.
+        """
+        previous_href = self.item.get_self_href()
+        self.item.set_self_href(href)
+        if previous_href != self.item.get_self_href():
+            _rebase_ml_aoi_links(self.item, previous_href)
+            if _ML_AOI_CHANGE_TRACKERS:
+                _notify_ml_aoi_changed(self.item, previous_href=previous_href)
 
     def get_assets(
         self,
@@ -417,28 +1058,53 @@ class ML_AOI_ItemExtension(
         Returns:
             Dict[str, Asset]: A dictionary of assets that matched filters.
         """
+        index = _ML_AOI_ITEM_INDEXES.get(self.item)
+        # Assets added or removed directly on the Item are not reflected by the index until it is updated
+        if index is not None and index.is_item_current(self.item):
+            keys = index.get_asset_keys(
+                self.item.id,
+                role=role,
+                reference_grid=reference_grid,
+                resampling_method=resampling_method,
+            )
+            # copies for consistency with 'pystac.Item.get_assets'
+            return {
+                key: copy.deepcopy(asset)
+                for key, asset in ((key, self.item.assets[key]) for key in keys)
+                if (media_type is None or asset.media_type == media_type)
+                and (asset_role is None or asset.has_role(asset_role))
+            }
+
         # since this method could be used for assets that refer to other extensions as well,
         # filters must not limit themselves to ML-AOI fields
         # if values are 'None', we must consider them as 'ignore' instead of 'any of' allowed values
-        return {
-            key: asset
-            for key, asset in self.item.get_assets(media_type=media_type, role=asset_role).items()
-            if (
-                not role or
-                any(
-                    asset_role in (asset.extra_fields.get(add_ml_aoi_prefix("role")) or [])
-                    for asset_role in ([role] if isinstance(role, ML_AOI_Role) else role)
-                )
-            )
-            and (
-                reference_grid is None or
-                asset.extra_fields.get(add_ml_aoi_prefix("reference-grid")) == reference_grid
-            )
-            and (
-                resampling_method is None or
-                asset.extra_fields.get(add_ml_aoi_prefix("resampling-method")) == resampling_method
-            )
-        }
+        assets = self.item.assets
+        lookup = _ML_AOI_ITEM_ASSET_LOOKUPS.get(self.item)
+        if lookup is None or not lookup.is_valid(assets):
+            lookup = _ML_AOI_ITEM_ASSET_LOOKUPS[self.item] = _ML_AOI_AssetLookup(assets)
+        roles = None
+        if role:
+            roles = frozenset(_get_ml_aoi_enum_value(_role) for _role in ([role] if isinstance(role, str) else role))
+        keys = lookup.get_keys(
+            assets,
+            roles,
+            reference_grid,
+            _get_ml_aoi_enum_value(resampling_method),
+            _get_ml_aoi_enum_value(media_type),
+            asset_role,
+        )
+        # copies for consistency with 'pystac.Item.get_assets'
+        return {key: copy.deepcopy(assets[key]) for key in keys}
+
+    def clear_assets_cache(self) -> None:
+        """
+        Clears the cached lookup of ML-AOI fields of the Item's Assets employed by :meth:`get_assets`.
+
+        Modifications of Assets through the ML-AOI extension, as well as Assets added to or removed from the Item,
+        are detected automatically. Modifications applied directly to the Assets fields or replacing an Asset,
+        without the extension, must be reported with this method.
+        """
+        _ML_AOI_ITEM_ASSET_LOOKUPS.pop(self.item, None)
 
     def __repr__(self) -> str:
         return f"<ML_AOI_ItemExtension Item id={self.item.id}>"
@@ -476,8 +1142,15 @@ class ML_AOI_AssetExtension(
     This class should generally not be instantiated directly. Instead, call
     :meth:`ML_AOI_Extension.ext` on an :class:`~pystac.Asset` to extend it.
     """
+    __slots__ = ("asset", "asset_href", "_owner")
+
     model = ML_AOI_AssetFields
 
+    asset: pystac.Asset
+    """
+    The :class:`~pystac.Asset` being extended.
+    """
+
     asset_href: str
     """
     The ``href`` value of the :class:`~pystac.Asset` being extended.
@@ -488,18 +1161,44 @@ class ML_AOI_AssetExtension(
     The :class:`~pystac.Asset` fields, including extension properties.
     """
 
-    additional_read_properties: Optional[Iterable[dict[str, Any]]] = None
+    additional_read_properties: Optional[Iterable[dict[str, Any]]]
     """
     If present, this will be a list containing 1 dictionary representing the properties of the owning
     :class:`~pystac.Item`.
     """
 
+    _owner: Optional[Union[pystac.Item, pystac.Collection]]
+
+    role = ML_AOI_FieldProperty(ML_AOI_Role)
+    reference_grid = ML_AOI_FieldProperty(bool)
+    resampling_method = ML_AOI_FieldProperty(ML_AOI_Resampling)
+
     def __init__(self, asset: pystac.Asset):
+        self.asset = asset
+        self._owner = asset.owner
+        self._ml_aoi_extension_state = None
         self.asset_href = asset.href
         self.properties = asset.extra_fields
+        self.additional_read_properties = None
         if asset.owner and isinstance(asset.owner, pystac.Item):
             self.additional_read_properties = [asset.owner.properties]
 
+    def _ml_aoi_updated(self) -> None:
+        _notify_ml_aoi_item_updated(self.asset)
+
+    def _is_ml_aoi_extension_current(self) -> bool:
+        return (
+            self.properties is self.asset.extra_fields
+            and self.asset_href == self.asset.href
+            and self._owner is self.asset.owner
+        )
+
+    def _get_ml_aoi_extension_owner(self) -> Optional[Union[pystac.Item, pystac.Collection]]:
+        return self.asset.owner
+
+    def _get_ml_aoi_extended_object(self) -> pystac.Asset:
+        return self.asset
+
     def __repr__(self) -> str:
         return f"<ML_AOI_AssetExtension Asset href={self.asset_href}>"
     #
@@ -530,14 +1229,19 @@ class ML_AOI_SummariesExtension(
     A concrete implementation of :class:`~SummariesExtension` that extends the ``summaries`` field of a
     :class:`~pystac.Collection` to include properties defined in the :stac-ext:`ML-AOI <ml-aoi>`.
     """
+    __slots__ = ("collection",)
+
     model = ML_AOI_CollectionFields
 
     collection: pystac.Collection
     summaries: pystac.Summaries
 
+    split = ML_AOI_FieldProperty(_as_ml_aoi_splits)
+
     def __init__(self, collection: pystac.Collection):
         self.collection = collection
         super().__init__(collection)
+        self._ml_aoi_extension_state = None
 
     def get_ml_aoi_property(
         self,
@@ -568,14 +1272,39 @@ class ML_AOI_SummariesExtension(
         field = self._retrieve_ml_aoi_property(prop_name, _ml_aoi_required=_ml_aoi_required)
         if field or _ml_aoi_required:
             # prop_name = field.alias or prop_name
-            if not isinstance(value, (list, pystac.RangeSummary, dict)):
+            if value is not None and not isinstance(value, (list, pystac.RangeSummary, dict)):
                 value = [value]
-            self._validate_ml_aoi_property(prop_name, value)
-            prop_name = field.alias or prop_name
+            trusted_scope = _ML_AOI_TRUSTED_SCOPE.get()
+            if trusted_scope is None:
+                self._validate_ml_aoi_property(prop_name, value)
+            else:
+                trusted_scope.track(self)
+            prop_name = get_ml_aoi_field_aliases(self.model)[prop_name]
             super()._set_summary(prop_name, value)
+            self._ml_aoi_updated()
         else:
             object.__setattr__(self, prop_name, value)
 
+    def _ml_aoi_updated(self) -> None:
+        if _ML_AOI_CHANGE_TRACKERS:
+            _notify_ml_aoi_changed(self.collection)
+
+    def _get_ml_aoi_extended_object(self) -> pystac.Collection:
+        return self.collection
+
+    def _write_ml_aoi_property(self, prop_name: str, value: Any) -> None:
+        if value is not None and not isinstance(value, (list, pystac.RangeSummary, dict)):
+            value = [value]
+        super()._set_summary(prop_name, value)
+
+    def _dump_ml_aoi_fields(self) -> dict[str, Any]:
+        summaries = self.summaries.to_dict()
+        return {
+            field: summaries[prop_name]
+            for field, prop_name in get_ml_aoi_field_aliases(self.model).items()
+            if prop_name in summaries
+        }
+
     def _set_summary(
         self,
         prop_name: str,
@@ -591,24 +1320,36 @@ class ML_AOI_CollectionExtension(
     ML_AOI_SummariesExtension,
     ML_AOI_Extension[pystac.Collection]
 ):
+    __slots__ = ("properties",)
+
     model = ML_AOI_CollectionFields
 
     def __init__(self, collection: pystac.Collection):
         ML_AOI_SummariesExtension.__init__(self, collection)
         self.collection = collection
         self.properties = collection.extra_fields
-        self.collection.set_self_href = ML_AOI_CollectionExtension.set_self_href  # override hook
 
     def __repr__(self) -> str:
         return f"<ML_AOI_CollectionExtension Collection id={self.collection.id}>"
 
+    def _is_ml_aoi_extension_current(self) -> bool:
+        return self.properties is self.collection.extra_fields and self.summaries is self.collection.summaries
+
+    def _get_ml_aoi_extension_owner(self) -> pystac.Collection:
+        return self.collection
+
     def set_self_href(self, href: Optional[str]) -> None:
         """
         Sets the absolute HREF that is represented by the ``rel == 'self'`` :class:`~pystac.Link`.
 
         Adds the relevant ML-AOI role applicable for the Collection.
         """
+        previous_href = self.collection.get_self_href()
         pystac.Collection.set_self_href(self.collection, href)
+        if previous_href != self.collection.get_self_href():
+            _rebase_ml_aoi_links(self.collection, previous_href)
+            if _ML_AOI_CHANGE_TRACKERS:
+                _notify_ml_aoi_changed(self.collection, previous_href=previous_href)
         ml_aoi_split = self.get_ml_aoi_property("split")
         if not ml_aoi_split:
             return
@@ -618,6 +1359,13 @@ class ML_AOI_CollectionExtension(
                 link.extra_fields[field_name] = ml_aoi_split[0]
 
 
+_ML_AOI_EXTENSION_TYPES: dict[Optional[Type[ML_AOI_BaseFields]], Type[ML_AOI_Extension[Any]]] = {
+    ML_AOI_CollectionFields: ML_AOI_CollectionExtension,
+    ML_AOI_ItemProperties: ML_AOI_ItemExtension,
+    ML_AOI_AssetFields: ML_AOI_AssetExtension,
+}
+
+
 class ML_AOI_ExtensionHooks(ExtensionHooks):
     schema_uri: str = SCHEMA_URI
     prev_extension_ids = {
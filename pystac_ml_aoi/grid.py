@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to align the feature Assets of ML-AOI Items to the pixel grid of their reference Asset.
+
+Pixel grids are described by the ``proj:shape``, ``proj:transform``, ``proj:epsg`` and ``proj:bbox`` fields of the
+:stac-ext:`Projection Extension <projection>`, defined either by the Assets or by the Item properties.
+"""
+import dataclasses
+import math
+from typing import Any, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pystac
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling, ML_AOI_ResamplingType, ML_AOI_Role, add_ml_aoi_prefix
+
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_REFERENCE_GRID_FIELD = add_ml_aoi_prefix("reference-grid")
+ML_AOI_RESAMPLING_FIELD = add_ml_aoi_prefix("resampling-method")
+
+_ML_AOI_GRID_TOLERANCE = 1e-6  # fraction of a pixel ignored when rounding windows
+
+
+class ML_AOI_Grid(NamedTuple):
+    """
+    Pixel grid of a raster Asset.
+    """
+    shape: Tuple[int, int]
+    """
+    Number of rows and columns.
+    """
+    transform: Tuple[float, float, float, float, float, float]
+    """
+    Affine transform coefficients ``(a, b, c, d, e, f)`` mapping pixel ``(col, row)`` to ``(a*col + b*row + c,
+    d*col + e*row + f)`` coordinates.
+    """
+    epsg: Optional[int]
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Bounding box of the grid, assuming a north-up grid without rotation.
+        """
+        a, _, c, _, e, f = self.transform
+        rows, cols = self.shape
+        x0, x1 = sorted((c, c + a * cols))
+        y0, y1 = sorted((f, f + e * rows))
+        return x0, y0, x1, y1
+
+
+def _get_epsg(fields: Mapping[str, Any]) -> Optional[int]:
+    epsg = fields.get("proj:epsg")
+    if epsg is None and str(fields.get("proj:code", "")).upper().startswith("EPSG:"):
+        epsg = fields["proj:code"].split(":", 1)[-1]
+    return int(epsg) if epsg is not None else None
+
+
+def get_ml_aoi_grid(asset: pystac.Asset, item: Optional[pystac.Item] = None) -> Optional[ML_AOI_Grid]:
+    """
+    Obtains the pixel grid of an Asset from its Projection Extension fields, or from those of its Item.
+
+    When ``proj:transform`` is missing, it is derived from ``proj:bbox`` and ``proj:shape`` for a north-up grid.
+
+    Returns:
+        Pixel grid of the Asset, or ``None`` if its shape or location cannot be determined.
+    """
+    item = item or asset.owner
+    properties = item.properties if isinstance(item, pystac.Item) else {}
+    fields = {**properties, **asset.extra_fields}
+    shape = fields.get("proj:shape")
+    if not shape or len(shape) < 2:
+        return None
+    rows, cols = int(shape[-2]), int(shape[-1])
+    transform = fields.get("proj:transform")
+    bbox = fields.get("proj:bbox")
+    if transform and len(transform) >= 6:
+        transform = tuple(float(coef) for coef in transform[:6])
+    elif bbox and len(bbox) in (4, 6) and rows and cols:
+        minx, miny, maxx, maxy = (bbox[0], bbox[1], bbox[3], bbox[4]) if len(bbox) == 6 else bbox
+        transform = ((maxx - minx) / cols, 0.0, float(minx), 0.0, -(maxy - miny) / rows, float(maxy))
+    else:
+        return None
+    return ML_AOI_Grid(shape=(rows, cols), transform=transform, epsg=_get_epsg(fields))
+
+
+def find_ml_aoi_reference_asset(item: pystac.Item) -> Optional[str]:
+    """
+    Obtains the key of the first Item Asset defining ``ml-aoi:reference-grid: true``.
+    """
+    for key, asset in item.assets.items():
+        if asset.extra_fields.get(ML_AOI_REFERENCE_GRID_FIELD) is True:
+            return key
+    return None
+
+
+class ML_AOI_AssetAlignment(NamedTuple):
+    """
+    Alignment of a feature Asset to the reference grid of its Item.
+    """
+    item_id: str
+    asset_key: str
+    reference_key: str
+    window: Tuple[float, float, float, float]
+    """
+    Exact ``(col_off, row_off, width, height)`` region of the feature Asset, in its own pixels, covering the grid
+    of the reference Asset.
+    """
+    read_window: Tuple[int, int, int, int]
+    """
+    Integer ``(col_off, row_off, width, height)`` pixels of the feature Asset to read, expanded to contain the exact
+    window and clipped to the feature Asset extent.
+    """
+    scale: Tuple[float, float]
+    """
+    Number of ``(x, y)`` feature Asset pixels per reference grid pixel. Values above 1 require downsampling.
+    """
+    resampling_method: ML_AOI_Resampling
+    aligned: bool
+    """
+    Whether the alignment could be computed. Assets without a pixel grid, with a distinct CRS than the reference
+    grid requiring a reprojection, or with rotated grids, are not aligned and define ``NaN`` windows and scales.
+    """
+
+
+@dataclasses.dataclass
+class ML_AOI_AlignmentPlan:
+    """
+    Alignments of feature Assets to the reference grid of their Item, computed for a batch of Items.
+
+    Alignments are stored as columns of arrays, with one row per feature Asset.
+    """
+    item_ids: List[str] = dataclasses.field(default_factory=list)
+    asset_keys: List[str] = dataclasses.field(default_factory=list)
+    reference_keys: List[str] = dataclasses.field(default_factory=list)
+    windows: np.ndarray = dataclasses.field(default_factory=lambda: np.empty((0, 4), dtype=float))
+    read_windows: np.ndarray = dataclasses.field(default_factory=lambda: np.empty((0, 4), dtype=np.int64))
+    scales: np.ndarray = dataclasses.field(default_factory=lambda: np.empty((0, 2), dtype=float))
+    resampling_methods: List[ML_AOI_Resampling] = dataclasses.field(default_factory=list)
+    aligned: np.ndarray = dataclasses.field(default_factory=lambda: np.empty((0,), dtype=bool))
+    unplanned: List[str] = dataclasses.field(default_factory=list)
+    """
+    IDs of Items without any reference grid Asset, or for which the reference grid cannot be determined.
+    """
+
+    def __len__(self) -> int:
+        return len(self.asset_keys)
+
+    def __getitem__(self, index: int) -> ML_AOI_AssetAlignment:
+        return ML_AOI_AssetAlignment(
+            item_id=self.item_ids[index],
+            asset_key=self.asset_keys[index],
+            reference_key=self.reference_keys[index],
+            window=tuple(self.windows[index].tolist()),
+            read_window=tuple(self.read_windows[index].tolist()),
+            scale=tuple(self.scales[index].tolist()),
+            resampling_method=self.resampling_methods[index],
+            aligned=bool(self.aligned[index]),
+        )
+
+    def __iter__(self) -> Iterator[ML_AOI_AssetAlignment]:
+        return (self[index] for index in range(len(self)))
+
+
+def _is_planned_asset(asset: pystac.Asset, include_labels: bool) -> bool:
+    role = asset.extra_fields.get(ML_AOI_ROLE_FIELD)
+    if include_labels and role == ML_AOI_Role.LABEL:
+        return True
+    return role == ML_AOI_Role.FEATURE or (role is None and ML_AOI_RESAMPLING_FIELD in asset.extra_fields)
+
+
+def _as_array(grids: Sequence[Optional[ML_AOI_Grid]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts pixel grids to arrays of transforms, shapes and EPSG codes, with ``NaN`` values for missing grids.
+    """
+    transforms = np.full((len(grids), 6), np.nan, dtype=float)
+    shapes = np.zeros((len(grids), 2), dtype=np.int64)
+    epsg = np.full(len(grids), -1, dtype=np.int64)
+    for index, grid in enumerate(grids):
+        if grid is None:
+            continue
+        transforms[index] = grid.transform
+        shapes[index] = grid.shape
+        epsg[index] = -1 if grid.epsg is None else grid.epsg
+    return transforms, shapes, epsg
+
+
+def plan_ml_aoi_alignment(
+    items: Iterable[pystac.Item],
+    default_resampling: ML_AOI_ResamplingType = ML_AOI_Resampling.NEAR,
+    include_labels: bool = False,
+) -> ML_AOI_AlignmentPlan:
+    """
+    Computes the alignment of every feature Asset of ML-AOI Items to the reference grid of their Item.
+
+    Feature Assets are those with the ``feature`` ML-AOI role, or defining a resampling method without any role,
+    apart from the reference grid Asset itself. The Projection Extension fields of Assets are collected in a single
+    pass over the Items, after which windows and scale factors of all feature Assets are computed at once with
+    vectorized operations. No raster is opened, such that reads can be scheduled from the resulting plan.
+
+    Args:
+        items: ML-AOI Items for which to align feature Assets.
+        default_resampling: Resampling method of feature Assets that do not define any.
+        include_labels: Whether to also align Assets with the ``label`` ML-AOI role.
+    Returns:
+        Alignment plan of all feature Assets.
+    """
+    default_resampling = ML_AOI_Resampling(default_resampling)
+    plan = ML_AOI_AlignmentPlan()
+    ref_grids: List[Optional[ML_AOI_Grid]] = []
+    grids: List[Optional[ML_AOI_Grid]] = []
+    for item in items:
+        ref_key = find_ml_aoi_reference_asset(item)
+        ref_grid = get_ml_aoi_grid(item.assets[ref_key], item) if ref_key is not None else None
+        if ref_grid is None:
+            plan.unplanned.append(item.id)
+            continue
+        for key, asset in item.assets.items():
+            if key == ref_key or not _is_planned_asset(asset, include_labels):
+                continue
+            resampling = asset.extra_fields.get(ML_AOI_RESAMPLING_FIELD)
+            plan.item_ids.append(item.id)
+            plan.asset_keys.append(key)
+            plan.reference_keys.append(ref_key)
+            plan.resampling_methods.append(default_resampling if resampling is None else ML_AOI_Resampling(resampling))
+            ref_grids.append(ref_grid)
+            grids.append(get_ml_aoi_grid(asset, item))
+    if not grids:
+        return plan
+
+    ref_transforms, ref_shapes, ref_epsg = _as_array(ref_grids)
+    transforms, shapes, epsg = _as_array(grids)
+    ref_a, ref_b, ref_c, ref_d, ref_e, ref_f = ref_transforms.T
+    a, b, c, d, e, f = transforms.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # corners of the reference grid, in the feature Asset pixels
+        x0, y0 = ref_c, ref_f
+        x1 = ref_c + ref_a * ref_shapes[:, 1]
+        y1 = ref_f + ref_e * ref_shapes[:, 0]
+        col_off = (x0 - c) / a
+        row_off = (y0 - f) / e
+        width = (x1 - x0) / a
+        height = (y1 - y0) / e
+        scales = np.column_stack([ref_a / a, ref_e / e])
+    aligned = (
+        ~np.isnan(transforms).any(axis=1)
+        & (ref_epsg == epsg)
+        & (ref_b == 0) & (ref_d == 0) & (b == 0) & (d == 0)
+        & (a != 0) & (e != 0)
+    )
+    windows = np.column_stack([col_off, row_off, width, height])
+    windows[~aligned] = np.nan
+    scales[~aligned] = np.nan
+
+    plan.windows = windows
+    plan.read_windows = get_ml_aoi_read_windows(windows, shapes)
+    plan.scales = scales
+    plan.aligned = aligned
+    return plan
+
+
+def get_ml_aoi_grid_window(
+    grid: ML_AOI_Grid,
+    bounds: Sequence[float],
+) -> Tuple[int, int, int, int]:
+    """
+    Obtains the integer ``(col_off, row_off, width, height)`` pixels of a north-up grid covering the bounds,
+    clipped to the grid extent.
+
+    Raises:
+        ValueError: If the grid transform defines a pixel of zero width or height.
+    """
+    a, _, c, _, e, f = grid.transform
+    if a == 0 or e == 0:
+        raise ValueError(f"Cannot obtain the window of a pixel grid of zero width or height: {grid.transform}.")
+    rows, cols = grid.shape
+    minx, miny, maxx, maxy = bounds
+    cols_range = sorted(((minx - c) / a, (maxx - c) / a))
+    rows_range = sorted(((miny - f) / e, (maxy - f) / e))
+    col0 = min(max(math.floor(cols_range[0] + _ML_AOI_GRID_TOLERANCE), 0), cols)
+    row0 = min(max(math.floor(rows_range[0] + _ML_AOI_GRID_TOLERANCE), 0), rows)
+    col1 = min(max(math.ceil(cols_range[1] - _ML_AOI_GRID_TOLERANCE), col0), cols)
+    row1 = min(max(math.ceil(rows_range[1] - _ML_AOI_GRID_TOLERANCE), row0), rows)
+    return col0, row0, col1 - col0, row1 - row0
+
+
+def get_ml_aoi_read_windows(windows: np.ndarray, shapes: np.ndarray) -> np.ndarray:
+    """
+    Obtains the integer pixels to read for exact windows, expanded to whole pixels and clipped to the grid extents.
+
+    Args:
+        windows: Exact ``(col_off, row_off, width, height)`` windows, with ``NaN`` values for undefined windows.
+        shapes: Number of ``(rows, cols)`` of the grids of every window.
+    Returns:
+        Integer ``(col_off, row_off, width, height)`` windows, empty for undefined windows.
+    """
+    # ignore floating point errors when expanding to whole pixels
+    start = np.floor(windows[:, :2] + _ML_AOI_GRID_TOLERANCE)
+    stop = np.ceil(windows[:, :2] + windows[:, 2:] - _ML_AOI_GRID_TOLERANCE)
+    extent = shapes[:, ::-1]  # (cols, rows)
+    start = np.clip(np.nan_to_num(start), 0, extent)
+    stop = np.clip(np.nan_to_num(stop), start, extent)
+    read_windows = np.column_stack([start, stop - start]).astype(np.int64)
+    read_windows[np.isnan(windows).any(axis=1)] = 0
+    return read_windows
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-memory index of ML-AOI fields for STAC Items of a :class:`pystac.Collection`.
+"""
+import enum
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import pystac
+
+from pystac_ml_aoi.extensions.ml_aoi import _ML_AOI_ITEM_INDEXES, ML_AOI_Role, ML_AOI_SplitType, add_ml_aoi_prefix
+
+ML_AOI_INDEXED_ASSET_FIELDS = (
+    add_ml_aoi_prefix("role"),
+    add_ml_aoi_prefix("reference-grid"),
+    add_ml_aoi_prefix("resampling-method"),
+)
+
+_ML_AOI_COLLECTION_INDEXES: "weakref.WeakKeyDictionary[pystac.Collection, ML_AOI_CollectionIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+
+AssetEntry = Tuple[str, Any, str]  # field, value, asset key
+
+
+def _normalize_value(value: Any) -> Any:
+    # enum members do not share the hash of their value
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+class ML_AOI_CollectionIndex:
+    """
+    Index of ML-AOI splits of STAC Items and ML-AOI fields of their Assets within a :class:`pystac.Collection`.
+
+    The index is built in a single pass over the Items of the Collection. It is then maintained incrementally for
+    every Item modified through :class:`pystac_ml_aoi.extensions.ml_aoi.ML_AOI_Extension` methods. Items added to or
+    removed from the Collection after the index creation must be reported with :meth:`add_item` and
+    :meth:`remove_item`. Modifications applied directly to the STAC Items properties or Assets fields, without the
+    extension, must be reported with :meth:`update_item`.
+
+    This class should generally not be instantiated directly. Instead, call :func:`get_ml_aoi_index`.
+    """
+
+    def __init__(self, collection: pystac.Collection, items: Optional[Iterable[pystac.Item]] = None) -> None:
+        # weak reference, such that the index attached to the Collection does not keep it alive
+        self._collection = weakref.ref(collection)
+        self._splits: Dict[Any, Dict[str, None]] = {}  # split -> ordered item IDs
+        self._assets: Dict[str, Dict[Any, Dict[str, Dict[str, None]]]] = {
+            field: {} for field in ML_AOI_INDEXED_ASSET_FIELDS
+        }  # field -> value -> item ID -> ordered asset keys
+        self._entries: Dict[str, Tuple[Any, List[AssetEntry], Dict[str, int]]] = {}
+        self._items: "weakref.WeakValueDictionary[str, pystac.Item]" = weakref.WeakValueDictionary()
+        for item in collection.get_items() if items is None else items:
+            self.add_item(item)
+
+    def __repr__(self) -> str:
+        collection = self.collection
+        collection_id = collection.id if collection is not None else None
+        return f"<ML_AOI_CollectionIndex Collection id={collection_id} items={len(self._entries)}>"
+
+    @property
+    def collection(self) -> Optional[pystac.Collection]:
+        """
+        Indexed Collection, or ``None`` if it was garbage collected.
+        """
+        return self._collection()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._entries
+
+    def add_item(self, item: pystac.Item) -> None:
+        """
+        Indexes the ML-AOI fields of the Item and its Assets, replacing any previous entry of the same Item ID.
+        """
+        self.remove_item(item.id)
+        split = _normalize_value(item.properties.get(add_ml_aoi_prefix("split")))
+        self._splits.setdefault(split, {})[item.id] = None
+        entries = []
+        for key, asset in item.assets.items():
+            for field in ML_AOI_INDEXED_ASSET_FIELDS:
+                value = asset.extra_fields.get(field)
+                if value is None:
+                    continue
+                for val in value if isinstance(value, list) else [value]:
+                    val = _normalize_value(val)
+                    self._assets[field].setdefault(val, {}).setdefault(item.id, {})[key] = None
+                    entries.append((field, val, key))
+        order = {key: pos for pos, key in enumerate(item.assets)}
+        self._entries[item.id] = (split, entries, order)
+        self._items[item.id] = item
+        _ML_AOI_ITEM_INDEXES[item] = self
+
+    def update_item(self, item: pystac.Item) -> None:
+        """
+        Updates the indexed ML-AOI fields of the Item and its Assets after their modification.
+        """
+        self.add_item(item)
+
+    def remove_item(self, item_id: str) -> None:
+        """
+        Removes all indexed ML-AOI fields of the Item, if it was indexed.
+        """
+        item = self._items.pop(item_id, None)
+        if item is not None and _ML_AOI_ITEM_INDEXES.get(item) is self:
+            del _ML_AOI_ITEM_INDEXES[item]
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        split, entries, _ = entry
+        item_ids = self._splits[split]
+        item_ids.pop(item_id, None)
+        if not item_ids:
+            del self._splits[split]
+        for field, value, key in entries:
+            items = self._assets[field].get(value, {})
+            keys = items.get(item_id, {})
+            keys.pop(key, None)
+            if not keys:
+                items.pop(item_id, None)
+            if not items:
+                self._assets[field].pop(value, None)
+
+    def is_item_current(self, item: pystac.Item) -> bool:
+        """
+        Indicates whether the Item is indexed with the same Asset keys as its current Assets.
+        """
+        entry = self._entries.get(item.id)
+        return entry is not None and entry[2].keys() == item.assets.keys()
+
+    def get_item_ids(self, split: Optional[ML_AOI_SplitType]) -> List[str]:
+        """
+        Obtains the IDs of Items with the specified ML-AOI split, or without any split if ``None``.
+        """
+        return list(self._splits.get(_normalize_value(split), {}))
+
+    def get_splits(self) -> Dict[Any, List[str]]:
+        """
+        Obtains the IDs of Items grouped by ML-AOI split.
+        """
+        return {split: list(item_ids) for split, item_ids in self._splits.items()}
+
+    def _find(
+        self,
+        role: Optional[Union[ML_AOI_Role, List[ML_AOI_Role]]],
+        reference_grid: Optional[bool],
+        resampling_method: Optional[str],
+    ) -> List[Dict[str, Dict[str, None]]]:
+        """
+        Obtains the mappings of Item IDs to asset keys for each of the specified filters.
+        """
+        matches = []
+        if role:
+            roles = [role] if isinstance(role, str) else role
+            role_matches: Dict[str, Dict[str, None]] = {}
+            role_assets = self._assets[ML_AOI_INDEXED_ASSET_FIELDS[0]]
+            for _role in roles:
+                for item_id, keys in role_assets.get(_normalize_value(_role), {}).items():
+                    role_matches.setdefault(item_id, {}).update(keys)
+            matches.append(role_matches)
+        if reference_grid is not None:
+            matches.append(self._assets[ML_AOI_INDEXED_ASSET_FIELDS[1]].get(reference_grid, {}))
+        if resampling_method is not None:
+            matches.append(self._assets[ML_AOI_INDEXED_ASSET_FIELDS[2]].get(_normalize_value(resampling_method), {}))
+        return matches
+
+    def get_asset_keys(
+        self,
+        item_id: str,
+        role: Optional[Union[ML_AOI_Role, List[ML_AOI_Role]]] = None,
+        reference_grid: Optional[bool] = None,
+        resampling_method: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Obtains the keys of the Item's Assets matching all the specified ML-AOI fields.
+
+        Filters with ``None`` values are ignored. A list of roles matches any of them.
+        Keys are returned in the same order as the Item's Assets.
+        """
+        entry = self._entries.get(item_id)
+        if entry is None:
+            return []
+        order = entry[2]
+        matches = self._find(role, reference_grid, resampling_method)
+        if not matches:
+            return list(order)
+        keys = sorted((match.get(item_id, {}) for match in matches), key=len)
+        found = [key for key in keys[0] if all(key in other for other in keys[1:])]
+        return sorted(found, key=order.__getitem__)
+
+    def get_assets_keys(
+        self,
+        role: Optional[Union[ML_AOI_Role, List[ML_AOI_Role]]] = None,
+        reference_grid: Optional[bool] = None,
+        resampling_method: Optional[str] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Obtains the keys of Assets matching all the specified ML-AOI fields, grouped by Item ID.
+
+        At least one filter must be specified.
+        """
+        matches = sorted(self._find(role, reference_grid, resampling_method), key=len)
+        if not matches:
+            raise ValueError("At least one ML-AOI field filter must be specified.")
+        results = {}
+        for item_id in matches[0]:
+            if all(item_id in other for other in matches[1:]):
+                keys = self.get_asset_keys(item_id, role, reference_grid, resampling_method)
+                if keys:
+                    results[item_id] = keys
+        return results
+
+
+def get_ml_aoi_index(collection: pystac.Collection, create: bool = True) -> Optional[ML_AOI_CollectionIndex]:
+    """
+    Obtains the ML-AOI index attached to the Collection.
+
+    Args:
+        collection: Collection for which to retrieve the index.
+        create: Build and attach the index from the Collection's Items if it does not exist.
+    Returns:
+        The attached index, or ``None`` if missing and not requested to create it.
+    """
+    index = _ML_AOI_COLLECTION_INDEXES.get(collection)
+    if index is None and create:
+        index = _ML_AOI_COLLECTION_INDEXES[collection] = ML_AOI_CollectionIndex(collection)
+    return index
+
+
+def drop_ml_aoi_index(collection: pystac.Collection) -> None:
+    """
+    Detaches the ML-AOI index from the Collection, such that it is not maintained anymore.
+    """
+    index = _ML_AOI_COLLECTION_INDEXES.pop(collection, None)
+    if index is None:
+        return
+    for item, item_index in list(_ML_AOI_ITEM_INDEXES.items()):
+        if item_index is index:
+            del _ML_AOI_ITEM_INDEXES[item]
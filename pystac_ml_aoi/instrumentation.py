@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of the ML-AOI extension hot paths.
+
+Instrumented methods of :class:`pystac_ml_aoi.extensions.ml_aoi.ML_AOI_Extension` classes are only wrapped while
+the instrumentation is enabled. Once disabled, the original methods are restored, such that no overhead remains.
+"""
+import contextlib
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension
+
+ML_AOI_INSTRUMENTED_METHODS = (
+    "_validate_ml_aoi_property",
+    "apply",
+    "set_ml_aoi_property",
+    "get_assets",
+    "ext",
+)
+
+ML_AOI_InstrumentationCallback = Callable[[str, float], None]
+"""
+Hook called with the instrumented method name and the duration of each call, in seconds.
+"""
+
+
+class ML_AOI_CallStats(NamedTuple):
+    """
+    Statistics of calls to an instrumented ML-AOI method.
+    """
+    calls: int
+    total_time: float
+    """
+    Cumulative duration of calls, in seconds, including the duration of nested instrumented calls.
+    """
+
+
+_ML_AOI_LOCK = threading.Lock()
+_ML_AOI_STATS: Dict[str, List[Any]] = {name: [0, 0.0] for name in ML_AOI_INSTRUMENTED_METHODS}
+_ML_AOI_PATCHED: List[Tuple[type, str, Any]] = []  # class, method name, original descriptor
+_ML_AOI_HOOK: Dict[str, Optional[ML_AOI_InstrumentationCallback]] = {"callback": None}
+
+
+def _instrument(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    stats = _ML_AOI_STATS[name]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            stats[0] += 1
+            stats[1] += duration
+            callback = _ML_AOI_HOOK["callback"]
+            if callback is not None:
+                callback(name, duration)
+
+    return wrapper
+
+
+def _iter_ml_aoi_extension_classes() -> Iterator[type]:
+    pending = [ML_AOI_Extension]
+    visited = set()
+    while pending:
+        cls = pending.pop()
+        if cls in visited:  # reached multiple times by multiple inheritance
+            continue
+        visited.add(cls)
+        yield cls
+        pending.extend(cls.__subclasses__())
+
+
+def is_ml_aoi_instrumentation_enabled() -> bool:
+    """
+    Indicates whether the ML-AOI extension methods are currently instrumented.
+    """
+    return bool(_ML_AOI_PATCHED)
+
+
+def enable_ml_aoi_instrumentation(callback: Optional[ML_AOI_InstrumentationCallback] = None) -> None:
+    """
+    Instruments the ML-AOI extension methods to count their calls and accumulate their durations.
+
+    Accumulated statistics are preserved across calls of this function. Use :func:`reset_ml_aoi_instrumentation`
+    to clear them. Counters are not synchronized between threads, and should be considered approximate when the
+    instrumented methods are called concurrently.
+
+    Args:
+        callback: Hook called after every instrumented call. Replaces any previously defined hook.
+    """
+    with _ML_AOI_LOCK:
+        _ML_AOI_HOOK["callback"] = callback
+        if _ML_AOI_PATCHED:
+            return
+        for cls in _iter_ml_aoi_extension_classes():
+            for name in ML_AOI_INSTRUMENTED_METHODS:
+                original = vars(cls).get(name)
+                if original is None:
+                    continue
+                if isinstance(original, (classmethod, staticmethod)):
+                    patched = type(original)(_instrument(name, original.__func__))
+                else:
+                    patched = _instrument(name, original)
+                _ML_AOI_PATCHED.append((cls, name, original))
+                setattr(cls, name, patched)
+
+
+def disable_ml_aoi_instrumentation() -> None:
+    """
+    Restores the original ML-AOI extension methods and removes the callback hook.
+
+    Accumulated statistics are preserved until :func:`reset_ml_aoi_instrumentation` is called.
+    """
+    with _ML_AOI_LOCK:
+        _ML_AOI_HOOK["callback"] = None
+        while _ML_AOI_PATCHED:
+            cls, name, original = _ML_AOI_PATCHED.pop()
+            setattr(cls, name, original)
+
+
+def get_ml_aoi_instrumentation_snapshot() -> Dict[str, ML_AOI_CallStats]:
+    """
+    Obtains a copy of the accumulated statistics of every instrumented ML-AOI method.
+    """
+    return {name: ML_AOI_CallStats(*stats) for name, stats in _ML_AOI_STATS.items()}
+
+
+def reset_ml_aoi_instrumentation() -> None:
+    """
+    Clears the accumulated statistics of every instrumented ML-AOI method.
+    """
+    for stats in _ML_AOI_STATS.values():
+        stats[0] = 0
+        stats[1] = 0.0
+
+
+@contextlib.contextmanager
+def ml_aoi_instrumented(
+    callback: Optional[ML_AOI_InstrumentationCallback] = None,
+) -> Iterator[Dict[str, ML_AOI_CallStats]]:
+    """
+    Scope within which the ML-AOI extension methods are instrumented.
+
+    Statistics are reset when entering the scope. The yielded mapping is filled with their snapshot when leaving it.
+    Instrumentation is disabled when leaving the scope, unless it was already enabled before entering it.
+
+    Args:
+        callback: Hook called after every instrumented call within the scope.
+    """
+    enabled = is_ml_aoi_instrumentation_enabled()
+    previous = _ML_AOI_HOOK["callback"]
+    reset_ml_aoi_instrumentation()
+    enable_ml_aoi_instrumentation(callback)
+    snapshot: Dict[str, ML_AOI_CallStats] = {}
+    try:
+        yield snapshot
+    finally:
+        snapshot.update(get_ml_aoi_instrumentation_snapshot())
+        if enabled:
+            enable_ml_aoi_instrumentation(previous)
+        else:
+            disable_ml_aoi_instrumentation()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to join ML-AOI Items with the ``label`` Item they link to.
+
+As decided in ``docs/0004-multiple-label-items.md``, ML-AOI Items link to a single ``label`` Item, from which they can
+copy all ``label`` extension properties such that consumers do not need to follow the link.
+"""
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, MutableMapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import pystac
+from pystac.utils import make_absolute_href
+
+from pystac_ml_aoi.extensions.ml_aoi import (
+    _ML_AOI_CHANGE_TRACKERS,
+    ML_AOI_Role,
+    _notify_ml_aoi_changed,
+    add_ml_aoi_prefix
+)
+
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_LABEL_PREFIX = "label:"
+ML_AOI_LABEL_SCHEMA_PREFIX = "https://stac-extensions.github.io/label/"
+
+_ML_AOI_LABEL_INDEX: Optional["ML_AOI_LabelIndex"] = None  # index of worker processes
+
+
+class ML_AOI_LabelEntry(NamedTuple):
+    """
+    Fields of a ``label`` Item copied to the ML-AOI Items linking to it.
+    """
+    item_id: str
+    href: Optional[str]
+    properties: Dict[str, Any]
+    """
+    The ``label:*`` properties of the label Item.
+    """
+    stac_extensions: List[str]
+    """
+    Schema URIs of the ``label`` extension declared by the label Item.
+    """
+
+
+@dataclasses.dataclass
+class ML_AOI_LabelIndex:
+    """
+    Hash index of ``label`` Items by location and by ID.
+
+    Only the ``label:*`` properties of label Items are retained, such that the index remains compact and can be sent
+    to worker processes.
+    """
+    hrefs: Dict[str, ML_AOI_LabelEntry] = dataclasses.field(default_factory=dict)
+    ids: Dict[str, Optional[ML_AOI_LabelEntry]] = dataclasses.field(default_factory=dict)
+    """
+    Label Items by ID, with ``None`` for IDs shared by distinct label Items, which cannot be matched by ID.
+    """
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, item: pystac.Item, href: Optional[str] = None) -> None:
+        """
+        Adds a label Item to the index, at its self location unless another location is provided.
+        """
+        href = href or item.get_self_href()
+        entry = ML_AOI_LabelEntry(
+            item_id=item.id,
+            href=href,
+            properties={key: value for key, value in item.properties.items() if key.startswith(ML_AOI_LABEL_PREFIX)},
+            stac_extensions=[uri for uri in item.stac_extensions if uri.startswith(ML_AOI_LABEL_SCHEMA_PREFIX)],
+        )
+        if href:
+            self.hrefs[href] = entry
+        if item.id in self.ids and self.ids[item.id] != entry:
+            self.ids[item.id] = None
+        else:
+            self.ids[item.id] = entry
+
+    def get(self, href: Optional[str], item_id: Optional[str] = None) -> Optional[ML_AOI_LabelEntry]:
+        """
+        Obtains the label Item at the location, or with the ID when the location is not indexed.
+        """
+        entry = self.hrefs.get(href) if href else None
+        if entry is None and item_id is not None:
+            entry = self.ids.get(item_id)
+        return entry
+
+
+def index_ml_aoi_label_items(
+    label_items: Iterable[Union[str, pystac.Item]],
+    stac_io: Optional[pystac.StacIO] = None,
+) -> ML_AOI_LabelIndex:
+    """
+    Loads ``label`` Items once to index them by location and by ID.
+
+    Args:
+        label_items: Label Items, or their locations.
+        stac_io: I/O implementation to read label Items provided by location.
+    """
+    index = ML_AOI_LabelIndex()
+    for item in label_items:
+        if isinstance(item, str):
+            href = make_absolute_href(item)
+            index.add(pystac.Item.from_file(href, stac_io=stac_io), href)
+        else:
+            index.add(item)
+    return index
+
+
+@dataclasses.dataclass
+class ML_AOI_LabelJoin:
+    """
+    Outcome of joining ML-AOI Items with their ``label`` Item.
+    """
+    joined: int = 0
+    """
+    Number of ML-AOI Items matched with their label Item.
+    """
+    updated: List[str] = dataclasses.field(default_factory=list)
+    """
+    IDs of ML-AOI Items for which ``label:*`` properties were copied with modifications.
+    """
+    mismatches: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
+    """
+    Names of ``label:*`` properties that differ from the label Item, by ML-AOI Item ID, when only verified.
+    """
+    missing: List[str] = dataclasses.field(default_factory=list)
+    """
+    IDs of ML-AOI Items without any link with the ``label`` ML-AOI role.
+    """
+    duplicates: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
+    """
+    Locations of distinct label links, by ID of ML-AOI Items linking to more than one label Item.
+    """
+    unresolved: Dict[str, str] = dataclasses.field(default_factory=dict)
+    """
+    Location of the label link, by ID of ML-AOI Items linking to a label Item that is not indexed.
+    """
+
+    @property
+    def valid(self) -> bool:
+        """
+        Indicates whether every ML-AOI Item was matched with a single label Item without any mismatch.
+        """
+        return not (self.mismatches or self.missing or self.duplicates or self.unresolved)
+
+    def merge(self, other: "ML_AOI_LabelJoin") -> None:
+        """
+        Accumulates the outcome of joining another set of ML-AOI Items.
+        """
+        self.joined += other.joined
+        self.updated.extend(other.updated)
+        self.mismatches.update(other.mismatches)
+        self.missing.extend(other.missing)
+        self.duplicates.update(other.duplicates)
+        self.unresolved.update(other.unresolved)
+
+
+def _join_label(
+    result: ML_AOI_LabelJoin,
+    index: ML_AOI_LabelIndex,
+    item_id: str,
+    links: Sequence[Tuple[Optional[str], Optional[str]]],
+    properties: MutableMapping[str, Any],
+    stac_extensions: List[str],
+    verify: bool,
+) -> bool:
+    """
+    Joins the fields of an ML-AOI Item with its label Item, given the ``(href, target ID)`` of its label links.
+
+    Returns:
+        Whether the fields of the ML-AOI Item were modified.
+    """
+    hrefs = list(dict.fromkeys(href for href, _ in links))
+    if not links:
+        result.missing.append(item_id)
+        return False
+    if len(hrefs) > 1:
+        result.duplicates[item_id] = hrefs
+        return False
+    entry = index.get(*links[0])
+    if entry is None:
+        result.unresolved[item_id] = hrefs[0]
+        return False
+    result.joined += 1
+
+    current = {key: value for key, value in properties.items() if key.startswith(ML_AOI_LABEL_PREFIX)}
+    if current == entry.properties and all(uri in stac_extensions for uri in entry.stac_extensions):
+        return False
+    if verify:
+        mismatches = sorted(
+            key for key in {**current, **entry.properties} if current.get(key) != entry.properties.get(key)
+        )
+        if not all(uri in stac_extensions for uri in entry.stac_extensions):
+            mismatches.append("stac_extensions")
+        result.mismatches[item_id] = mismatches
+        return False
+    for key in current:
+        if key not in entry.properties:
+            del properties[key]
+    properties.update(entry.properties)
+    stac_extensions.extend(uri for uri in entry.stac_extensions if uri not in stac_extensions)
+    result.updated.append(item_id)
+    return True
+
+
+def _get_item_label_links(item: pystac.Item) -> List[Tuple[Optional[str], Optional[str]]]:
+    links = []
+    for link in item.links:
+        if link.extra_fields.get(ML_AOI_ROLE_FIELD) == ML_AOI_Role.LABEL:
+            target_id = link.target.id if link.is_resolved() and isinstance(link.target, pystac.Item) else None
+            links.append((link.get_absolute_href() or link.href, target_id))
+    return links
+
+
+def _join_ml_aoi_label_hrefs(
+    hrefs: List[str],
+    verify: bool,
+    index: Optional[ML_AOI_LabelIndex] = None,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> ML_AOI_LabelJoin:
+    """
+    Joins ML-AOI Items by location, operating on their JSON documents that are rewritten only when modified.
+    """
+    index = _ML_AOI_LABEL_INDEX if index is None else index
+    stac_io = stac_io or pystac.StacIO.default()
+    result = ML_AOI_LabelJoin()
+    for href in hrefs:
+        data = stac_io.read_json(href)
+        links = [
+            (make_absolute_href(link["href"], href), None)
+            for link in data.get("links", [])
+            if link.get(ML_AOI_ROLE_FIELD) == ML_AOI_Role.LABEL
+        ]
+        properties = data.setdefault("properties", {})
+        stac_extensions = data.setdefault("stac_extensions", [])
+        if _join_label(result, index, data["id"], links, properties, stac_extensions, verify):
+            stac_io.save_json(href, data)
+    return result
+
+
+def _init_ml_aoi_label_worker(index: ML_AOI_LabelIndex) -> None:
+    global _ML_AOI_LABEL_INDEX  # pylint: disable=global-statement
+    _ML_AOI_LABEL_INDEX = index
+
+
+def join_ml_aoi_label_items(
+    items: Iterable[Union[str, pystac.Item]],
+    label_items: Union[ML_AOI_LabelIndex, Iterable[Union[str, pystac.Item]]],
+    verify: bool = False,
+    processes: Optional[int] = None,
+    chunk_size: int = 1000,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> ML_AOI_LabelJoin:
+    """
+    Joins ML-AOI Items with the ``label`` Item they link to, copying or verifying their ``label:*`` properties.
+
+    Label Items are loaded once into a hash index by location and by ID. ML-AOI Items are then matched in a single
+    pass through their link with the ``label`` ML-AOI role, either by its absolute location or by the ID of its
+    resolved target. When copying, ``label:*`` properties of ML-AOI Items are replaced by those of their label Item,
+    along with the ``label`` extension schema. ML-AOI Items without any label link, linking to more than one label
+    Item, or linking to a label Item that is not indexed, are reported and left unchanged. Modified ML-AOI Items are
+    recorded by active :class:`pystac_ml_aoi.changes.ML_AOI_ChangeTracker`.
+
+    Args:
+        items:
+            ML-AOI Items, which are modified in place, or their locations, for which JSON documents are rewritten
+            only when modified.
+        label_items: Label Items, their locations, or their index obtained with :func:`index_ml_aoi_label_items`.
+        verify: Whether to only report ``label:*`` properties that differ from the label Item, without copying them.
+        processes:
+            Number of worker processes across which to shard the ML-AOI Items provided by location.
+            The label index is sent once to every worker process. Other Items are joined in the current process.
+        chunk_size: Number of ML-AOI Items joined by a worker process at once.
+        stac_io:
+            I/O implementation to read label Items, and to read and write ML-AOI Items, provided by location.
+            It is sent to worker processes, and must therefore be picklable when using them.
+    Returns:
+        Outcome of the join.
+    """
+    if isinstance(label_items, ML_AOI_LabelIndex):
+        index = label_items
+    else:
+        index = index_ml_aoi_label_items(label_items, stac_io=stac_io)
+    result = ML_AOI_LabelJoin()
+    hrefs = []
+    for item in items:
+        if isinstance(item, str):
+            hrefs.append(make_absolute_href(item))
+            continue
+        links = _get_item_label_links(item)
+        if _join_label(result, index, item.id, links, item.properties, item.stac_extensions, verify):
+            if _ML_AOI_CHANGE_TRACKERS:
+                _notify_ml_aoi_changed(item)
+    chunks = [hrefs[start:start + chunk_size] for start in range(0, len(hrefs), chunk_size)]
+    if processes and chunks:
+        with ProcessPoolExecutor(processes, initializer=_init_ml_aoi_label_worker, initargs=(index,)) as executor:
+            count = len(chunks)
+            for chunk_result in executor.map(
+                _join_ml_aoi_label_hrefs, chunks, [verify] * count, [None] * count, [stac_io] * count
+            ):
+                result.merge(chunk_result)
+    else:
+        for chunk in chunks:
+            result.merge(_join_ml_aoi_label_hrefs(chunk, verify, index, stac_io))
+    return result
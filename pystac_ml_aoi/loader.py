@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to load ML-AOI Items along with their linked label and feature Items concurrently.
+"""
+import asyncio
+import collections
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Union
+
+import pystac
+from pystac.utils import make_absolute_href
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_ItemExtension, ML_AOI_Role, add_ml_aoi_prefix
+
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_LOADER_CONCURRENCY = 32
+
+_ML_AOI_LINK_ROLES = (ML_AOI_Role.LABEL.value, ML_AOI_Role.FEATURE.value)
+
+
+class ML_AOI_AsyncStacIO:
+    """
+    Asynchronous reader of STAC documents, delegating blocking reads of a :class:`pystac.StacIO` to worker threads.
+
+    Using :class:`pystac_ml_aoi.stac_io.ML_AOI_CachedStacIO` as the underlying implementation allows each worker
+    thread to reuse its pooled HTTP connections, and to avoid fetching documents that are already cached.
+    """
+
+    def __init__(self, stac_io: Optional[pystac.StacIO] = None, max_workers: int = ML_AOI_LOADER_CONCURRENCY) -> None:
+        """
+        Args:
+            stac_io: I/O implementation to read STAC documents. Uses the default :class:`pystac.StacIO` if omitted.
+            max_workers: Number of worker threads performing blocking reads.
+        """
+        self.stac_io = stac_io or pystac.StacIO.default()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-aoi-io")
+
+    async def __aenter__(self) -> "ML_AOI_AsyncStacIO":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """
+        Stops the worker threads once their pending reads are completed.
+        """
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """
+        Stops the worker threads once their pending reads are completed, without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    async def read_text(self, href: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.stac_io.read_text, href)
+
+    async def read_json(self, href: str) -> Dict[str, Any]:
+        return json.loads(await self.read_text(href))
+
+    async def read_item(self, href: str) -> pystac.Item:
+        data = await self.read_json(href)
+        return pystac.Item.from_dict(data, href=href, preserve_dict=False)
+
+
+class ML_AOI_LoadedItem(NamedTuple):
+    """
+    ML-AOI Item with its resolved label and feature Items.
+    """
+    item: ML_AOI_ItemExtension
+    label: Optional[pystac.Item]
+    """
+    Label Item linked with ``ml-aoi:role: label``, if any.
+    """
+    features: List[pystac.Item]
+    """
+    Feature Items linked with ``ml-aoi:role: feature``, in the order of their links.
+    """
+
+
+class _ML_AOI_LinkResolver:
+    """
+    Resolves linked STAC Items with a bounded number of concurrent reads.
+
+    Items linked from multiple ML-AOI Items being loaded at once, such as a label Item shared between them, are read
+    only once. Reads are counted by the loads requiring them, and released once none of those loads needs them anymore,
+    such that resolved Items are not retained for the whole stream.
+    """
+
+    def __init__(self, stac_io: ML_AOI_AsyncStacIO, concurrency: int) -> None:
+        self.stac_io = stac_io
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending: Dict[str, "asyncio.Future[pystac.Item]"] = {}
+        self.references: "collections.Counter[str]" = collections.Counter()
+
+    async def _read_item(self, href: str) -> pystac.Item:
+        async with self.semaphore:
+            return await self.stac_io.read_item(href)
+
+    def read_item(self, href: str) -> "asyncio.Future[pystac.Item]":
+        future = self.pending.get(href)
+        if future is None:
+            future = self.pending[href] = asyncio.ensure_future(self._read_item(href))
+        self.references[href] += 1
+        return future
+
+    def release(self, href: str) -> None:
+        self.references[href] -= 1
+        if not self.references[href]:
+            del self.references[href]
+            self.pending.pop(href).cancel()
+
+    async def load(self, item: Union[str, pystac.Item], resolve_links: bool) -> ML_AOI_LoadedItem:
+        if isinstance(item, str):
+            item = await self._read_item(make_absolute_href(item))
+        label = None
+        features = []
+        if resolve_links:
+            # schedule all reads before awaiting any of them to resolve the links concurrently
+            links = []
+            try:
+                for link in item.links:
+                    role = link.extra_fields.get(ML_AOI_ROLE_FIELD)
+                    if role in _ML_AOI_LINK_ROLES:
+                        href = None if link.is_resolved() else link.get_absolute_href()
+                        future = None if href is None else self.read_item(href)
+                        links.append((link, role, href, future))
+                for link, role, _, future in links:
+                    if future is not None:
+                        link.target = await future
+                    target = link.target
+                    if not isinstance(target, pystac.Item):
+                        raise pystac.STACTypeError(target.to_dict(), pystac.Item)
+                    if role == ML_AOI_Role.LABEL:
+                        label = label or target
+                    else:
+                        features.append(target)
+            finally:
+                for _, _, href, _ in links:
+                    if href is not None:
+                        self.release(href)
+        return ML_AOI_LoadedItem(item=ML_AOI_Extension.ext(item), label=label, features=features)
+
+
+async def aiter_ml_aoi_items(
+    items: Iterable[Union[str, pystac.Item]],
+    stac_io: Optional[Union[pystac.StacIO, ML_AOI_AsyncStacIO]] = None,
+    concurrency: int = ML_AOI_LOADER_CONCURRENCY,
+    resolve_links: bool = True,
+) -> AsyncIterator[ML_AOI_LoadedItem]:
+    """
+    Load ML-AOI Items and resolve their label and feature links concurrently.
+
+    Label and feature links are identified by their ``ml-aoi:role``. Their targets are read concurrently and assigned
+    to the links, such that they are not read again when accessed through :mod:`pystac`. At most ``concurrency``
+    documents are read at once, and a bounded number of Items are loaded ahead of those being consumed, such that
+    arbitrarily large sets of Items can be streamed. Items are returned in the same order as they are provided.
+
+    Args:
+        items: ML-AOI Items, or their locations, to load.
+        stac_io:
+            I/O implementation to read STAC documents. A blocking :class:`pystac.StacIO` is wrapped with
+            :class:`ML_AOI_AsyncStacIO` using one worker thread per concurrent read.
+        concurrency: Maximum number of STAC documents read at once.
+        resolve_links: Whether to resolve the label and feature links, or only load the ML-AOI Items.
+    Yields:
+        Loaded ML-AOI Items, extended with :class:`ML_AOI_Extension`.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be a positive number.")
+    async_io = stac_io if isinstance(stac_io, ML_AOI_AsyncStacIO) else ML_AOI_AsyncStacIO(stac_io, concurrency)
+    resolver = _ML_AOI_LinkResolver(async_io, concurrency)
+    loading: "collections.deque[asyncio.Future[ML_AOI_LoadedItem]]" = collections.deque()
+    try:
+        for item in items:
+            loading.append(asyncio.ensure_future(resolver.load(item, resolve_links)))
+            if len(loading) >= concurrency * 2:
+                yield await loading.popleft()
+        while loading:
+            yield await loading.popleft()
+    finally:
+        for future in [*loading, *resolver.pending.values()]:
+            future.cancel()
+        if async_io is not stac_io:
+            await async_io.aclose()
+
+
+def load_ml_aoi_items(
+    items: Iterable[Union[str, pystac.Item]],
+    stac_io: Optional[pystac.StacIO] = None,
+    concurrency: int = ML_AOI_LOADER_CONCURRENCY,
+    resolve_links: bool = True,
+) -> List[ML_AOI_LoadedItem]:
+    """
+    Load ML-AOI Items and resolve their label and feature links concurrently from synchronous code.
+
+    See :func:`aiter_ml_aoi_items` for details.
+    """
+    async def _collect() -> List[ML_AOI_LoadedItem]:
+        return [loaded async for loaded in aiter_ml_aoi_items(items, stac_io, concurrency, resolve_links)]
+
+    return asyncio.run(_collect())
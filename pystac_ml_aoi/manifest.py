@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to export ML-AOI Items into columnar training manifests partitioned by ML-AOI split.
+
+Manifests are written and read with :mod:`pyarrow`, which must be installed separately, such as with the
+``manifest`` extra (``pip install pystac-ml-aoi[manifest]``).
+"""
+import enum
+import itertools
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Union
+
+import pystac
+
+from pystac_ml_aoi.catalog import get_bbox_2d, iter_items_by_split
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Role, ML_AOI_Split, ML_AOI_SplitType, add_ml_aoi_prefix
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.fs
+except ImportError:  # pragma: no cover  # optional dependency
+    pyarrow = None
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_REFERENCE_GRID_FIELD = add_ml_aoi_prefix("reference-grid")
+ML_AOI_RESAMPLING_FIELD = add_ml_aoi_prefix("resampling-method")
+ML_AOI_MANIFEST_BATCH_SIZE = 10_000
+
+ManifestFormat = Literal["parquet", "arrow"]
+ManifestRecord = Dict[str, Any]
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise ImportError(
+            "Package 'pyarrow' is required to write and read ML-AOI manifests. "
+            "Install it with 'pip install pystac-ml-aoi[manifest]'."
+        )
+
+
+def get_ml_aoi_manifest_schema() -> "pyarrow.Schema":
+    """
+    Obtains the :mod:`pyarrow` schema of ML-AOI manifest records, as produced by :func:`get_ml_aoi_manifest_record`.
+    """
+    _require_pyarrow()
+    feature = pyarrow.struct([
+        ("key", pyarrow.string()),
+        ("href", pyarrow.string()),
+        ("role", pyarrow.list_(pyarrow.string())),
+        ("reference_grid", pyarrow.bool_()),
+        ("resampling_method", pyarrow.string()),
+    ])
+    return pyarrow.schema([
+        ("item_id", pyarrow.string()),
+        ("item_href", pyarrow.string()),
+        ("split", pyarrow.string()),
+        ("bbox_minx", pyarrow.float64()),
+        ("bbox_miny", pyarrow.float64()),
+        ("bbox_maxx", pyarrow.float64()),
+        ("bbox_maxy", pyarrow.float64()),
+        ("label_href", pyarrow.string()),
+        ("features", pyarrow.list_(feature)),
+    ])
+
+
+def _get_partitioning() -> "pyarrow.dataset.Partitioning":
+    return pyarrow.dataset.partitioning(pyarrow.schema([("split", pyarrow.string())]), flavor="hive")
+
+
+def _get_value(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _get_roles(role: Any) -> Optional[List[str]]:
+    if role is None:
+        return None
+    return [_get_value(_role) for _role in ([role] if isinstance(role, str) else role)]
+
+
+def get_ml_aoi_manifest_record(item: pystac.Item) -> ManifestRecord:
+    """
+    Obtains the flat manifest record of an ML-AOI Item.
+
+    The first Asset with the ``label`` ML-AOI role provides the label location. Every other Asset defining any
+    ML-AOI field is listed as a feature, along with its ML-AOI roles, reference grid and resampling method.
+    A single ML-AOI role is listed as a list of one role, such that Assets defining multiple roles are also supported.
+    Asset locations are made absolute relative to the Item when possible.
+    """
+    split = item.properties.get(ML_AOI_SPLIT_FIELD)
+    bbox = get_bbox_2d(item.bbox) if item.bbox else [None] * 4
+    label_href = None
+    features = []
+    for key, asset in item.assets.items():
+        fields = asset.extra_fields
+        roles = _get_roles(fields.get(ML_AOI_ROLE_FIELD))
+        href = asset.get_absolute_href() or asset.href
+        if roles is not None and ML_AOI_Role.LABEL in roles and label_href is None:
+            label_href = href
+        elif roles is not None or ML_AOI_REFERENCE_GRID_FIELD in fields or ML_AOI_RESAMPLING_FIELD in fields:
+            features.append({
+                "key": key,
+                "href": href,
+                "role": roles,
+                "reference_grid": fields.get(ML_AOI_REFERENCE_GRID_FIELD),
+                "resampling_method": _get_value(fields.get(ML_AOI_RESAMPLING_FIELD)),
+            })
+    return {
+        "item_id": item.id,
+        "item_href": item.get_self_href(),
+        "split": _get_value(split),
+        "bbox_minx": bbox[0],
+        "bbox_miny": bbox[1],
+        "bbox_maxx": bbox[2],
+        "bbox_maxy": bbox[3],
+        "label_href": label_href,
+        "features": features,
+    }
+
+
+def iter_ml_aoi_manifest_records(items: Iterable[pystac.Item]) -> Iterator[ManifestRecord]:
+    """
+    Iterate lazily over the manifest records of ML-AOI Items.
+    """
+    return map(get_ml_aoi_manifest_record, items)
+
+
+def write_ml_aoi_manifest(
+    items: Union[str, Iterable[pystac.Item]],
+    path: str,
+    file_format: ManifestFormat = "parquet",
+    batch_size: int = ML_AOI_MANIFEST_BATCH_SIZE,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> None:
+    """
+    Writes the manifest records of ML-AOI Items into a dataset partitioned by ML-AOI split.
+
+    Items are streamed by batches of records, such that catalogs of any size can be exported with bounded memory.
+    Records are written under ``split=<value>`` sub-directories of the dataset, with Items without any split under
+    the default ``__HIVE_DEFAULT_PARTITION__`` directory. Any existing files of the written partitions are replaced.
+
+    Args:
+        items: ML-AOI Items, or the location of a STAC catalog from which all Items are streamed.
+        path: Directory of the dataset.
+        file_format:
+            Format of the dataset files. The ``parquet`` format is compressed with row group statistics for predicate
+            pushdown. The ``arrow`` format is an uncompressed Arrow IPC file that can be memory-mapped without copies.
+        batch_size: Number of records written at once, which also defines the maximum row group size.
+        stac_io: I/O implementation to read STAC documents when streaming Items from a catalog.
+    """
+    _require_pyarrow()
+    if isinstance(items, str):
+        items = iter_items_by_split(items, split=None, stac_io=stac_io)
+    schema = get_ml_aoi_manifest_schema()
+    records = iter_ml_aoi_manifest_records(items)
+
+    def iter_batches() -> Iterator["pyarrow.RecordBatch"]:
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+            yield pyarrow.RecordBatch.from_pylist(batch, schema=schema)
+
+    if file_format == "arrow":
+        file_options = pyarrow.dataset.IpcFileFormat().make_write_options(compression=None)
+    else:
+        file_options = pyarrow.dataset.ParquetFileFormat().make_write_options()
+    pyarrow.dataset.write_dataset(
+        iter_batches(),
+        path,
+        schema=schema,
+        format=file_format,
+        file_options=file_options,
+        partitioning=_get_partitioning(),
+        existing_data_behavior="delete_matching",
+        max_rows_per_group=batch_size,
+    )
+
+
+def open_ml_aoi_manifest(
+    path: str,
+    file_format: ManifestFormat = "parquet",
+    memory_map: bool = True,
+) -> "pyarrow.dataset.Dataset":
+    """
+    Opens a manifest dataset written by :func:`write_ml_aoi_manifest` without loading its records.
+
+    Args:
+        path: Directory of the dataset.
+        file_format: Format of the dataset files.
+        memory_map:
+            Whether to memory-map the dataset files. With the uncompressed ``arrow`` format, loaded columns then
+            directly reference the mapped files without any copy.
+    """
+    _require_pyarrow()
+    return pyarrow.dataset.dataset(
+        os.path.abspath(path),
+        schema=get_ml_aoi_manifest_schema(),
+        format=file_format,
+        partitioning=_get_partitioning(),
+        filesystem=pyarrow.fs.LocalFileSystem(use_mmap=memory_map),
+    )
+
+
+def make_ml_aoi_manifest_filter(
+    split: Optional[Union[ML_AOI_SplitType, Iterable[ML_AOI_SplitType]]] = None,
+    bbox: Optional[Sequence[float]] = None,
+) -> Optional["pyarrow.dataset.Expression"]:
+    """
+    Obtains the filter expression of manifest records matching ML-AOI splits or intersecting a bounding box.
+
+    Filters on splits prune the partitions of other splits without opening their files. Filters on the bounding box
+    skip row groups of ``parquet`` files for which column statistics do not intersect it.
+    """
+    _require_pyarrow()
+    field = pyarrow.dataset.field
+    expressions = []
+    if split is not None:
+        splits = [split] if isinstance(split, str) else split
+        expressions.append(field("split").isin([ML_AOI_Split(_split).value for _split in splits]))
+    if bbox is not None:
+        minx, miny, maxx, maxy = get_bbox_2d(bbox)
+        expressions.append(
+            (field("bbox_maxx") >= minx) & (field("bbox_minx") <= maxx) &
+            (field("bbox_maxy") >= miny) & (field("bbox_miny") <= maxy)
+        )
+    if not expressions:
+        return None
+    return expressions[0] if len(expressions) == 1 else expressions[0] & expressions[1]
+
+
+def read_ml_aoi_manifest(
+    path: str,
+    split: Optional[Union[ML_AOI_SplitType, Iterable[ML_AOI_SplitType]]] = None,
+    bbox: Optional[Sequence[float]] = None,
+    columns: Optional[List[str]] = None,
+    filter: Optional["pyarrow.dataset.Expression"] = None,  # pylint: disable=redefined-builtin
+    file_format: ManifestFormat = "parquet",
+    memory_map: bool = True,
+) -> "pyarrow.Table":
+    """
+    Loads the records of a manifest dataset written by :func:`write_ml_aoi_manifest`.
+
+    Filters are pushed down to the dataset scan, such that only matching partitions, row groups and columns are read.
+
+    Args:
+        path: Directory of the dataset.
+        split: ML-AOI split, or splits, of records to load.
+        bbox: Bounding box which the bounding box of loaded records must intersect.
+        columns: Columns to load. All columns are loaded if omitted.
+        filter: Additional filter expression of records to load.
+        file_format: Format of the dataset files.
+        memory_map: Whether to memory-map the dataset files.
+    Returns:
+        Table of matched records.
+    """
+    dataset = open_ml_aoi_manifest(path, file_format=file_format, memory_map=memory_map)
+    expression = make_ml_aoi_manifest_filter(split, bbox)
+    if filter is not None:
+        expression = filter if expression is None else expression & filter
+    return dataset.to_table(columns=columns, filter=expression)
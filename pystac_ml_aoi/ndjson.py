@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to stream ML-AOI Items as newline-delimited JSON (NDJSON), with one STAC Item per line.
+
+When the :mod:`orjson` package is installed, such as with the ``ndjson`` extra, it is employed to serialize and
+parse lines faster.
+"""
+import json
+import os
+import re
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Type, Union
+
+import pystac
+
+from pystac_ml_aoi.catalog import resolve_ml_aoi_splits
+from pystac_ml_aoi.extensions.ml_aoi import (
+    ML_AOI_AssetFields,
+    ML_AOI_BaseFields,
+    ML_AOI_ItemProperties,
+    ML_AOI_LinkFields,
+    ML_AOI_SplitType,
+    add_ml_aoi_prefix,
+    get_ml_aoi_field_aliases
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover  # optional dependency
+    orjson = None
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+ML_AOI_NDJSON_BUFFER_SIZE = 2 ** 20
+
+NDJSONSource = Union[str, os.PathLike, IO[bytes]]
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)  # pylint: disable=no-member
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(line: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(line)  # pylint: disable=no-member
+    return json.loads(line)
+
+
+def _normalize_ml_aoi_fields(data: Dict[str, Any], model: Type[ML_AOI_BaseFields]) -> Dict[str, Any]:
+    """
+    Obtains a copy of a JSON object with the ML-AOI fields defined by the model replaced by their validated values.
+
+    Fields that are ``null`` are removed. Other ``ml-aoi:`` prefixed fields are preserved as is.
+
+    Raises:
+        pydantic.ValidationError: If any of the fields is invalid.
+    """
+    aliases = get_ml_aoi_field_aliases(model)
+    fields = {name: data[alias] for name, alias in aliases.items() if alias in data}
+    if not fields:
+        return data
+    normalized = {key: value for key, value in data.items() if key not in aliases.values()}
+    values = model.model_validate(fields).model_dump(mode="json", by_alias=False, exclude_none=True)
+    normalized.update((aliases[name], value) for name, value in values.items())
+    return normalized
+
+
+def get_ml_aoi_ndjson_dict(item: pystac.Item, include_self_link: bool = True) -> Dict[str, Any]:
+    """
+    Obtains the JSON document of an ML-AOI Item written on a single NDJSON line.
+
+    The ``ml-aoi:`` prefixed properties of the Item, and fields of its Assets and Links, are normalized through the
+    ML-AOI extension models, such that enum values are written as plain strings and values are coerced to the types
+    defined by the ML-AOI JSON schema. Links are written with their current location, without being made relative.
+
+    Raises:
+        pydantic.ValidationError: If any of the ML-AOI fields is invalid.
+    """
+    data = item.to_dict(include_self_link=include_self_link, transform_hrefs=False)
+    data["properties"] = _normalize_ml_aoi_fields(data["properties"], ML_AOI_ItemProperties)
+    if "assets" in data:
+        data["assets"] = {
+            key: _normalize_ml_aoi_fields(asset, ML_AOI_AssetFields) for key, asset in data["assets"].items()
+        }
+    data["links"] = [_normalize_ml_aoi_fields(link, ML_AOI_LinkFields) for link in data["links"]]
+    return data
+
+
+def write_ml_aoi_ndjson(
+    items: Iterable[pystac.Item],
+    destination: NDJSONSource,
+    include_self_link: bool = True,
+) -> int:
+    """
+    Writes ML-AOI Items lazily as NDJSON, with one Item per line, as obtained by :func:`get_ml_aoi_ndjson_dict`.
+
+    Args:
+        items: ML-AOI Items to write, which are consumed one at a time.
+        destination: Path of the NDJSON file to create, or binary stream in which lines are written.
+        include_self_link: Whether to write the ``self`` link of Items, such that their location is preserved.
+    Returns:
+        Number of written Items.
+    """
+    if not hasattr(destination, "write"):
+        with open(destination, mode="wb", buffering=ML_AOI_NDJSON_BUFFER_SIZE) as file:
+            return write_ml_aoi_ndjson(items, file, include_self_link=include_self_link)
+    count = 0
+    for item in items:
+        destination.write(_dumps(get_ml_aoi_ndjson_dict(item, include_self_link=include_self_link)) + b"\n")
+        count += 1
+    return count
+
+
+def _get_split_pattern(splits: Iterable[str]) -> "re.Pattern[bytes]":
+    field = re.escape(ML_AOI_SPLIT_FIELD.encode("utf-8"))
+    values = b"|".join(re.escape(split.encode("utf-8")) for split in sorted(splits))
+    return re.compile(b"\"" + field + b"\"\\s*:\\s*\"(?:" + values + b")\"")
+
+
+def iter_ml_aoi_ndjson(
+    source: NDJSONSource,
+    split: Optional[Union[ML_AOI_SplitType, Iterable[ML_AOI_SplitType]]] = None,
+) -> Iterator[pystac.Item]:
+    """
+    Iterates lazily over the ML-AOI Items of an NDJSON file, with one Item per line.
+
+    When a split is requested, each raw line is first matched against the ``ml-aoi:split`` values, such that lines
+    of other splits are skipped without being parsed. Since the raw match could also apply to other fields, such as
+    the ``ml-aoi:split`` of links, the split of the Item properties is confirmed once the line is parsed.
+
+    Args:
+        source: Path of the NDJSON file, or binary stream from which lines are read.
+        split: ML-AOI split, or splits, of Items to retrieve. If ``None``, all Items are returned.
+    Yields:
+        Matched STAC Items.
+    """
+    if not hasattr(source, "read"):
+        with open(source, mode="rb", buffering=ML_AOI_NDJSON_BUFFER_SIZE) as file:
+            yield from iter_ml_aoi_ndjson(file, split=split)
+        return
+    splits = resolve_ml_aoi_splits(split)
+    pattern = _get_split_pattern(splits) if splits is not None else None
+    for line in source:
+        if not line.strip():
+            continue
+        if pattern is not None and not pattern.search(line):
+            continue
+        data = _loads(line)
+        if splits is not None and data.get("properties", {}).get(ML_AOI_SPLIT_FIELD) not in splits:
+            continue
+        yield pystac.Item.from_dict(data, preserve_dict=False)
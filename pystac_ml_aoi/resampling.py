@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resampling of raster arrays to the reference grid of ML-AOI Items, implementing every :class:`ML_AOI_Resampling`.
+
+Methods follow the definitions of the corresponding ``gdalwarp`` resampling algorithms without requiring GDAL.
+"""
+import math
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling, ML_AOI_ResamplingType
+
+ML_AOI_RESAMPLING_MAX_MEMORY = 64 * 2 ** 20  # bytes of intermediate arrays per chunk
+
+_ML_AOI_RESAMPLING_TOLERANCE = 1e-9  # coverage of source pixels ignored as floating point errors
+
+Kernel = Callable[[np.ndarray], np.ndarray]
+Taps = Tuple[np.ndarray, np.ndarray, np.ndarray]  # source indices, their weights, and weights of the central lobe
+
+
+def _kernel_bilinear(x: np.ndarray) -> np.ndarray:
+    return np.clip(1.0 - np.abs(x), 0.0, None)
+
+
+def _kernel_cubic(x: np.ndarray, a: float = -0.5) -> np.ndarray:
+    # Keys cubic convolution, interpolating the source values
+    x = np.abs(x)
+    near = ((a + 2) * x - (a + 3)) * x * x + 1
+    far = ((a * x - 5 * a) * x + 8 * a) * x - 4 * a
+    return np.where(x < 1, near, np.where(x < 2, far, 0.0))
+
+
+def _kernel_cubicspline(x: np.ndarray) -> np.ndarray:
+    # cubic B-spline, smoothing the source values
+    x = np.abs(x)
+    near = (4 - 6 * x * x + 3 * x * x * x) / 6
+    far = (2 - x) ** 3 / 6
+    return np.where(x < 1, near, np.where(x < 2, far, 0.0))
+
+
+def _kernel_lanczos(x: np.ndarray, radius: int = 3) -> np.ndarray:
+    return np.where(np.abs(x) < radius, np.sinc(x) * np.sinc(x / radius), 0.0)
+
+
+ML_AOI_RESAMPLING_KERNELS: Dict[ML_AOI_Resampling, Tuple[int, Kernel]] = {
+    ML_AOI_Resampling.BILINEAR: (1, _kernel_bilinear),
+    ML_AOI_Resampling.CUBIC: (2, _kernel_cubic),
+    ML_AOI_Resampling.CUBCSPLINE: (2, _kernel_cubicspline),
+    ML_AOI_Resampling.LANCZOS: (3, _kernel_lanczos),
+}
+"""
+Radius, in source pixels, and weight function of interpolation kernels.
+"""
+
+ML_AOI_RESAMPLING_QUANTILES: Dict[ML_AOI_Resampling, float] = {
+    ML_AOI_Resampling.Q1: 0.25,
+    ML_AOI_Resampling.MED: 0.5,
+    ML_AOI_Resampling.Q3: 0.75,
+}
+
+
+def _get_kernel_taps(
+    size: int,
+    offset: float,
+    length: float,
+    out_size: int,
+    method: ML_AOI_Resampling,
+) -> Taps:
+    """
+    Obtains the source pixel indices and weights contributing to every output pixel along one axis.
+
+    Output pixel centers are mapped to source coordinates. When downsampling, kernels are widened by the scale factor
+    such that all covered source pixels contribute to the output, similarly to ``gdalwarp``.
+    """
+    scale = length / out_size
+    centers = offset + (np.arange(out_size) + 0.5) * scale
+    if method == ML_AOI_Resampling.NEAR:
+        indices = np.floor(centers).astype(np.int64)[:, None]
+        weights = lobe = np.ones(indices.shape, dtype=float)
+    else:
+        radius, kernel = ML_AOI_RESAMPLING_KERNELS[method]
+        stretch = max(scale, 1.0)
+        support = radius * stretch
+        first = np.floor(centers - 0.5 - support).astype(np.int64) + 1
+        indices = first[:, None] + np.arange(int(math.ceil(2 * support)) + 1)
+        distances = (indices + 0.5 - centers[:, None]) / stretch
+        weights = kernel(distances)
+        lobe = np.where(np.abs(distances) < 1.0, weights, 0.0)
+    return _clip_taps(size, indices, weights, lobe)
+
+
+def _get_coverage_taps(size: int, offset: float, length: float, out_size: int) -> Taps:
+    """
+    Obtains the source pixel indices and the fraction of their extent covered by every output pixel along one axis.
+    """
+    scale = length / out_size
+    start = offset + np.arange(out_size) * scale
+    stop = start + scale
+    first = np.floor(start + _ML_AOI_RESAMPLING_TOLERANCE).astype(np.int64)
+    indices = first[:, None] + np.arange(int(math.ceil(scale)) + 1)
+    weights = np.minimum(stop[:, None], indices + 1) - np.maximum(start[:, None], indices)
+    weights[weights < _ML_AOI_RESAMPLING_TOLERANCE] = 0.0
+    return _clip_taps(size, indices, weights, weights)
+
+
+def _clip_taps(size: int, indices: np.ndarray, weights: np.ndarray, lobe: np.ndarray) -> Taps:
+    """
+    Discards contributions of indices outside the source extent, such that the remaining weights are renormalized.
+    """
+    inside = (indices >= 0) & (indices < size)
+    return np.clip(indices, 0, size - 1), np.where(inside, weights, 0.0), np.where(inside, lobe, 0.0)
+
+
+def _resample_near(
+    values: np.ndarray,
+    valid: np.ndarray,
+    taps_y: Taps,
+    taps_x: Taps,
+) -> Tuple[np.ndarray, np.ndarray]:
+    (idx_y, w_y, _), (idx_x, w_x, _) = taps_y, taps_x
+    rows = idx_y[:, 0][:, None]
+    cols = idx_x[:, 0][None, :]
+    inside = (w_y[:, 0][:, None] > 0) & (w_x[:, 0][None, :] > 0)
+    return values[:, rows, cols].astype(float), valid[:, rows, cols] & inside
+
+
+def _resample_kernel(
+    values: np.ndarray,
+    valid: np.ndarray,
+    taps_y: Taps,
+    taps_x: Taps,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies a separable interpolation kernel, normalized by the weights of valid source pixels.
+
+    Output pixels are valid only when valid source pixels lie within the central lobe of the kernel, such that
+    values are never extrapolated from the outer lobes alone.
+    """
+    (idx_y, w_y, lobe_y), (idx_x, w_x, lobe_x) = taps_y, taps_x
+    row0, row1 = int(idx_y.min()), int(idx_y.max()) + 1
+    block_valid = valid[:, row0:row1]
+    block = np.where(block_valid, values[:, row0:row1], 0).astype(float)
+    block_valid = block_valid[:, :, idx_x].astype(float)
+    num = np.einsum("brck,ck->brc", block[:, :, idx_x], w_x)
+    den = np.einsum("brck,ck->brc", block_valid, w_x)
+    lobe = np.einsum("brck,ck->brc", block_valid, lobe_x)
+    num = np.einsum("bokc,ok->boc", num[:, idx_y - row0], w_y)
+    den = np.einsum("bokc,ok->boc", den[:, idx_y - row0], w_y)
+    lobe = np.einsum("bokc,ok->boc", lobe[:, idx_y - row0], lobe_y)
+    ok = (den > 1e-6) & (lobe > 1e-6)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ok, num / den, 0.0), ok
+
+
+def _resample_aggregate(
+    values: np.ndarray,
+    valid: np.ndarray,
+    taps_y: Taps,
+    taps_x: Taps,
+    method: ML_AOI_Resampling,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregates the source pixels covered by every output pixel.
+
+    The ``average``, ``rms`` and ``sum`` methods weight source pixels by their covered fraction.
+    Other methods consider every covered source pixel equally.
+    """
+    (idx_y, w_y, _), (idx_x, w_x, _) = taps_y, taps_x
+    bands = values.shape[0]
+    out_rows, taps_rows = idx_y.shape
+    out_cols, taps_cols = idx_x.shape
+    shape = (bands, out_rows, out_cols, taps_rows * taps_cols)
+    rows = idx_y[:, :, None, None]
+    cols = idx_x[None, None, :, :]
+    vals = values[:, rows, cols].astype(float).transpose(0, 1, 3, 2, 4).reshape(shape)
+    weights = (w_y[:, :, None, None] * w_x[None, None, :, :]).transpose(0, 2, 1, 3).reshape(shape[1:])
+    ok = valid[:, rows, cols].transpose(0, 1, 3, 2, 4).reshape(shape) & (weights > 0)
+    found = ok.any(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method in (ML_AOI_Resampling.AVERAGE, ML_AOI_Resampling.RMS, ML_AOI_Resampling.SUM):
+            weights = np.where(ok, weights, 0.0)
+            if method == ML_AOI_Resampling.RMS:
+                result = np.sqrt((weights * vals * vals).sum(axis=-1) / weights.sum(axis=-1))
+            elif method == ML_AOI_Resampling.AVERAGE:
+                result = (weights * np.where(ok, vals, 0.0)).sum(axis=-1) / weights.sum(axis=-1)
+            else:
+                result = (weights * np.where(ok, vals, 0.0)).sum(axis=-1)
+        elif method == ML_AOI_Resampling.MIN:
+            result = np.where(ok, vals, np.inf).min(axis=-1)
+        elif method == ML_AOI_Resampling.MAX:
+            result = np.where(ok, vals, -np.inf).max(axis=-1)
+        elif method == ML_AOI_Resampling.MODE:
+            vals = np.where(ok, vals, np.nan)  # never equal to any value
+            counts = (vals[..., :, None] == vals[..., None, :]).sum(axis=-1)
+            best = counts == counts.max(axis=-1, keepdims=True)
+            result = np.where(best & ok, vals, np.inf).min(axis=-1)  # smallest of most frequent values
+        else:
+            vals = np.sort(np.where(ok, vals, np.nan), axis=-1)  # invalid values sorted last
+            rank = np.floor(ML_AOI_RESAMPLING_QUANTILES[method] * (ok.sum(axis=-1) - 1)).astype(np.int64)
+            result = np.take_along_axis(vals, np.maximum(rank, 0)[..., None], axis=-1)[..., 0]
+    return np.where(found, result, 0.0), found
+
+
+def _cast(result: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return np.clip(np.rint(result), info.min, info.max).astype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        return result.astype(dtype)
+    return result
+
+
+def resample_ml_aoi_array(
+    data: Union[np.ndarray, np.ma.MaskedArray],
+    shape: Tuple[int, int],
+    method: ML_AOI_ResamplingType = ML_AOI_Resampling.NEAR,
+    window: Optional[Sequence[float]] = None,
+    nodata: Optional[float] = None,
+    max_memory: int = ML_AOI_RESAMPLING_MAX_MEMORY,
+) -> Union[np.ndarray, np.ma.MaskedArray]:
+    """
+    Resamples a raster array to the requested shape using an ML-AOI resampling method.
+
+    The region of the source array given by the window is mapped onto the output grid, such that any integer or
+    fractional scale factor and offset, as computed by :func:`pystac_ml_aoi.grid.plan_ml_aoi_alignment`, can be
+    applied. Interpolation methods (``bilinear``, ``cubic``, ``cubcspline`` and ``lanczos``) weight source pixels
+    around the mapped center of output pixels, with kernels widened by the scale factor when downsampling. Other
+    methods aggregate the source pixels covered by output pixels. The ``average``, ``rms`` and ``sum`` methods weight
+    them by their covered fraction, whereas ``min``, ``max`` and ``mode`` consider every covered pixel equally. The
+    ``mode`` returns the smallest of the most frequent values, and the ``med``, ``q1`` and ``q3`` quantiles return
+    the value of rank ``floor(q * (n - 1))`` among the ``n`` covered pixels, without interpolation.
+
+    Invalid source pixels, either masked or equal to ``nodata``, never contribute to outputs. Output pixels without
+    any valid contribution, including those outside the source extent, are set to ``nodata`` (or ``0`` if omitted).
+    Output rows are processed in chunks such that intermediate arrays remain within the memory limit.
+
+    Args:
+        data: Source array of shape ``(..., rows, cols)``. Leading dimensions, such as bands, are resampled alike.
+        shape: Output ``(rows, cols)``.
+        method: Resampling method.
+        window: Source ``(col_off, row_off, width, height)``, in source pixels, mapped onto the output grid.
+            Defaults to the whole source array.
+        nodata: Value of invalid source pixels, also assigned to invalid output pixels.
+        max_memory: Approximate limit, in bytes, of intermediate arrays.
+    Returns:
+        Resampled array of the same data type as the source. Masked sources produce masked arrays whose mask
+        indicates output pixels without any valid contribution.
+    """
+    method = ML_AOI_Resampling(method)
+    out_rows, out_cols = shape
+    masked = isinstance(data, np.ma.MaskedArray)
+    values = np.ma.getdata(data)
+    valid = ~np.ma.getmaskarray(data)
+    if nodata is not None:
+        valid &= ~(np.isnan(values) if np.isnan(nodata) else values == nodata)
+    lead, (rows, cols) = values.shape[:-2], values.shape[-2:]
+    values = values.reshape((-1, rows, cols))
+    valid = valid.reshape((-1, rows, cols))
+    col_off, row_off, width, height = window if window is not None else (0, 0, cols, rows)
+
+    if method in ML_AOI_RESAMPLING_KERNELS or method == ML_AOI_Resampling.NEAR:
+        taps_y = _get_kernel_taps(rows, row_off, height, out_rows, method)
+        taps_x = _get_kernel_taps(cols, col_off, width, out_cols, method)
+    else:
+        taps_y = _get_coverage_taps(rows, row_off, height, out_rows)
+        taps_x = _get_coverage_taps(cols, col_off, width, out_cols)
+    taps = taps_y[0].shape[1] * taps_x[0].shape[1]
+    if method == ML_AOI_Resampling.MODE:
+        taps *= taps  # pairwise comparisons
+    row_bytes = 8 * 4 * values.shape[0] * out_cols * taps
+    chunk_rows = max(1, min(out_rows, max_memory // max(row_bytes, 1)))
+
+    result = np.empty((values.shape[0], out_rows, out_cols), dtype=float)
+    found = np.empty(result.shape, dtype=bool)
+    for start in range(0, out_rows, chunk_rows):
+        stop = min(start + chunk_rows, out_rows)
+        chunk_y = tuple(taps[start:stop] for taps in taps_y)
+        if method == ML_AOI_Resampling.NEAR:
+            chunk = _resample_near(values, valid, chunk_y, taps_x)
+        elif method in ML_AOI_RESAMPLING_KERNELS:
+            chunk = _resample_kernel(values, valid, chunk_y, taps_x)
+        else:
+            chunk = _resample_aggregate(values, valid, chunk_y, taps_x, method)
+        result[:, start:stop], found[:, start:stop] = chunk
+
+    output = _cast(result, values.dtype)
+    output[~found] = 0 if nodata is None else nodata
+    output = output.reshape(lead + (out_rows, out_cols))
+    if masked:
+        return np.ma.MaskedArray(output, mask=~found.reshape(output.shape))
+    return output
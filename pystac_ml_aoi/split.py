@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to assign and verify ML-AOI splits of STAC Items.
+"""
+import itertools
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pystac
+import shapely
+
+from pystac_ml_aoi.catalog import get_bbox_2d
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Split, ML_AOI_SplitType, add_ml_aoi_prefix
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+ML_AOI_SPLIT_RATIOS: Mapping[ML_AOI_SplitType, float] = {
+    ML_AOI_Split.TRAIN: 0.7,
+    ML_AOI_Split.VALIDATE: 0.15,
+    ML_AOI_Split.TEST: 0.15,
+}
+
+
+class ML_AOI_SplitOverlap(NamedTuple):
+    """
+    Overlap of STAC Item footprints between two distinct ML-AOI splits.
+    """
+    split: str
+    item_id: str
+    other_split: str
+    other_item_id: str
+    area: float
+    """
+    Area of the footprints intersection, in the units of the Item geometries.
+    """
+    ratio: float
+    """
+    Area of the footprints intersection relative to the smallest footprint of both Items.
+    """
+
+
+def _get_split_footprints(items: Iterable[pystac.Item]) -> Dict[str, Tuple[List[str], np.ndarray]]:
+    """
+    Group the Item IDs and their footprints by ML-AOI split.
+
+    Items without any ML-AOI split are ignored. Items without geometry use their bounding box.
+
+    Raises:
+        ValueError: If the ML-AOI split of an Item is not a known split.
+    """
+    # lookup of both enum members and values, which do not share the same hash
+    splits = {**{split: split.value for split in ML_AOI_Split}, **{split.value: split.value for split in ML_AOI_Split}}
+    ids: Dict[str, List[str]] = {}
+    geoms: Dict[str, List[shapely.Geometry]] = {}
+    bboxes: Dict[str, List[Tuple[int, List[float]]]] = {}
+    for item in items:
+        split = item.properties.get(ML_AOI_SPLIT_FIELD)
+        if split is None:
+            continue
+        if split not in splits:
+            raise ValueError(f"Invalid ML-AOI split '{split}' of Item '{item.id}'.")
+        split = splits[split]
+        if item.geometry is not None:
+            geom = shapely.geometry.shape(item.geometry)
+        elif item.bbox is not None:
+            geom = None
+            bboxes.setdefault(split, []).append((len(geoms.get(split, [])), get_bbox_2d(item.bbox)))
+        else:
+            continue
+        ids.setdefault(split, []).append(item.id)
+        geoms.setdefault(split, []).append(geom)
+    footprints = {}
+    for split, split_ids in ids.items():
+        split_geoms = np.asarray(geoms[split], dtype=object)
+        if split in bboxes:
+            index, bbox = zip(*bboxes[split])
+            split_geoms[list(index)] = shapely.box(*np.asarray(bbox, dtype=float).T)
+        footprints[split] = (split_ids, split_geoms)
+    return footprints
+
+
+def find_split_overlaps(
+    items: Iterable[pystac.Item],
+    threshold: float = 0.0,
+    relative: bool = True,
+) -> List[ML_AOI_SplitOverlap]:
+    """
+    Find STAC Items of distinct ML-AOI splits with overlapping footprints.
+
+    The ML-AOI splits must not overlap to avoid leaking training samples into validation or test evaluations.
+    Footprints of each split are bulk-loaded into a :class:`shapely.STRtree`, against which the footprints of every
+    other split are queried at once. Only candidate pairs from the tree are then measured with vectorized operations.
+
+    Args:
+        items: STAC Items to verify. Items without an ML-AOI split are ignored.
+        threshold:
+            Overlap above which a pair of Items is reported. Footprints that only touch each other are never reported.
+        relative:
+            Whether the threshold is a ratio of the smallest footprint area of both Items, or an absolute area
+            in the units of the Item geometries.
+    Returns:
+        Overlapping Items of distinct splits.
+    Raises:
+        ValueError: If the ML-AOI split of an Item is not a known split.
+    """
+    footprints = _get_split_footprints(items)
+    overlaps = []
+    for split, other_split in itertools.combinations(sorted(footprints), 2):
+        ids, geoms = footprints[split]
+        other_ids, other_geoms = footprints[other_split]
+        tree = shapely.STRtree(other_geoms)
+        index, other_index = tree.query(geoms, predicate="intersects")
+        if not len(index):
+            continue
+        geoms_a = geoms[index]
+        geoms_b = other_geoms[other_index]
+        area = shapely.area(shapely.intersection(geoms_a, geoms_b))
+        min_area = np.minimum(shapely.area(geoms_a), shapely.area(geoms_b))
+        ratio = np.divide(area, min_area, out=np.zeros_like(area), where=min_area > 0)
+        found = (area > 0) & ((ratio if relative else area) > threshold)
+        for idx_a, idx_b, _area, _ratio in zip(index[found], other_index[found], area[found], ratio[found]):
+            overlaps.append(ML_AOI_SplitOverlap(
+                split=split,
+                item_id=ids[idx_a],
+                other_split=other_split,
+                other_item_id=other_ids[idx_b],
+                area=float(_area),
+                ratio=float(_ratio),
+            ))
+    return overlaps
+
+
+def _get_centroids(items: Sequence[pystac.Item]) -> np.ndarray:
+    """
+    Obtain the centroids of Item bounding boxes, or of their geometry if no bounding box is defined.
+    """
+    bboxes = np.full((len(items), 4), np.nan, dtype=float)
+    for index, item in enumerate(items):
+        if item.bbox is not None:
+            bboxes[index] = get_bbox_2d(item.bbox)
+        elif item.geometry is not None:
+            bboxes[index] = shapely.geometry.shape(item.geometry).bounds
+        else:
+            raise ValueError(f"Cannot assign a spatial split to Item '{item.id}' without geometry nor bbox.")
+    return np.column_stack([bboxes[:, 0] + bboxes[:, 2], bboxes[:, 1] + bboxes[:, 3]]) / 2
+
+
+def _hash_blocks(blocks: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Stable hash of integer block coordinates to uniform values in ``[0, 1)``, using the SplitMix64 finalizer.
+
+    The seed is reduced modulo ``2 ** 64``, such that negative and larger seeds can be represented as unsigned integers.
+    """
+    with np.errstate(over="ignore"):
+        hashed = np.full(blocks.shape[0], seed & 0xFFFFFFFFFFFFFFFF, dtype=np.uint64)
+        for axis in range(blocks.shape[1]):
+            hashed ^= blocks[:, axis].astype(np.int64).view(np.uint64)
+            hashed += np.uint64(0x9E3779B97F4A7C15)
+            hashed = (hashed ^ (hashed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            hashed = (hashed ^ (hashed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            hashed ^= hashed >> np.uint64(31)
+    return (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def assign_spatial_splits(
+    items: Sequence[pystac.Item],
+    ratios: Optional[Mapping[ML_AOI_SplitType, float]] = None,
+    block_size: Union[float, Tuple[float, float]] = 1.0,
+    seed: int = 0,
+    apply: bool = True,
+    add_if_missing: bool = True,
+) -> List[ML_AOI_Split]:
+    """
+    Assign ML-AOI splits to STAC Items by spatial blocks.
+
+    Item centroids are binned into a regular grid of blocks. Each block is then entirely assigned to a split by a
+    stable hash of its grid coordinates, such that the distribution of blocks follows the target ratios. Because
+    neighbouring Items share the same split, spatial autocorrelation does not leak between splits. Because the hash
+    only depends on the block coordinates and the seed, re-runs and Items appended later remain consistent with
+    previous assignments.
+
+    Args:
+        items: STAC Items to assign.
+        ratios: Target ratio of blocks for each split. Ratios are normalized by their sum.
+        block_size:
+            Size of grid blocks in the units of the Item geometries, as a single value or as ``(x, y)`` sizes.
+            For example, sizes ``(0.3515625, 0.17578125)`` in degrees reproduce the cells of a 5-characters geohash.
+        seed: Seed of the hash to obtain another stable assignment. Any integer is reduced modulo ``2 ** 64``.
+        apply: Whether to apply the assigned splits to the Items with :meth:`ML_AOI_Extension.apply_many`.
+        add_if_missing: Whether to add the ML-AOI schema URI to the Items if missing when applying the splits.
+    Returns:
+        Assigned split of each Item.
+    """
+    ratios = ML_AOI_SPLIT_RATIOS if ratios is None else ratios
+    splits = [ML_AOI_Split(split) for split in ratios]
+    weights = np.asarray([ratios[split] for split in ratios], dtype=float)
+    if not len(weights) or np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("Split ratios must be non-negative with a positive sum.")
+    bounds = np.cumsum(weights / weights.sum())
+    if not items:
+        return []
+
+    block_size = np.broadcast_to(np.asarray(block_size, dtype=float), (2,))
+    blocks = np.floor(_get_centroids(items) / block_size).astype(np.int64)
+    values = _hash_blocks(blocks, seed)
+    choices = np.minimum(np.searchsorted(bounds, values, side="right"), len(splits) - 1)
+    assigned = [splits[choice] for choice in choices.tolist()]
+    if apply:
+        fields = {split: {"split": split} for split in splits}
+        errors = ML_AOI_Extension.apply_many(
+            items,
+            [fields[split] for split in assigned],
+            add_if_missing=add_if_missing,
+        )
+        if errors:  # pragma: no cover  # splits are always valid
+            raise ValueError(f"Failed applying ML-AOI splits: {errors}")
+    return assigned
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+I/O implementations to read remote STAC catalogs using the ML-AOI extension.
+"""
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+from email.message import Message
+from typing import Any, Dict, List, Optional, Tuple
+
+from pystac.stac_io import DefaultStacIO
+from pystac.utils import safe_urlparse
+
+from pystac_ml_aoi import __version__
+
+ML_AOI_CACHE_DIR = os.getenv(
+    "ML_AOI_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pystac-ml-aoi"),
+)
+ML_AOI_CACHE_MAX_SIZE = 512 * 2 ** 20
+ML_AOI_CACHE_REDIRECTS = 5
+
+HTTPResponse = Tuple[int, Message, bytes]  # status, headers, body
+
+
+def _is_url(href: str) -> bool:
+    return urllib.parse.urlsplit(href).scheme in ("http", "https")
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes the file such that concurrent readers never observe partial contents.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ML_AOI_CachedStacIO(DefaultStacIO):
+    """
+    STAC I/O caching remote documents on disk, such as STAC Items and their label or raster Assets.
+
+    Fetched contents are stored once by their SHA-256 hash, and are referenced by the URL from which they were obtained
+    along with its ``ETag`` and ``Last-Modified`` response headers. When cached, subsequent reads of the same URL issue
+    a conditional request such that unchanged contents are not downloaded again. Identical contents obtained from
+    distinct URLs are stored only once. The least recently used contents are evicted when the total size of the cache
+    exceeds its limit.
+
+    HTTP connections are kept alive and reused for all requests to the same host within a thread.
+    Local files are read and written directly without caching.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size: int = ML_AOI_CACHE_MAX_SIZE,
+        offline: bool = False,
+        revalidate: bool = True,
+        timeout: Optional[float] = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Args:
+            cache_dir:
+                Directory of cached contents. Defaults to the ``ML_AOI_CACHE_DIR`` environment variable,
+                or to ``pystac-ml-aoi`` under the user cache directory.
+            max_size: Total size, in bytes, of cached contents above which the least recently used are evicted.
+            offline: Read only cached contents without any request. Missing URLs raise ``FileNotFoundError``.
+            revalidate:
+                Whether to verify that cached contents are still up-to-date with a conditional request.
+                Otherwise, cached contents are returned directly without any request.
+            timeout: Timeout, in seconds, of HTTP connections.
+            headers: Additional headers of HTTP requests.
+        """
+        super().__init__(headers=headers)
+        self.cache_dir = os.path.abspath(cache_dir or ML_AOI_CACHE_DIR)
+        self.max_size = max_size
+        self.offline = offline
+        self.revalidate = revalidate
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._size: Optional[int] = None
+
+    def __enter__(self) -> "ML_AOI_CachedStacIO":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes all pooled HTTP connections.
+        """
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def read_text_from_href(self, href: str) -> str:
+        if not _is_url(href):
+            return super().read_text_from_href(href)
+        return self.read_bytes(href).decode("utf-8")
+
+    def read_bytes(self, href: str) -> bytes:
+        """
+        Reads the contents of a local file, or of a remote document through the cache.
+        """
+        if not _is_url(href):
+            with open(safe_urlparse(href).path, mode="rb") as file:
+                return file.read()
+        with open(self.get_cached_path(href), mode="rb") as file:
+            return file.read()
+
+    def get_cached_path(self, href: str) -> str:
+        """
+        Obtains the local path of the cached contents of a remote document, fetching it if required.
+
+        This allows reading large Assets, such as rasters, directly from the cache with other libraries.
+
+        Raises:
+            FileNotFoundError: If the contents are not cached in offline mode.
+            urllib.error.HTTPError: If the document cannot be fetched.
+        """
+        entry = self._load_entry(href)
+        path = self._get_object_path(entry["digest"]) if entry else None
+        if path and not os.path.isfile(path):
+            entry = path = None  # evicted contents
+        if path and (self.offline or not self.revalidate):
+            self._touch(path)
+            return path
+        if self.offline:
+            raise FileNotFoundError(f"Document '{href}' is not cached and cannot be fetched in offline mode.")
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        status, resp_headers, body = self._request(href, headers)
+        if status == 304 and path:
+            self._touch(path)
+            return path
+        if status >= 400:
+            raise urllib.error.HTTPError(href, status, f"Could not read uri {href}", resp_headers, None)
+
+        digest = _hash(body)
+        path = self._get_object_path(digest)
+        if os.path.isfile(path):
+            self._touch(path)
+        else:
+            _write_atomic(path, body)
+            self._add_size(len(body))
+        entry = {
+            "href": href,
+            "digest": digest,
+            "etag": resp_headers.get("ETag"),
+            "last_modified": resp_headers.get("Last-Modified"),
+        }
+        _write_atomic(self._get_entry_path(href), json.dumps(entry).encode("utf-8"))
+        self._evict(keep=path)
+        return path
+
+    def is_cached(self, href: str) -> bool:
+        """
+        Indicates whether the contents of the remote document are available in the cache.
+        """
+        entry = self._load_entry(href)
+        return entry is not None and os.path.isfile(self._get_object_path(entry["digest"]))
+
+    def clear(self) -> None:
+        """
+        Removes all cached contents.
+        """
+        for sub_dir in ("urls", "objects"):
+            for path in self._list_files(os.path.join(self.cache_dir, sub_dir)):
+                os.remove(path)
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Total size, in bytes, of cached contents.
+        """
+        return sum(os.path.getsize(path) for path in self._list_files(os.path.join(self.cache_dir, "objects")))
+
+    def _get_entry_path(self, href: str) -> str:
+        return os.path.join(self.cache_dir, "urls", f"{_hash(href.encode('utf-8'))}.json")
+
+    def _get_object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def _load_entry(self, href: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._get_entry_path(href), mode="r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        """
+        Marks the cached contents as recently used for the eviction policy.
+        """
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover  # concurrently evicted
+            pass
+
+    @staticmethod
+    def _list_files(directory: str) -> List[str]:
+        paths = []
+        for root, _, files in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in files if not name.startswith(".tmp-"))
+        return paths
+
+    def _add_size(self, size: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = self.size
+            else:
+                self._size += size
+
+    def _evict(self, keep: str) -> None:
+        """
+        Removes the least recently used contents until the cache fits within its maximum size.
+
+        The total size is tracked incrementally, such that the cache is only listed when it exceeds its limit.
+        Contents written concurrently by other processes are accounted for when the cache is listed.
+        """
+        with self._lock:
+            if self._size is not None and self._size <= self.max_size:
+                return
+            objects = []
+            for path in self._list_files(os.path.join(self.cache_dir, "objects")):
+                try:
+                    stat = os.stat(path)
+                except OSError:  # pragma: no cover  # concurrently evicted
+                    continue
+                objects.append((stat.st_mtime, stat.st_size, path))
+            size = sum(obj_size for _, obj_size, _ in objects)
+            for _, obj_size, path in sorted(objects):
+                if size <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:  # pragma: no cover  # concurrently evicted
+                    continue
+                size -= obj_size
+            self._size = size
+
+    def _get_connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn_type = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = connections[(scheme, netloc)] = conn_type(netloc, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        conn = self._local.connections.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def _request(self, href: str, headers: Dict[str, str], redirects: int = ML_AOI_CACHE_REDIRECTS) -> HTTPResponse:
+        """
+        Sends a ``GET`` request over a pooled connection, following redirects.
+
+        A request failing on a connection closed by the server while idle is retried once on a new connection.
+        """
+        url = urllib.parse.urlsplit(href)
+        path = url.path or "/"
+        if url.query:
+            path = f"{path}?{url.query}"
+        headers = {"User-Agent": f"pystac-ml-aoi/{__version__}", **self.headers, **headers}
+        for attempt in range(2):
+            conn = self._get_connection(url.scheme, url.netloc)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                break
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+                self._drop_connection(url.scheme, url.netloc)
+                if attempt:
+                    raise
+        if resp.will_close:
+            self._drop_connection(url.scheme, url.netloc)
+        location = resp.headers.get("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location and redirects > 0:
+            return self._request(urllib.parse.urljoin(href, location), headers, redirects - 1)
+        return resp.status, resp.headers, body
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to compute summaries and statistics of ML-AOI Collections.
+"""
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import pystac
+import shapely
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Split, add_ml_aoi_prefix, ml_aoi_trusted
+
+ML_AOI_SPLIT_FIELD = add_ml_aoi_prefix("split")
+ML_AOI_ROLE_FIELD = add_ml_aoi_prefix("role")
+ML_AOI_RESAMPLING_FIELD = add_ml_aoi_prefix("resampling-method")
+
+
+@dataclasses.dataclass
+class ML_AOI_CollectionStatistics:
+    """
+    Statistics of the STAC Items of an ML-AOI Collection, grouped by ML-AOI split.
+
+    Items without any ML-AOI split are accumulated under the ``None`` split.
+    """
+    counts: Dict[Optional[str], int] = dataclasses.field(default_factory=dict)
+    """
+    Number of Items.
+    """
+    areas: Dict[Optional[str], float] = dataclasses.field(default_factory=dict)
+    """
+    Total area of Item footprints, in the units of their geometries.
+    """
+    classes: Dict[Optional[str], Dict[str, Dict[Any, int]]] = dataclasses.field(default_factory=dict)
+    """
+    Number of occurrences of each ``label:classes`` value, grouped by their ``name``.
+    """
+    roles: Set[str] = dataclasses.field(default_factory=set)
+    """
+    ML-AOI roles defined by the Item Assets.
+    """
+    resampling_methods: Set[str] = dataclasses.field(default_factory=set)
+    """
+    ML-AOI resampling methods defined by the Item Assets.
+    """
+
+    @property
+    def splits(self) -> List[ML_AOI_Split]:
+        """
+        ML-AOI splits of Items, in the order of their definition.
+        """
+        return [split for split in ML_AOI_Split if split.value in self.counts]
+
+    def update(self, item: pystac.Item) -> None:
+        """
+        Accumulates the statistics of the Item.
+        """
+        split = item.properties.get(ML_AOI_SPLIT_FIELD)
+        split = ML_AOI_Split(split).value if split is not None else None
+        self.counts[split] = self.counts.get(split, 0) + 1
+        if item.geometry is not None:
+            area = shapely.area(shapely.geometry.shape(item.geometry))
+            self.areas[split] = self.areas.get(split, 0.0) + float(area)
+        for label_classes in item.properties.get("label:classes") or []:
+            histogram = self.classes.setdefault(split, {}).setdefault(label_classes.get("name"), {})
+            for label_class in label_classes.get("classes") or []:
+                histogram[label_class] = histogram.get(label_class, 0) + 1
+        for asset in item.assets.values():
+            role = asset.extra_fields.get(ML_AOI_ROLE_FIELD)
+            if role is not None:
+                self.roles.update(str(_role) for _role in (role if isinstance(role, list) else [role]))
+            resampling = asset.extra_fields.get(ML_AOI_RESAMPLING_FIELD)
+            if resampling is not None:
+                self.resampling_methods.add(str(resampling))
+
+    def merge(self, other: "ML_AOI_CollectionStatistics") -> None:
+        """
+        Accumulates the statistics of another set of Items.
+        """
+        for split, count in other.counts.items():
+            self.counts[split] = self.counts.get(split, 0) + count
+        for split, area in other.areas.items():
+            self.areas[split] = self.areas.get(split, 0.0) + area
+        for split, names in other.classes.items():
+            for name, histogram in names.items():
+                merged = self.classes.setdefault(split, {}).setdefault(name, {})
+                for label_class, count in histogram.items():
+                    merged[label_class] = merged.get(label_class, 0) + count
+        self.roles.update(other.roles)
+        self.resampling_methods.update(other.resampling_methods)
+
+
+def summarize_ml_aoi_items(items: Iterable[pystac.Item]) -> ML_AOI_CollectionStatistics:
+    """
+    Computes the statistics of STAC Items in a single pass over them.
+    """
+    stats = ML_AOI_CollectionStatistics()
+    for item in items:
+        stats.update(item)
+    return stats
+
+
+def _summarize_ml_aoi_item_hrefs(
+    hrefs: List[str],
+    stac_io: Optional[pystac.StacIO] = None,
+) -> ML_AOI_CollectionStatistics:
+    return summarize_ml_aoi_items(pystac.Item.from_file(href, stac_io=stac_io) for href in hrefs)
+
+
+def _iter_collection_items(
+    collection: pystac.Collection,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> Iterator[pystac.Item]:
+    """
+    Iterates lazily over the Items of the Collection.
+
+    Items that are not yet loaded in memory are read from their location without being attached to the Collection,
+    such that they can be released once summarized.
+    """
+    for link in collection.get_item_links():
+        if link.is_resolved():
+            yield link.target
+        else:
+            yield pystac.Item.from_file(link.get_absolute_href(), stac_io=stac_io)
+
+
+def summarize_ml_aoi_collection(
+    collection: pystac.Collection,
+    apply: bool = True,
+    processes: Optional[int] = None,
+    chunk_size: int = 1000,
+    stac_io: Optional[pystac.StacIO] = None,
+) -> ML_AOI_CollectionStatistics:
+    """
+    Computes the statistics of the STAC Items of an ML-AOI Collection in a single pass.
+
+    Items that are not yet loaded in memory are read one at a time from their location, without being attached to the
+    Collection, such that memory does not grow with the number of Items.
+
+    The ``ml-aoi:split`` summaries of the Collection are then updated with the splits of its Items.
+
+    Args:
+        collection: Collection for which to summarize the Items.
+        apply: Whether to update the ``ml-aoi:split`` summaries of the Collection.
+        processes:
+            Number of worker processes across which to shard the Items.
+            Sharding only applies to Items that are not yet loaded in memory and that can be read from their location.
+            Other Items are summarized in the current process.
+        chunk_size: Number of Items read by a worker process at once.
+        stac_io:
+            I/O implementation to read Items that are not yet loaded in memory.
+            It is sent to worker processes, and must therefore be picklable when using them.
+    Returns:
+        Statistics of the Collection Items.
+    """
+    if processes:
+        hrefs = []
+        resolved = []
+        for link in collection.get_item_links():
+            if link.is_resolved():
+                resolved.append(link.target)
+            else:
+                hrefs.append(link.get_absolute_href())
+        stats = summarize_ml_aoi_items(resolved)
+        chunks = [hrefs[index:index + chunk_size] for index in range(0, len(hrefs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for chunk_stats in executor.map(_summarize_ml_aoi_item_hrefs, chunks, [stac_io] * len(chunks)):
+                stats.merge(chunk_stats)
+    else:
+        stats = summarize_ml_aoi_items(_iter_collection_items(collection, stac_io))
+    if apply:
+        if stats.splits:
+            ML_AOI_Extension.summaries(collection, add_if_missing=True).split = stats.splits
+        elif collection.summaries.get_list(ML_AOI_SPLIT_FIELD) is not None:
+            # the model requires at least one ML-AOI field, which cannot be satisfied when removing the only summary
+            with ml_aoi_trusted():
+                ML_AOI_Extension.summaries(collection, add_if_missing=True).split = None
+    return stats
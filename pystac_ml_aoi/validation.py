@@ -0,0 +1,408 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utilities to validate STAC catalogs against the ML-AOI JSON schema.
+"""
+import dataclasses
+import functools
+import itertools
+import numbers
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, cast
+
+import jsonschema
+import pystac
+from pystac.validation.stac_validator import JsonSchemaSTACValidator
+
+from pystac_ml_aoi.catalog import iter_stac_hrefs
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_SCHEMA_URI, get_ml_aoi_schema
+
+ML_AOI_CONTAINER_FIELDS = frozenset(["assets", "item_assets"])
+
+SchemaCheck = Callable[[Any], bool]
+
+ML_AOI_SCHEMA_TYPE_CHECKS: Dict[str, SchemaCheck] = {
+    "array": lambda instance: isinstance(instance, list),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": lambda instance: (
+        (isinstance(instance, int) and not isinstance(instance, bool))
+        or (isinstance(instance, float) and instance.is_integer())
+    ),
+    "null": lambda instance: instance is None,
+    "number": lambda instance: isinstance(instance, numbers.Number) and not isinstance(instance, bool),
+    "object": lambda instance: isinstance(instance, dict),
+    "string": lambda instance: isinstance(instance, str),
+}
+ML_AOI_SCHEMA_IGNORED_KEYWORDS = frozenset(["$schema", "$id", "$comment", "title", "description", "definitions"])
+
+
+class ML_AOI_ValidationResult(NamedTuple):
+    """
+    Result of the validation of a STAC document against the ML-AOI JSON schema.
+    """
+    href: Optional[str]
+    errors: List[Tuple[str, str]]
+    """
+    Location within the document (see :func:`get_ml_aoi_error_path`) and message of each validation error.
+    """
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+@dataclasses.dataclass
+class ML_AOI_ValidationSummary:
+    """
+    Aggregated results of the validation of multiple STAC documents against the ML-AOI JSON schema.
+    """
+    total: int = 0
+    invalid: List[str] = dataclasses.field(default_factory=list)
+    """
+    Locations of invalid STAC documents.
+    """
+    errors: Dict[str, int] = dataclasses.field(default_factory=dict)
+    """
+    Number of validation errors by location within the documents.
+    """
+
+    def update(self, result: ML_AOI_ValidationResult) -> None:
+        self.total += 1
+        if not result.valid:
+            self.invalid.append(result.href)
+        for path, _ in result.errors:
+            self.errors[path] = self.errors.get(path, 0) + 1
+
+
+def register_ml_aoi_schema(
+    validator: Optional[JsonSchemaSTACValidator] = None,
+) -> JsonSchemaSTACValidator:
+    """
+    Update the :class:`pystac.validation.RegisteredValidator` with the local ML-AOI JSON schema definition.
+
+    Any call to :func:`pystac.validation.validate` or :meth:`pystac.STACObject.validate` will then use the local
+    definition instead of attempting to retrieve the schema from its URI.
+    """
+    validator = validator or pystac.validation.RegisteredValidator.get_validator()
+    validator = cast(JsonSchemaSTACValidator, validator)
+    validator.schema_cache[ML_AOI_SCHEMA_URI] = get_ml_aoi_schema()
+    pystac.validation.RegisteredValidator.set_validator(validator)
+    return validator
+
+
+@functools.lru_cache(maxsize=None)
+def get_ml_aoi_validator() -> jsonschema.Draft7Validator:
+    """
+    Obtain the compiled JSON schema validator of the local ML-AOI schema, created once per process.
+    """
+    return jsonschema.Draft7Validator(get_ml_aoi_schema())
+
+
+def _json_equal(one: Any, two: Any) -> bool:
+    """
+    Compare JSON values with the same semantics as JSON schema ``const`` and ``enum``, where booleans are not numbers.
+    """
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return bool(one == two)
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_json_equal(_one, _two) for _one, _two in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return one.keys() == two.keys() and all(_json_equal(one[key], two[key]) for key in one)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return type(one) is type(two) and one == two
+    return bool(one == two)
+
+
+def _compile_enum(values: List[Any]) -> SchemaCheck:
+    if values and all(isinstance(value, str) for value in values):  # schema values are plain JSON strings
+        choices = frozenset(values)
+
+        def check_str_enum(instance: Any) -> bool:
+            if type(instance) is str:  # pylint: disable=unidiomatic-typecheck  # exact type for a consistent hash
+                return instance in choices
+            # subclasses of 'str' (e.g.: enums) do not necessarily share the hash of their value
+            return isinstance(instance, str) and any(instance == value for value in values)
+        return check_str_enum
+    return lambda instance: any(_json_equal(instance, value) for value in values)
+
+
+def compile_ml_aoi_schema(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None) -> SchemaCheck:
+    """
+    Compile a JSON schema into a specialized Python check of raw JSON documents.
+
+    Only the subset of JSON schema Draft 7 keywords used by the ML-AOI schema is supported, namely ``type``,
+    ``const``, ``enum``, ``required``, ``properties``, ``patternProperties``, ``additionalProperties``, ``items``,
+    ``contains``, ``allOf``, ``oneOf`` and local ``$ref``. Each keyword is resolved once into a closure, such that
+    checking a document only executes the applicable checks, without any schema lookup nor error reporting.
+    The compiled check returns the same result as :meth:`jsonschema.Draft7Validator.is_valid`.
+
+    Args:
+        schema: JSON schema, or sub-schema, to compile.
+        root: Root JSON schema against which ``$ref`` are resolved. Defaults to the schema itself.
+    Returns:
+        Function indicating whether a JSON document is valid against the schema.
+    Raises:
+        NotImplementedError: If the schema uses an unsupported keyword.
+    """
+    root = schema if root is None else root
+    if schema is True or schema == {}:
+        return lambda instance: True
+    if schema is False:
+        return lambda instance: False
+    unknown = set(schema) - ML_AOI_SCHEMA_IGNORED_KEYWORDS - {
+        "type", "const", "enum", "required", "properties", "patternProperties", "additionalProperties",
+        "items", "contains", "allOf", "oneOf", "$ref",
+    }
+    if unknown:
+        raise NotImplementedError(f"Unsupported JSON schema keywords: {sorted(unknown)}")
+
+    checks: List[SchemaCheck] = []
+    if "$ref" in schema:
+        ref = schema["$ref"]
+        if not ref.startswith("#"):
+            raise NotImplementedError(f"Unsupported remote JSON schema reference: {ref}")
+        target = root
+        for part in filter(None, ref[1:].split("/")):
+            target = target[part.replace("~1", "/").replace("~0", "~")]
+        # draft 7 ignores all other keywords next to a reference
+        return compile_ml_aoi_schema(target, root)
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = [ML_AOI_SCHEMA_TYPE_CHECKS[_type] for _type in types]
+        checks.append(type_checks[0] if len(type_checks) == 1 else (
+            lambda instance: any(check(instance) for check in type_checks)
+        ))
+    if "const" in schema:
+        const = schema["const"]
+        checks.append(lambda instance: _json_equal(instance, const))
+    if "enum" in schema:
+        checks.append(_compile_enum(schema["enum"]))
+    checks.extend(_compile_object(schema, root))
+    if "items" in schema:
+        if not isinstance(schema["items"], dict):
+            raise NotImplementedError("Unsupported JSON schema 'items' as array of schemas.")
+        item_check = compile_ml_aoi_schema(schema["items"], root)
+        checks.append(lambda instance: not isinstance(instance, list) or all(map(item_check, instance)))
+    if "contains" in schema:
+        contains_check = compile_ml_aoi_schema(schema["contains"], root)
+        checks.append(lambda instance: not isinstance(instance, list) or any(map(contains_check, instance)))
+    if "allOf" in schema:
+        checks.extend(compile_ml_aoi_schema(sub_schema, root) for sub_schema in schema["allOf"])
+    if "oneOf" in schema:
+        one_of_checks = [compile_ml_aoi_schema(sub_schema, root) for sub_schema in schema["oneOf"]]
+        checks.append(lambda instance: sum(1 for check in one_of_checks if check(instance)) == 1)
+
+    if not checks:
+        return lambda instance: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(instance: Any) -> bool:
+        for check in checks:
+            if not check(instance):
+                return False
+        return True
+    return check_all
+
+
+def _compile_object(schema: Dict[str, Any], root: Dict[str, Any]) -> List[SchemaCheck]:
+    """
+    Compile the keywords of a JSON schema applicable to objects into a single check.
+    """
+    required = schema.get("required", [])
+    properties = {
+        name: compile_ml_aoi_schema(sub_schema, root)
+        for name, sub_schema in schema.get("properties", {}).items()
+        if sub_schema not in (True, {})
+    }
+    patterns = [
+        (re.compile(pattern), compile_ml_aoi_schema(sub_schema, root))
+        for pattern, sub_schema in schema.get("patternProperties", {}).items()
+    ]
+    additional = schema.get("additionalProperties", True)
+    additional_check = None if additional in (True, {}) else compile_ml_aoi_schema(additional, root)
+    known = frozenset(schema.get("properties", {}))
+    # patterns with empty schemas only matter to exclude properties from additional properties checks
+    pattern_checks = [
+        (pattern, check) for pattern, check in patterns
+        if schema["patternProperties"][pattern.pattern] not in (True, {})
+    ]
+    if not (required or properties or pattern_checks or additional_check):
+        return []
+
+    def check_object(instance: Any) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        for name in required:
+            if name not in instance:
+                return False
+        for name, check in properties.items():
+            if name in instance and not check(instance[name]):
+                return False
+        if pattern_checks or additional_check:
+            for name, value in instance.items():
+                matched = False
+                for pattern, check in patterns:
+                    if pattern.search(name):
+                        matched = True
+                        if not check(value):
+                            return False
+                if additional_check and not matched and name not in known and not additional_check(value):
+                    return False
+        return True
+    return [check_object]
+
+
+@functools.lru_cache(maxsize=None)
+def get_ml_aoi_fast_validator() -> SchemaCheck:
+    """
+    Obtain the specialized check of the local ML-AOI schema compiled by :func:`compile_ml_aoi_schema`.
+    """
+    return compile_ml_aoi_schema(get_ml_aoi_schema())
+
+
+def is_valid_ml_aoi_document(data: Dict[str, Any]) -> bool:
+    """
+    Indicate whether a STAC document is valid against the ML-AOI JSON schema, using the specialized compiled check.
+    """
+    return get_ml_aoi_fast_validator()(data)
+
+
+def get_ml_aoi_error_path(error: jsonschema.ValidationError) -> str:
+    """
+    Obtain the location of a validation error within a STAC document.
+
+    Keys of Assets are replaced by ``*`` in order to aggregate similar errors across documents.
+    """
+    path = []
+    parent = None
+    for part in error.absolute_path:
+        path.append("*" if parent in ML_AOI_CONTAINER_FIELDS else str(part))
+        parent = part
+    return "/" + "/".join(path)
+
+
+def _iter_relevant_errors(error: jsonschema.ValidationError) -> Iterator[jsonschema.ValidationError]:
+    """
+    Iterate over the leaf errors of the schema definitions applicable to the document.
+
+    Errors of ``oneOf`` definitions for another type of STAC object (i.e.: mismatching ``type``) are ignored.
+    """
+    if not error.context:
+        yield error
+        return
+    branches: Dict[Any, List[jsonschema.ValidationError]] = {}
+    for sub_error in error.context:
+        branches.setdefault(sub_error.relative_schema_path[0], []).append(sub_error)
+    relevant = [
+        sub_errors for sub_errors in branches.values()
+        if not any(list(sub_error.absolute_path) == ["type"] for sub_error in sub_errors)
+    ]
+    if not relevant:
+        yield error
+        return
+    for sub_errors in relevant:
+        for sub_error in sub_errors:
+            yield from _iter_relevant_errors(sub_error)
+
+
+def validate_ml_aoi_document(data: Dict[str, Any], href: Optional[str] = None) -> ML_AOI_ValidationResult:
+    """
+    Validate a STAC document against the ML-AOI JSON schema.
+
+    The document is first checked with the specialized ML-AOI schema check. The generic JSON schema validator is
+    only employed to report errors of invalid documents.
+    """
+    if is_valid_ml_aoi_document(data):
+        return ML_AOI_ValidationResult(href, [])
+    validator = get_ml_aoi_validator()
+    errors = [
+        (get_ml_aoi_error_path(leaf_error), leaf_error.message)
+        for error in validator.iter_errors(data)
+        for leaf_error in _iter_relevant_errors(error)
+    ]
+    return ML_AOI_ValidationResult(href, errors)
+
+
+def _init_ml_aoi_validators() -> None:
+    get_ml_aoi_fast_validator()
+    get_ml_aoi_validator()
+
+
+def _validate_ml_aoi_hrefs(hrefs: List[str]) -> List[ML_AOI_ValidationResult]:
+    stac_io = pystac.StacIO.default()
+    results = []
+    for href in hrefs:
+        data = stac_io.read_json(href)
+        if ML_AOI_SCHEMA_URI in (data.get("stac_extensions") or []):
+            results.append(validate_ml_aoi_document(data, href))
+    return results
+
+
+def _chunked(hrefs: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    hrefs = iter(hrefs)
+    while True:
+        chunk = list(itertools.islice(hrefs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_validate_ml_aoi_catalog(
+    root_href: str,
+    processes: Optional[int] = None,
+    chunk_size: int = 100,
+) -> Iterator[ML_AOI_ValidationResult]:
+    """
+    Validate all STAC Collections and Items of a catalog that declare the ML-AOI extension.
+
+    The catalog is traversed lazily, and its documents are validated by chunks across a pool of worker processes.
+    Each worker compiles the ML-AOI JSON schema validator once. Results are returned as soon as they are completed,
+    such that their order is not guaranteed when using worker processes.
+
+    Args:
+        root_href: Location of the root STAC Catalog, Collection or Item.
+        processes: Number of worker processes. Documents are validated in the current process if omitted.
+        chunk_size: Number of documents read and validated by a worker process at once.
+    Yields:
+        Validation results.
+    """
+    chunks = _chunked(iter_stac_hrefs(root_href), chunk_size)
+    if not processes:
+        for chunk in chunks:
+            yield from _validate_ml_aoi_hrefs(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_ml_aoi_validators) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_validate_ml_aoi_hrefs, chunk))
+            if len(pending) >= processes * 2:  # bound the number of chunks in memory
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def validate_ml_aoi_catalog(
+    root_href: str,
+    processes: Optional[int] = None,
+    chunk_size: int = 100,
+) -> ML_AOI_ValidationSummary:
+    """
+    Validate all STAC Collections and Items of a catalog that declare the ML-AOI extension.
+
+    See :func:`iter_validate_ml_aoi_catalog` for details.
+
+    Returns:
+        Aggregated validation results.
+    """
+    summary = ML_AOI_ValidationSummary()
+    for result in iter_validate_ml_aoi_catalog(root_href, processes=processes, chunk_size=chunk_size):
+        summary.update(result)
+    return summary
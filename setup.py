@@ -144,6 +144,8 @@ setup(
         "docs": DOCS_REQUIREMENTS,
         "dev": TEST_REQUIREMENTS,
         "test": TEST_REQUIREMENTS,
+        "manifest": ["pyarrow"],
+        "ndjson": ["orjson"],
     },
     entry_points={
     }
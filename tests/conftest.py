@@ -1,10 +1,14 @@
-import json
-from typing import cast
+import dataclasses
+import hashlib
+import http.server
+import os
+import threading
+from typing import Iterator, List, Tuple
 
 import pystac
 import pytest
 
-from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_SCHEMA_PATH, ML_AOI_SCHEMA_URI
+from pystac_ml_aoi.validation import register_ml_aoi_schema
 
 
 @pytest.fixture(scope="session", name="stac_validator", autouse=True)
@@ -19,9 +23,71 @@ def make_stac_ml_aoi_validator(
     in ``GetSchemaError`` when the schema retrieval is attempted by the validator. By adding the schema to the
     mapping beforehand, remote resolution can be bypassed temporarily.
     """
-    validator = pystac.validation.RegisteredValidator.get_validator()
-    validator = cast(pystac.validation.stac_validator.JsonSchemaSTACValidator, validator)
-    validation_schema = json.loads(pystac.StacIO.default().read_text(ML_AOI_SCHEMA_PATH))
-    validator.schema_cache[ML_AOI_SCHEMA_URI] = validation_schema
-    pystac.validation.RegisteredValidator.set_validator(validator)  # apply globally to allow 'STACObject.validate()'
-    return validator
+    return register_ml_aoi_schema()  # apply globally to allow 'STACObject.validate()'
+
+
+@dataclasses.dataclass
+class HTTPStandIn:
+    """
+    Local HTTP server standing in for a remote STAC catalog, serving the files of its root directory.
+    """
+    root: str
+    url: str
+    requests: List[Tuple[str, int, int]] = dataclasses.field(default_factory=list)  # path, status, client port
+
+
+class _HTTPStandInHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    stand_in: HTTPStandIn
+
+    def do_GET(self) -> None:
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self._respond(404, b"")
+            return
+        with open(path, mode="rb") as file:
+            body = file.read()
+        etag = f"\"{hashlib.sha256(body).hexdigest()}\""
+        if self.headers.get("If-None-Match") == etag:
+            self._respond(304, None, etag)
+        else:
+            self._respond(200, body, etag)
+
+    def _respond(self, status: int, body: bytes = None, etag: str = None) -> None:
+        self.stand_in.requests.append((self.path, status, self.client_address[1]))
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if body is not None:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@pytest.fixture(scope="function", name="http_stand_in")
+def make_http_stand_in(tmp_path) -> Iterator[HTTPStandIn]:
+    """
+    Serves files written under the root directory of the stand-in over HTTP, without any network access.
+
+    Responses define an ``ETag`` of their contents and honor ``If-None-Match`` conditional requests.
+    """
+    root = tmp_path / "http"
+    root.mkdir()
+    stand_in = HTTPStandIn(root=str(root), url="")
+    handler = type("HTTPStandInHandler", (_HTTPStandInHandler, ), {"stand_in": stand_in})
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        lambda *args: handler(*args, directory=stand_in.root),
+    )
+    stand_in.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield stand_in
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Seeded generator of synthetic ML-AOI STAC Collections, used to measure performance on large catalogs.
+"""
+import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+import pystac
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_SCHEMA_URI, ML_AOI_Extension, ML_AOI_Split
+
+SYNTHETIC_SPLITS: Mapping[str, float] = {"train": 0.7, "validate": 0.15, "test": 0.15}
+SYNTHETIC_ROLES: Mapping[str, float] = {"feature": 0.5, "label": 0.5}
+SYNTHETIC_RESAMPLING: Mapping[Optional[str], float] = {None: 0.5, "near": 0.25, "bilinear": 0.25}
+SYNTHETIC_DATETIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _sample(rng: np.random.Generator, distribution: Mapping[Any, float], size: Any) -> np.ndarray:
+    values = list(distribution)
+    weights = np.asarray([distribution[value] for value in values], dtype=float)
+    choices = rng.choice(len(values), size=size, p=weights / weights.sum())
+    return np.asarray(values + [None], dtype=object)[choices]
+
+
+def iter_synthetic_item_dicts(
+    items: int,
+    assets: int = 2,
+    splits: Optional[Mapping[str, float]] = None,
+    roles: Optional[Mapping[str, float]] = None,
+    resampling: Optional[Mapping[Optional[str], float]] = None,
+    seed: int = 0,
+    block: int = 10_000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generates JSON documents of synthetic ML-AOI STAC Items.
+
+    Item footprints are small squares scattered over the globe. The ML-AOI split of Items, and the ML-AOI role
+    and resampling method of their Assets, are sampled from the requested weighted distributions. Generation is
+    deterministic for a given seed and block size. Samples are drawn by blocks of Items to bound memory usage.
+
+    Args:
+        items: Number of Items to generate.
+        assets: Number of Assets per Item. The first Asset of each Item is the ML-AOI reference grid.
+        splits: Weights of ML-AOI splits of Items.
+        roles: Weights of ML-AOI roles of Assets.
+        resampling: Weights of ML-AOI resampling methods of Assets. ``None`` omits the field.
+        seed: Seed of the random generator.
+        block: Number of Items sampled at once.
+    """
+    rng = np.random.default_rng(seed)
+    splits = SYNTHETIC_SPLITS if splits is None else splits
+    roles = SYNTHETIC_ROLES if roles is None else roles
+    resampling = SYNTHETIC_RESAMPLING if resampling is None else resampling
+    date = SYNTHETIC_DATETIME.isoformat().replace("+00:00", "Z")
+    for start in range(0, items, block):
+        count = min(block, items - start)
+        x = rng.uniform(-179.0, 179.0, count).round(6).tolist()
+        y = rng.uniform(-89.0, 89.0, count).round(6).tolist()
+        item_splits = _sample(rng, splits, count).tolist()
+        asset_roles = _sample(rng, roles, (count, assets)).tolist()
+        asset_resampling = _sample(rng, resampling, (count, assets)).tolist()
+        for index in range(count):
+            minx, miny = x[index], y[index]
+            maxx, maxy = minx + 0.01, miny + 0.01
+            item_assets = {}
+            for asset_index in range(assets):
+                asset = {
+                    "href": f"./data/item-{start + index}/asset-{asset_index}.tif",
+                    "type": pystac.MediaType.COG,
+                    "roles": ["data"],
+                    "ml-aoi:role": asset_roles[index][asset_index],
+                }
+                if asset_index == 0:
+                    asset["ml-aoi:reference-grid"] = True
+                if asset_resampling[index][asset_index] is not None:
+                    asset["ml-aoi:resampling-method"] = asset_resampling[index][asset_index]
+                item_assets[f"asset-{asset_index}"] = asset
+            yield {
+                "type": "Feature",
+                "stac_version": pystac.get_stac_version(),
+                "stac_extensions": [ML_AOI_SCHEMA_URI],
+                "id": f"item-{start + index}",
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[[minx, miny], [maxx, miny], [maxx, maxy], [minx, maxy], [minx, miny]]],
+                },
+                "bbox": [minx, miny, maxx, maxy],
+                "properties": {"datetime": date, "ml-aoi:split": item_splits[index]},
+                "links": [],
+                "assets": item_assets,
+            }
+
+
+def make_synthetic_items(items: int, **kwargs: Any) -> List[pystac.Item]:
+    """
+    Generates synthetic ML-AOI STAC Items.
+
+    Items are built directly from their generated fields rather than with :meth:`pystac.Item.from_dict`, which is
+    considerably slower to generate large numbers of Items.
+
+    See :func:`iter_synthetic_item_dicts` for parameters.
+    """
+    results = []
+    for data in iter_synthetic_item_dicts(items, **kwargs):
+        item = pystac.Item(
+            id=data["id"],
+            geometry=data["geometry"],
+            bbox=data["bbox"],
+            datetime=SYNTHETIC_DATETIME,
+            properties={"ml-aoi:split": data["properties"]["ml-aoi:split"]},
+            stac_extensions=data["stac_extensions"],
+        )
+        for key, asset in data["assets"].items():
+            href = asset.pop("href")
+            media_type = asset.pop("type")
+            roles = asset.pop("roles")
+            item.add_asset(key, pystac.Asset(href, media_type=media_type, roles=roles, extra_fields=asset))
+        results.append(item)
+    return results
+
+
+def make_synthetic_collection(items: int, **kwargs: Any) -> pystac.Collection:
+    """
+    Generates a synthetic ML-AOI STAC Collection containing the requested number of Items.
+
+    See :func:`iter_synthetic_item_dicts` for parameters.
+    """
+    collection = pystac.Collection(
+        id="synthetic-ml-aoi",
+        description="Synthetic ML-AOI Collection.",
+        extent=pystac.Extent(
+            spatial=pystac.SpatialExtent(bboxes=[[-180.0, -90.0, 180.0, 90.0]]),
+            temporal=pystac.TemporalExtent(intervals=[[SYNTHETIC_DATETIME, None]]),
+        ),
+    )
+    item_splits = set()
+    for item in make_synthetic_items(items, **kwargs):
+        item_splits.add(item.properties["ml-aoi:split"])
+        collection.add_item(item)
+    ML_AOI_Extension.ext(collection, add_if_missing=True).split = [
+        split for split in ML_AOI_Split if split.value in item_splits
+    ]
+    return collection
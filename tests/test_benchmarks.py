@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Performance budgets of :mod:`pystac_ml_aoi` utilities.
+
+Tests marked as ``benchmark`` are deselected by default, and must be requested explicitly with ``-m benchmark``, such
+as by ``make test-benchmark``. Budgets can be adjusted with environment variables for slower environments.
+"""
+import datetime
+import gc
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import (
+    ML_AOI_SCHEMA_URI,
+    ML_AOI_Extension,
+    ML_AOI_ItemExtension,
+    ML_AOI_ItemProperties,
+    ML_AOI_Resampling,
+    ML_AOI_Split
+)
+from pystac_ml_aoi.resampling import resample_ml_aoi_array
+from pystac_ml_aoi.summaries import summarize_ml_aoi_items
+from pystac_ml_aoi.validation import get_ml_aoi_fast_validator, get_ml_aoi_validator, is_valid_ml_aoi_document
+from tests.synthetic import iter_synthetic_item_dicts, make_synthetic_items
+
+CUR_DIR = os.path.dirname(__file__)
+EXAMPLES_DIR = os.path.join(os.path.dirname(CUR_DIR), "examples")
+
+IMPORT_TIME_BUDGET = float(os.getenv("ML_AOI_IMPORT_TIME_BUDGET", "0.1"))  # seconds
+VALIDATION_ITEMS = int(os.getenv("ML_AOI_VALIDATION_BENCHMARK_ITEMS", "100000"))
+VALIDATION_REFERENCE_ITEMS = int(os.getenv("ML_AOI_VALIDATION_REFERENCE_ITEMS", "1000"))
+VALIDATION_MIN_SPEEDUP = float(os.getenv("ML_AOI_VALIDATION_MIN_SPEEDUP", "10"))
+WRAPPER_ITEMS = int(os.getenv("ML_AOI_WRAPPER_BENCHMARK_ITEMS", "1000000"))
+WRAPPER_MEMORY_ITEMS = int(os.getenv("ML_AOI_WRAPPER_MEMORY_ITEMS", "10000"))
+WRAPPER_LATENCY_BUDGET = float(os.getenv("ML_AOI_WRAPPER_LATENCY_BUDGET", "20e-6"))  # seconds per Item
+WRAPPER_MEMORY_BUDGET = float(os.getenv("ML_AOI_WRAPPER_MEMORY_BUDGET", "400"))  # bytes per Item
+RESAMPLING_SIZE = int(os.getenv("ML_AOI_RESAMPLING_BENCHMARK_SIZE", "2048"))  # source pixels per side
+RESAMPLING_MIN_MPS = float(os.getenv("ML_AOI_RESAMPLING_MIN_MPS", "1"))  # source megapixels per second
+BENCHMARK_SIZES = [int(size) for size in os.getenv("ML_AOI_BENCHMARK_SIZES", "1000,10000").split(",")]
+BENCHMARK_MEMORY_ITEMS = int(os.getenv("ML_AOI_BENCHMARK_MEMORY_ITEMS", "10000"))
+BENCHMARK_TOLERANCE = float(os.getenv("ML_AOI_BENCHMARK_TOLERANCE", "1.0"))
+BENCHMARK_REPORT = os.getenv("ML_AOI_BENCHMARK_REPORT")
+BENCHMARK_ASSETS = 3
+BENCHMARK_SEED = 42
+BENCHMARK_BUDGETS: Dict[str, Dict[str, float]] = {  # seconds and peak bytes per Item
+    "ext": {"latency": 25e-6, "memory": 1000},
+    "apply": {"latency": 80e-6, "memory": 500},
+    "apply_many": {"latency": 10e-6, "memory": 200},
+    "set_property": {"latency": 30e-6, "memory": 300},
+    "get_assets": {"latency": 300e-6, "memory": 8000},
+    "summaries": {"latency": 120e-6, "memory": 200},
+    "validation": {"latency": 50e-6, "memory": 100},
+}
+
+
+@pytest.mark.benchmark
+def test_import_time_budget() -> None:
+    """
+    Validate that importing the ML-AOI extension module does not load the schema nor build validation models.
+
+    Dependencies are preloaded to only measure the cost of the module itself.
+    """
+    script = "\n".join([
+        "import json, time",
+        "import pydantic, pydantic.fields, pydantic.main, pystac, pystac.extensions.base, pystac.extensions.hooks",
+        "start = time.perf_counter()",
+        "import pystac_ml_aoi.extensions.ml_aoi as ml_aoi",
+        "duration = time.perf_counter() - start",
+        "print(json.dumps({",
+        "    'duration': duration,",
+        "    'schema_loaded': ml_aoi.get_ml_aoi_schema.cache_info().currsize > 0,",
+        "    'models_built': ml_aoi.ML_AOI_ItemProperties.__pydantic_complete__,",
+        "}))",
+    ])
+    results = []
+    for _ in range(3):
+        out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+        results.append(json.loads(out.stdout))
+    assert not any(result["schema_loaded"] for result in results)
+    assert not any(result["models_built"] for result in results)
+    best = min(result["duration"] for result in results)
+    assert best < IMPORT_TIME_BUDGET, f"Import time {best:.4f}s exceeds budget {IMPORT_TIME_BUDGET}s"
+
+
+@pytest.mark.benchmark
+def test_property_assignment_latency(capsys: pytest.CaptureFixture) -> None:
+    """
+    Validate that checking a single ML-AOI property assignment using the cached field validators is faster than
+    validating the assignment through a full model.
+    """
+    item = pystac.Item("test", geometry=None, bbox=None, datetime=datetime.datetime.now(), properties={})
+    ml_aoi_item = ML_AOI_Extension.ext(item, add_if_missing=True)
+    splits = itertools.cycle(ML_AOI_Split)
+
+    def assign() -> None:
+        ml_aoi_item.split = next(splits)
+
+    def validate_cached() -> None:
+        ML_AOI_ItemExtension._validate_ml_aoi_property("split", next(splits))
+
+    def validate_model() -> None:
+        model = ML_AOI_ItemProperties.model_construct()
+        ML_AOI_ItemProperties.__pydantic_validator__.validate_assignment(model, "split", next(splits))
+
+    number = 10_000
+    assigned = min(timeit.repeat(assign, number=number, repeat=3)) / number
+    cached = min(timeit.repeat(validate_cached, number=number, repeat=3)) / number
+    legacy = min(timeit.repeat(validate_model, number=number, repeat=3)) / number
+    with capsys.disabled():
+        print(
+            f"\nML-AOI property assignment: {assigned * 1e6:.2f}us, "
+            f"validation: {cached * 1e6:.2f}us (cached) vs {legacy * 1e6:.2f}us (model)"
+        )
+    assert ML_AOI_Split(item.properties["ml-aoi:split"]) in ML_AOI_Split
+    assert cached < legacy
+
+
+@pytest.mark.benchmark
+def test_fast_validation_speedup(capsys: pytest.CaptureFixture) -> None:
+    """
+    Validate that the compiled ML-AOI schema check is faster than generic JSON schema validation of STAC Items.
+
+    The compiled check is measured over the full set of Items. Because the generic validator is much slower,
+    it is only measured over a subset of the same Items, and extrapolated to the full set.
+    """
+    example = os.path.join(EXAMPLES_DIR, "item_EuroSAT-subset-train-sample-42-class-Residential.geojson")
+    with open(example, mode="r", encoding="utf-8") as item_file:
+        item_data = json.load(item_file)
+    splits = itertools.cycle(split.value for split in ML_AOI_Split)
+    items = []
+    for index in range(VALIDATION_ITEMS):
+        data = dict(item_data, id=f"item-{index}", properties=dict(item_data["properties"]))
+        data["properties"]["ml-aoi:split"] = next(splits)
+        items.append(data)
+    fast_validator = get_ml_aoi_fast_validator()
+    validator = get_ml_aoi_validator()
+
+    start = time.perf_counter()
+    assert all(fast_validator(data) for data in items)
+    fast = time.perf_counter() - start
+    start = time.perf_counter()
+    assert all(validator.is_valid(data) for data in items[:VALIDATION_REFERENCE_ITEMS])
+    generic = (time.perf_counter() - start) * len(items) / min(len(items), VALIDATION_REFERENCE_ITEMS)
+    with capsys.disabled():
+        print(
+            f"\nML-AOI validation of {len(items)} Items: {fast:.2f}s (compiled) vs {generic:.2f}s (jsonschema, "
+            f"extrapolated from {min(len(items), VALIDATION_REFERENCE_ITEMS)} Items), speedup {generic / fast:.1f}x"
+        )
+    assert generic / fast > VALIDATION_MIN_SPEEDUP
+
+
+def make_bare_items(count: int) -> List[pystac.Item]:
+    date = datetime.datetime(2024, 1, 1)
+    return [
+        pystac.Item(f"item-{index}", None, None, date, {}, stac_extensions=[ML_AOI_SCHEMA_URI])
+        for index in range(count)
+    ]
+
+
+@pytest.mark.benchmark
+def test_extension_wrapper_budget(capsys: pytest.CaptureFixture) -> None:
+    """
+    Validate the latency and memory budgets of extending STAC Items with the ML-AOI extension.
+
+    Latency is measured over the full set of Items. Memory is traced over a subset of Items, since tracing
+    allocations considerably slows down the operations.
+    """
+    items = make_bare_items(WRAPPER_ITEMS)
+    start = time.perf_counter()
+    extensions = [ML_AOI_Extension.ext(item) for item in items]
+    latency = (time.perf_counter() - start) / len(items)
+    start = time.perf_counter()
+    assert all(ML_AOI_Extension.ext(item) is ext for item, ext in zip(items, extensions))
+    memoized = (time.perf_counter() - start) / len(items)
+    del extensions, items
+
+    items = make_bare_items(WRAPPER_MEMORY_ITEMS)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        extensions = [ML_AOI_Extension.ext(item) for item in items]
+        memory = (tracemalloc.get_traced_memory()[0] - before) / len(items)
+    finally:
+        tracemalloc.stop()
+    splits = itertools.cycle(ML_AOI_Split)
+    for ext in extensions:
+        ext.split = next(splits)
+    assert extensions[0].split == ML_AOI_Split.TRAIN
+    with capsys.disabled():
+        print(
+            f"\nML-AOI extension of {WRAPPER_ITEMS} Items: {latency * 1e6:.2f}us/Item (new), "
+            f"{memoized * 1e6:.2f}us/Item (memoized), {memory:.0f} bytes/Item"
+        )
+    assert latency < WRAPPER_LATENCY_BUDGET
+    assert memory < WRAPPER_MEMORY_BUDGET
+
+
+@pytest.mark.benchmark
+def test_resampling_throughput(capsys: pytest.CaptureFixture) -> None:
+    """
+    Validate the throughput of every ML-AOI resampling method, in source megapixels per second.
+
+    A masked source tile is aligned onto a grid with a fractional scale factor, such that all methods process
+    partially covered source pixels and invalid values.
+    """
+    rng = np.random.default_rng(0)
+    size = RESAMPLING_SIZE
+    data = rng.normal(size=(size, size)).astype(np.float32)
+    data[rng.random(data.shape) < 0.1] = -9999
+    out_size = int(size / 2.5)
+    throughputs = {}
+    for method in ML_AOI_Resampling:
+        start = time.perf_counter()
+        result = resample_ml_aoi_array(data, (out_size, out_size), method, nodata=-9999)
+        throughputs[method.value] = size * size / 1e6 / (time.perf_counter() - start)
+        assert result.shape == (out_size, out_size) and result.dtype == np.float32
+    with capsys.disabled():
+        print(f"\nML-AOI resampling of {size}x{size} to {out_size}x{out_size} pixels (MP/s):")
+        for method, throughput in throughputs.items():
+            print(f"  {method:>10}: {throughput:.1f}")
+    assert min(throughputs.values()) > RESAMPLING_MIN_MPS
+
+
+def make_items(size: int) -> List[pystac.Item]:
+    return make_synthetic_items(size, assets=BENCHMARK_ASSETS, seed=BENCHMARK_SEED)
+
+
+def make_extensions(size: int) -> List[ML_AOI_ItemExtension]:
+    return [ML_AOI_Extension.ext(item) for item in make_items(size)]
+
+
+def make_documents(size: int) -> List[Dict[str, Any]]:
+    return list(iter_synthetic_item_dicts(size, assets=BENCHMARK_ASSETS, seed=BENCHMARK_SEED))
+
+
+def run_ext(items: List[pystac.Item]) -> None:
+    for item in items:
+        ML_AOI_Extension.ext(item)
+
+
+def run_apply(extensions: List[ML_AOI_ItemExtension]) -> None:
+    for ext in extensions:
+        ext.apply(split="validate")
+
+
+def run_apply_many(items: List[pystac.Item]) -> None:
+    fields = {"split": "validate"}
+    assert not ML_AOI_Extension.apply_many(items, [fields] * len(items))
+
+
+def run_set_property(extensions: List[ML_AOI_ItemExtension]) -> None:
+    for ext in extensions:
+        ext.split = "test"
+
+
+def run_get_assets(extensions: List[ML_AOI_ItemExtension]) -> None:
+    for ext in extensions:
+        ext.get_assets(role="label", reference_grid=True)
+
+
+def run_summaries(items: List[pystac.Item]) -> None:
+    summarize_ml_aoi_items(items)
+
+
+def run_validation(documents: List[Dict[str, Any]]) -> None:
+    assert all(is_valid_ml_aoi_document(data) for data in documents)
+
+
+BENCHMARK_OPERATIONS: Dict[str, Tuple[Callable[[int], Any], Callable[[Any], None]]] = {
+    "ext": (make_items, run_ext),
+    "apply": (make_extensions, run_apply),
+    "apply_many": (make_items, run_apply_many),
+    "set_property": (make_extensions, run_set_property),
+    "get_assets": (make_extensions, run_get_assets),
+    "summaries": (make_items, run_summaries),
+    "validation": (make_documents, run_validation),
+}
+
+
+def measure_latency(prepare: Callable[[int], Any], run: Callable[[Any], None], size: int) -> float:
+    inputs = prepare(size)
+    gc.collect()
+    start = time.perf_counter()
+    run(inputs)
+    return (time.perf_counter() - start) / size
+
+
+def measure_memory(prepare: Callable[[int], Any], run: Callable[[Any], None], size: int) -> float:
+    inputs = prepare(size)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run(inputs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return max(peak - before, 0) / size
+
+
+def test_synthetic_generator() -> None:
+    documents = list(iter_synthetic_item_dicts(2000, assets=2, splits={"train": 3, "test": 1}, seed=1, block=300))
+    assert documents == list(
+        iter_synthetic_item_dicts(2000, assets=2, splits={"train": 3, "test": 1}, seed=1, block=300)
+    )
+    assert all(is_valid_ml_aoi_document(data) for data in documents)
+    splits = [data["properties"]["ml-aoi:split"] for data in documents]
+    assert set(splits) == {"train", "test"}
+    assert 0.7 < splits.count("train") / len(splits) < 0.8
+    assert all(list(data["assets"]) == ["asset-0", "asset-1"] for data in documents)
+    assert all(data["assets"]["asset-0"]["ml-aoi:reference-grid"] for data in documents)
+
+    items = make_synthetic_items(10, assets=1, resampling={"near": 1}, seed=1)
+    assert [item.id for item in items] == [data["id"] for data in iter_synthetic_item_dicts(10, seed=1)]
+    assert all(item.assets["asset-0"].extra_fields["ml-aoi:resampling-method"] == "near" for item in items)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", BENCHMARK_SIZES)
+@pytest.mark.parametrize("operation", list(BENCHMARK_OPERATIONS))
+def test_benchmark_suite(operation: str, size: int, capsys: pytest.CaptureFixture) -> None:
+    """
+    Validate the throughput and memory budgets of the main entry points over seeded synthetic Collections.
+
+    Each operation is measured over Items generated by :mod:`tests.synthetic` for every size listed in the
+    ``ML_AOI_BENCHMARK_SIZES`` environment variable (comma-separated, e.g.: ``1000,10000,100000,1000000``).
+    Measurements are compared against the per-Item budgets, scaled by the ``ML_AOI_BENCHMARK_TOLERANCE`` factor.
+    Results are appended as JSON lines to the ``ML_AOI_BENCHMARK_REPORT`` file when specified, in order to compare
+    runs or update budgets. Peak memory is traced over at most ``ML_AOI_BENCHMARK_MEMORY_ITEMS`` Items, since
+    tracing allocations considerably slows down the operations.
+    """
+    prepare, run = BENCHMARK_OPERATIONS[operation]
+    latency = measure_latency(prepare, run, size)
+    memory = measure_memory(prepare, run, min(size, BENCHMARK_MEMORY_ITEMS))
+    result = {
+        "operation": operation,
+        "items": size,
+        "throughput": 1 / latency,  # Items per second
+        "latency": latency,  # seconds per Item
+        "memory": memory,  # peak bytes per Item
+    }
+    with capsys.disabled():
+        print(
+            f"\nML-AOI benchmark [{operation}] {size} Items: "
+            f"{result['throughput']:.0f} Items/s, {latency * 1e6:.2f}us/Item, {memory:.0f} bytes/Item (peak)"
+        )
+    if BENCHMARK_REPORT:
+        with open(BENCHMARK_REPORT, mode="a", encoding="utf-8") as report_file:
+            report_file.write(json.dumps(result) + "\n")
+
+    budget = BENCHMARK_BUDGETS[operation]
+    assert latency <= budget["latency"] * BENCHMARK_TOLERANCE, (
+        f"Latency of '{operation}' ({latency * 1e6:.2f}us/Item) exceeds budget ({budget['latency'] * 1e6:.2f}us/Item)"
+    )
+    assert memory <= budget["memory"] * BENCHMARK_TOLERANCE, (
+        f"Peak memory of '{operation}' ({memory:.0f} bytes/Item) exceeds budget ({budget['memory']:.0f} bytes/Item)"
+    )
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test catalog traversal utilities provided by :mod:`pystac_ml_aoi.catalog`.
+"""
+import datetime
+import os
+from typing import Any, List
+
+import pystac
+import pytest
+from pystac.stac_io import DefaultStacIO
+
+from pystac_ml_aoi.catalog import iter_items_by_split
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Split
+
+
+class CountingStacIO(DefaultStacIO):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.reads: List[str] = []
+
+    def read_text(self, source: Any, *args: Any, **kwargs: Any) -> str:
+        self.reads.append(str(source))
+        return super().read_text(source, *args, **kwargs)
+
+
+def make_ml_aoi_catalog(root_dir: str, items_per_split: int = 3) -> pystac.Catalog:
+    """
+    Generates a STAC Catalog with one ML-AOI Collection per split, each containing the requested number of Items.
+    """
+    catalog = pystac.Catalog(id="ml-aoi-catalog", description="ML-AOI test catalog.")
+    bbox = [-3.15, 51.53, -3.14, 51.54]
+    extent = pystac.Extent(
+        spatial=pystac.SpatialExtent(bboxes=[bbox]),
+        temporal=pystac.TemporalExtent(intervals=[[datetime.datetime(2024, 1, 1), None]]),
+    )
+    for split in ML_AOI_Split:
+        collection = pystac.Collection(id=f"collection-{split.value}", description=split.value, extent=extent)
+        ML_AOI_Extension.ext(collection, add_if_missing=True).split = [split]
+        for index in range(items_per_split):
+            item = pystac.Item(
+                id=f"item-{split.value}-{index}",
+                geometry={
+                    "type": "Polygon",
+                    "coordinates": [[
+                        [bbox[0], bbox[1]], [bbox[2], bbox[1]], [bbox[2], bbox[3]],
+                        [bbox[0], bbox[3]], [bbox[0], bbox[1]],
+                    ]],
+                },
+                bbox=bbox,
+                datetime=datetime.datetime(2024, 1, 1),
+                properties={},
+            )
+            ML_AOI_Extension.ext(item, add_if_missing=True).split = split
+            collection.add_item(item)
+        catalog.add_child(collection)
+    catalog.normalize_hrefs(root_dir)
+    catalog.save(catalog_type=pystac.CatalogType.SELF_CONTAINED)
+    return catalog
+
+
+@pytest.fixture(scope="function", name="catalog")
+def make_catalog(tmp_path: Any) -> pystac.Catalog:
+    return make_ml_aoi_catalog(str(tmp_path))
+
+
+def test_iter_items_by_split(catalog: pystac.Catalog) -> None:
+    root_href = catalog.get_self_href()
+    stac_io = CountingStacIO()
+    items = list(iter_items_by_split(root_href, split=ML_AOI_Split.TRAIN, stac_io=stac_io))
+    assert [item.id for item in items] == [f"item-train-{index}" for index in range(3)]
+    assert all(ML_AOI_Extension.has_extension(item) for item in items)
+    # pruned collections must not have any of their items opened
+    assert not any("item-test" in href or "item-validate" in href for href in stac_io.reads)
+
+    items = list(iter_items_by_split(root_href, split=[ML_AOI_Split.TEST, "validate"]))
+    assert len(items) == 6
+    items = list(iter_items_by_split(root_href, split=None))
+    assert len(items) == 9
+
+
+def test_iter_items_by_split_child_link_pruning(catalog: pystac.Catalog) -> None:
+    for link in catalog.get_child_links():
+        link.extra_fields["ml-aoi:split"] = os.path.basename(os.path.dirname(link.href)).split("-")[-1]
+    catalog.save()
+    stac_io = CountingStacIO()
+    items = list(iter_items_by_split(catalog.get_self_href(), split=ML_AOI_Split.VALIDATE, stac_io=stac_io))
+    assert [item.id for item in items] == [f"item-validate-{index}" for index in range(3)]
+    assert not any("collection-train" in href or "collection-test" in href for href in stac_io.reads)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the change tracking utilities provided by :mod:`pystac_ml_aoi.changes`.
+"""
+import glob
+import json
+import os
+from typing import Any, Dict
+
+import pystac
+
+from pystac_ml_aoi.changes import ML_AOI_ChangeTracker, save_ml_aoi_changes
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Role, ML_AOI_Split
+from tests.test_catalog import make_ml_aoi_catalog
+
+
+def get_mtimes(root_dir: str) -> Dict[str, int]:
+    return {
+        path: os.stat(path).st_mtime_ns
+        for path in glob.glob(os.path.join(root_dir, "**", "*.json"), recursive=True)
+    }
+
+
+def get_modified(root_dir: str, mtimes: Dict[str, int]) -> Dict[str, bool]:
+    return {
+        os.path.relpath(path, root_dir): True
+        for path, mtime in get_mtimes(root_dir).items()
+        if mtimes.get(path) != mtime
+    }
+
+
+def test_ml_aoi_change_tracker(tmp_path: Any) -> None:
+    root_dir = str(tmp_path)
+    make_ml_aoi_catalog(root_dir)
+    catalog = pystac.Catalog.from_file(os.path.join(root_dir, "catalog.json"))
+    collection = catalog.get_child("collection-train")
+    items = list(collection.get_items())
+    for item in items:
+        item.add_asset("image", pystac.Asset("./image.tif", extra_fields={"ml-aoi:role": "label"}))
+    ML_AOI_Extension.ext(items[0]).split = ML_AOI_Split.TEST  # not tracked
+    mtimes = get_mtimes(root_dir)
+
+    with ML_AOI_ChangeTracker() as tracker:
+        assert tracker.active
+        ML_AOI_Extension.ext(items[1]).split = ML_AOI_Split.VALIDATE
+        ML_AOI_Extension.ext(items[2].assets["image"]).role = ML_AOI_Role.FEATURE
+        ML_AOI_Extension.apply_many([items[2]], {"split": "test"})
+    assert not tracker.active
+    ML_AOI_Extension.ext(items[1]).split = ML_AOI_Split.TRAIN  # not tracked, but saved along with tracked changes
+    assert tracker.modified == [items[1], items[2]]
+    assert items[0] not in tracker
+    assert tracker.get_changes(items[1]).fields and not tracker.get_changes(items[1]).assets
+    assert tracker.get_changes(items[2]).fields and tracker.get_changes(items[2]).assets == {"image"}
+
+    hrefs = save_ml_aoi_changes(tracker)
+    assert hrefs == [items[1].get_self_href(), items[2].get_self_href()]
+    assert len(tracker) == 0
+    assert get_modified(root_dir, mtimes) == {
+        os.path.join("collection-train", "item-train-1", "item-train-1.json"): True,
+        os.path.join("collection-train", "item-train-2", "item-train-2.json"): True,
+    }
+    with open(items[2].get_self_href(), mode="r", encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["properties"]["ml-aoi:split"] == "test"
+    assert data["assets"]["image"]["ml-aoi:role"] == "feature"
+    assert not any(link["rel"] == "self" for link in data["links"])
+
+
+def test_ml_aoi_change_tracker_moved(tmp_path: Any) -> None:
+    root_dir = str(tmp_path)
+    make_ml_aoi_catalog(root_dir)
+    catalog = pystac.Catalog.from_file(os.path.join(root_dir, "catalog.json"))
+    collection = catalog.get_child("collection-test")
+    item = next(collection.get_items())
+    for link in catalog.links:
+        if link.rel == pystac.RelType.CHILD:
+            link.extra_fields["ml-aoi:split"] = "test"
+    catalog.save()
+    mtimes = get_mtimes(root_dir)
+
+    with ML_AOI_ChangeTracker() as tracker:
+        new_href = os.path.join(root_dir, "moved", "item.json")
+        ML_AOI_Extension.ext(item).set_self_href(new_href)
+        ML_AOI_Extension.ext(collection).set_self_href(collection.get_self_href())  # unchanged
+        ML_AOI_Extension.summaries(collection).split = [ML_AOI_Split.VALIDATE]
+    assert tracker.get_changes(item).previous_href.endswith("item-test-0.json")
+    assert tracker.get_changes(collection).fields and tracker.get_changes(collection).previous_href is None
+
+    save_ml_aoi_changes(tracker)
+    assert get_modified(root_dir, mtimes) == {
+        "catalog.json": True,  # split of the child link
+        os.path.join("collection-test", "collection.json"): True,
+        os.path.join("moved", "item.json"): True,
+    }
+    with open(os.path.join(root_dir, "collection-test", "collection.json"), mode="r", encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["summaries"]["ml-aoi:split"] == ["validate"]
+    assert {"rel": "item", "href": "../moved/item.json", "type": "application/geo+json"} in data["links"]
+    with open(os.path.join(root_dir, "catalog.json"), mode="r", encoding="utf-8") as file:
+        data = json.load(file)
+    assert {
+        link["href"]: link.get("ml-aoi:split") for link in data["links"] if link["rel"] == "child"
+    } == {
+        "./collection-train/collection.json": "test",
+        "./collection-validate/collection.json": "test",
+        "./collection-test/collection.json": "validate",
+    }
+    item = pystac.Item.from_file(os.path.join(root_dir, "moved", "item.json"))
+    assert item.get_single_link("collection").href == "../collection-test/collection.json"
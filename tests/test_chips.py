@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the chip generation utilities provided by :mod:`pystac_ml_aoi.chips`.
+"""
+import numpy as np
+import pystac
+import pytest
+import shapely
+
+from pystac_ml_aoi.chips import ML_AOI_NumpyArrayReader, iter_ml_aoi_chip_arrays, iter_ml_aoi_chips
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling, ML_AOI_Role, ML_AOI_Split
+from tests.test_grid import make_asset, make_item
+
+REF_GRID = {"proj:shape": [100, 80], "proj:transform": [10, 0, 1000, 0, -10, 5000], "proj:epsg": 32618}
+
+
+def make_chip_item(**properties: object) -> pystac.Item:
+    return make_item("item", {
+        "ref": make_asset("ref", **{"ml-aoi:role": "feature", "ml-aoi:reference-grid": True, **REF_GRID}),
+        "label": make_asset("label", **{"ml-aoi:role": "label", **REF_GRID}),
+        # 20m pixels
+        "coarse": make_asset("coarse", **{
+            "ml-aoi:role": "feature",
+            "proj:shape": [50, 40], "proj:transform": [20, 0, 1000, 0, -20, 5000], "proj:epsg": 32618,
+        }),
+        "other-crs": make_asset("other-crs", **{"ml-aoi:role": "feature", **REF_GRID, "proj:epsg": 4326}),
+    }, **{"ml-aoi:split": "train", **properties})
+
+
+def test_iter_ml_aoi_chips() -> None:
+    item = make_chip_item()
+    chips = list(iter_ml_aoi_chips([item, make_item("no-ref", {})], size=32))
+    assert [chip.window[:2] for chip in chips] == [(col, row) for row in (0, 32, 64, 96) for col in (0, 32, 64)]
+    assert all(chip.split == ML_AOI_Split.TRAIN and chip.item_id == "item" for chip in chips)
+    assert chips[0].bounds == (1000, 4680, 1320, 5000) and chips[0].coverage == 1
+    assert chips[-1].coverage == pytest.approx(4 * 16 / 32 ** 2)
+    assert chips[0].mask is None
+
+    chip = chips[4]  # (32, 32)
+    assert list(chip.assets) == ["ref", "label", "coarse", "other-crs"]
+    assert chip.assets["ref"].window == (32, 32, 32, 32)
+    assert chip.assets["label"].role == ML_AOI_Role.LABEL
+    assert chip.assets["coarse"].window == (16, 16, 16, 16)
+    assert chip.assets["coarse"].resampling_method == ML_AOI_Resampling.NEAR
+    assert not chip.assets["other-crs"].aligned
+    assert chips[-1].assets["coarse"].read_window == (32, 48, 8, 2)
+
+    chips = list(iter_ml_aoi_chips([item], size=32, edges="shift"))
+    assert [chip.window[:2] for chip in chips] == [(col, row) for row in (0, 32, 64, 68) for col in (0, 32, 48)]
+    chips = list(iter_ml_aoi_chips([item], size=32, edges="drop"))
+    assert [chip.window[:2] for chip in chips] == [(col, row) for row in (0, 32, 64) for col in (0, 32)]
+    chips = list(iter_ml_aoi_chips([item], size=64, overlap=32, edges="drop"))
+    assert [chip.window[:2] for chip in chips] == [(0, 0), (0, 32)]
+    assert len(list(iter_ml_aoi_chips([item], size=64, stride=16, edges="drop"))) == 2 * 3
+
+    for kwargs in [{"size": 0}, {"stride": 0}, {"overlap": 256}, {"stride": 8, "overlap": 8}, {"edges": "wrap"}]:
+        with pytest.raises(ValueError):
+            next(iter_ml_aoi_chips([item], **kwargs))
+
+    item.assets["ref"].extra_fields["proj:transform"] = [0, 0, 1000, 0, -10, 5000]
+    for use_geometry in [True, False]:
+        with pytest.raises(ValueError, match="reference Asset 'ref' of Item 'item'"):
+            next(iter_ml_aoi_chips([item], size=32, use_geometry=use_geometry))
+
+
+def test_iter_ml_aoi_chips_geometry() -> None:
+    # triangle covering the top-left 30x30 pixels of the reference grid
+    geometry = shapely.Polygon([(1000, 5000), (1300, 5000), (1000, 4700)])
+    item = make_chip_item(**{"proj:geometry": shapely.geometry.mapping(geometry)})
+    chips = list(iter_ml_aoi_chips([item], size=16, masks=True))
+    assert [chip.window[:2] for chip in chips] == [(0, 0), (16, 0), (0, 16)]
+    assert chips[0].coverage == pytest.approx(1 - 0.5 * 2 ** 2 / 16 ** 2)
+    assert chips[0].mask.shape == (16, 16)
+    assert chips[0].mask[0].all() and not chips[0].mask[-1, -1]
+    assert not chips[1].mask[:, 14:].any()
+    assert [chip.window[:2] for chip in iter_ml_aoi_chips([item], size=16, min_coverage=0.5)] == [(0, 0)]
+    assert len(list(iter_ml_aoi_chips([item], size=16, use_geometry=False))) == 7 * 5
+
+    # geometry of the Item itself only applies to grids in geographic coordinates
+    item = make_chip_item()
+    item.geometry = shapely.geometry.mapping(geometry)
+    assert len(list(iter_ml_aoi_chips([item], size=16))) == 7 * 5
+    item.properties["proj:geometry"] = shapely.geometry.mapping(shapely.box(0, 0, 10, 10))
+    assert not list(iter_ml_aoi_chips([item], size=16))
+
+
+def test_iter_ml_aoi_chip_arrays() -> None:
+    item = make_chip_item()
+    ref = np.arange(3 * 100 * 80, dtype=np.float32).reshape((3, 100, 80))
+    label = np.random.default_rng(0).integers(0, 5, size=(100, 80))
+    coarse = np.arange(50 * 40).reshape((50, 40))
+    reader = ML_AOI_NumpyArrayReader({"item": {"ref": ref, "label": label, "coarse": coarse}})
+    results = list(iter_ml_aoi_chip_arrays([item], reader, size=32))
+    assert len(results) == 12
+    for result in results:
+        col, row, _, _ = result.chip.window
+        assert list(result.arrays) == ["ref", "label", "coarse"]
+        assert result.arrays["ref"].shape == (3, 32, 32)
+        assert result.arrays["ref"].dtype == np.float32
+        valid = ~np.ma.getmaskarray(result.arrays["label"])
+        np.testing.assert_array_equal(valid, result.chip.mask)
+        rows, cols = valid.sum(axis=0).max(), valid.sum(axis=1).max()
+        np.testing.assert_array_equal(
+            result.arrays["ref"].data[:, :rows, :cols], ref[:, row:row + rows, col:col + cols]
+        )
+        np.testing.assert_array_equal(result.arrays["label"].data[:rows, :cols], label[row:row + rows, col:col + cols])
+        upsampled = coarse.repeat(2, axis=0).repeat(2, axis=1)
+        np.testing.assert_array_equal(
+            result.arrays["coarse"].data[:rows, :cols], upsampled[row:row + rows, col:col + cols]
+        )
+        assert not np.ma.getmaskarray(result.arrays["coarse"])[:rows, :cols].any()
+    assert results[-1].chip.mask.sum() == 4 * 16
+
+    # masked source pixels and the Item geometry are both masked in chip arrays
+    item.properties["proj:geometry"] = shapely.geometry.mapping(shapely.box(1000, 4900, 1100, 5000))
+    masked_label = np.ma.masked_equal(label, 0)
+    reader = ML_AOI_NumpyArrayReader({"item": {"ref": ref, "label": masked_label, "coarse": coarse}})
+    (result,) = iter_ml_aoi_chip_arrays([item], reader, size=16)
+    assert result.chip.mask[:10, :10].all() and result.chip.mask.sum() == 100
+    np.testing.assert_array_equal(result.arrays["label"].mask[:10, :10], label[:10, :10] == 0)
+    assert result.arrays["label"].mask[10:].all() and result.arrays["ref"].mask[:, :, 10:].all()
+
+
+def test_iter_ml_aoi_chip_arrays_not_overlapping() -> None:
+    item = make_item("item", {
+        "ref": make_asset("ref", **{"ml-aoi:role": "feature", "ml-aoi:reference-grid": True, **REF_GRID}),
+        # bottom-right 20x20 pixels of the reference grid, not overlapping the first chips
+        "partial": make_asset("partial", **{
+            "ml-aoi:role": "feature",
+            "proj:shape": [20, 20], "proj:transform": [10, 0, 1600, 0, -10, 4200], "proj:epsg": 32618,
+        }),
+    }, **{"ml-aoi:split": "train"})
+    ref = np.zeros((3, 100, 80), dtype=np.float32)
+    partial = np.arange(2 * 20 * 20, dtype=np.int16).reshape((2, 20, 20))
+    reader = ML_AOI_NumpyArrayReader({"item": {"ref": ref, "partial": partial}})
+    results = list(iter_ml_aoi_chip_arrays([item], reader, size=32, use_geometry=False))
+    assert len(results) == 12
+    overlapping = [all(result.chip.assets["partial"].read_window[2:]) for result in results]
+    assert sum(overlapping) == 4 and not overlapping[0]
+    for result, overlaps in zip(results, overlapping):
+        assert result.arrays["partial"].shape == (2, 32, 32)
+        assert result.arrays["partial"].dtype == np.int16
+        assert np.ma.getmaskarray(result.arrays["partial"]).all() != overlaps
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the reference grid alignment utilities provided by :mod:`pystac_ml_aoi.grid`.
+"""
+import datetime
+from typing import Any, Dict
+
+import numpy as np
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling
+from pystac_ml_aoi.grid import (
+    ML_AOI_Grid,
+    find_ml_aoi_reference_asset,
+    get_ml_aoi_grid,
+    get_ml_aoi_grid_window,
+    plan_ml_aoi_alignment
+)
+
+
+def make_asset(key: str, **fields: Any) -> pystac.Asset:
+    return pystac.Asset(href=f"./{key}.tif", extra_fields=fields)
+
+
+def make_item(item_id: str, assets: Dict[str, pystac.Asset], **properties: Any) -> pystac.Item:
+    item = pystac.Item(item_id, geometry=None, bbox=None, datetime=datetime.datetime(2024, 1, 1), properties=properties)
+    for key, asset in assets.items():
+        item.add_asset(key, asset)
+    return item
+
+
+def test_get_ml_aoi_grid() -> None:
+    asset = make_asset("ref", **{"proj:shape": [100, 200], "proj:transform": [10, 0, 1000, 0, -10, 5000, 0, 0, 1]})
+    item = make_item("item", {"ref": asset}, **{"proj:epsg": 32618})
+    grid = get_ml_aoi_grid(asset)
+    assert grid == ML_AOI_Grid(shape=(100, 200), transform=(10, 0, 1000, 0, -10, 5000), epsg=32618)
+    assert grid.bounds == (1000, 4000, 3000, 5000)
+    assert get_ml_aoi_grid_window(grid, [1005, 4500, 1100, 4985]) == (0, 1, 10, 49)
+    assert get_ml_aoi_grid_window(grid, [-100, 0, 5000, 9000]) == (0, 0, 200, 100)
+    with pytest.raises(ValueError):
+        get_ml_aoi_grid_window(grid._replace(transform=(10, 0, 1000, 0, 0, 5000)), [1005, 4500, 1100, 4985])
+
+    # transform derived from the bbox, and 'proj:code' of the projection extension v2
+    asset = make_asset("other", **{"proj:shape": [100, 200], "proj:bbox": [1000, 4000, 3000, 5000]})
+    item.add_asset("other", asset)
+    item.properties = {"proj:code": "EPSG:32618"}
+    assert get_ml_aoi_grid(asset) == grid
+    assert get_ml_aoi_grid(make_asset("none", **{"proj:shape": [10, 10]}), item) is None
+    assert find_ml_aoi_reference_asset(item) is None
+
+
+def test_plan_ml_aoi_alignment() -> None:
+    ref = {"proj:shape": [64, 64], "proj:transform": [10, 0, 1000, 0, -10, 5000], "proj:epsg": 32618}
+    items = [
+        make_item("item-0", {
+            "label": make_asset("label", **{"ml-aoi:role": "label", **ref}),
+            "ref": make_asset("ref", **{"ml-aoi:role": "feature", "ml-aoi:reference-grid": True, **ref}),
+            # 20m pixels offset by half a reference pixel
+            "coarse": make_asset("coarse", **{
+                "ml-aoi:role": "feature",
+                "ml-aoi:resampling-method": "bilinear",
+                "proj:shape": [40, 40], "proj:transform": [20, 0, 905, 0, -20, 5095], "proj:epsg": 32618,
+            }),
+            # 5m pixels
+            "fine": make_asset("fine", **{
+                "ml-aoi:role": "feature",
+                "proj:shape": [128, 128], "proj:transform": [5, 0, 1000, 0, -5, 5000], "proj:epsg": 32618,
+            }),
+            "other-crs": make_asset("other-crs", **{
+                "ml-aoi:role": "feature", **ref, "proj:epsg": 4326,
+            }),
+            "unknown": make_asset("unknown", **{"ml-aoi:role": "feature", "ml-aoi:resampling-method": "average"}),
+        }),
+        make_item("no-ref", {"raster": make_asset("raster", **{"ml-aoi:role": "feature", **ref})}),
+    ]
+    plan = plan_ml_aoi_alignment(items, default_resampling="cubic")
+    assert plan.unplanned == ["no-ref"]
+    assert len(plan) == 4
+    assert plan.asset_keys == ["coarse", "fine", "other-crs", "unknown"]
+    assert plan.resampling_methods == [
+        ML_AOI_Resampling.BILINEAR, ML_AOI_Resampling.CUBIC, ML_AOI_Resampling.CUBIC, ML_AOI_Resampling.AVERAGE,
+    ]
+    assert plan.aligned.tolist() == [True, True, False, False]
+
+    coarse, fine, other_crs, unknown = plan
+    assert coarse.item_id == "item-0" and coarse.reference_key == "ref"
+    assert coarse.window == pytest.approx((4.75, 4.75, 32, 32))
+    assert coarse.read_window == (4, 4, 33, 33)
+    assert coarse.scale == (0.5, 0.5)
+    assert fine.window == (0, 0, 128, 128)
+    assert fine.read_window == (0, 0, 128, 128)
+    assert fine.scale == (2, 2)
+    assert np.isnan(other_crs.window).all() and other_crs.read_window == (0, 0, 0, 0)
+    assert not unknown.aligned and np.isnan(unknown.scale).all()
+
+    empty = plan_ml_aoi_alignment([items[1]])
+    assert len(empty) == 0 and empty.unplanned == ["no-ref"] and empty.windows.shape == (0, 4)
+
+
+def test_plan_ml_aoi_alignment_batch() -> None:
+    rng = np.random.default_rng(0)
+    items = []
+    resolutions = rng.choice([5, 10, 20, 60], 1000)
+    offsets = rng.uniform(0, 1e5, (1000, 2))
+    for index, (res, (x, y)) in enumerate(zip(resolutions, offsets)):
+        items.append(make_item(f"item-{index}", {
+            "ref": make_asset("ref", **{
+                "ml-aoi:reference-grid": True, "ml-aoi:role": "feature",
+                "proj:shape": [256, 256], "proj:transform": [10, 0, 1e5, 0, -10, 2e5], "proj:epsg": 3857,
+            }),
+            "feature": make_asset("feature", **{
+                "ml-aoi:role": "feature",
+                "proj:shape": [10000, 10000], "proj:transform": [res, 0, x, 0, -res, 2e5 + y], "proj:epsg": 3857,
+            }),
+        }))
+    plan = plan_ml_aoi_alignment(items)
+    assert plan.aligned.all()
+    for alignment, item in zip(plan, items):
+        grid = get_ml_aoi_grid(item.assets["feature"])
+        expected = get_ml_aoi_grid_window(grid, get_ml_aoi_grid(item.assets["ref"]).bounds)
+        assert alignment.read_window == expected
+        assert alignment.scale == (10 / grid.transform[0], 10 / grid.transform[0])
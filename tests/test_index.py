@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the ML-AOI index provided by :mod:`pystac_ml_aoi.index`.
+"""
+import datetime
+import gc
+import weakref
+from typing import cast
+
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import (
+    ML_AOI_Extension,
+    ML_AOI_ItemExtension,
+    ML_AOI_Resampling,
+    ML_AOI_Role,
+    ML_AOI_Split,
+    ml_aoi_trusted
+)
+from pystac_ml_aoi.index import drop_ml_aoi_index, get_ml_aoi_index
+
+
+@pytest.fixture(scope="function", name="collection")
+def make_indexed_collection() -> pystac.Collection:
+    extent = pystac.Extent(
+        spatial=pystac.SpatialExtent(bboxes=[[-180, -90, 180, 90]]),
+        temporal=pystac.TemporalExtent(intervals=[[datetime.datetime(2024, 1, 1), None]]),
+    )
+    collection = pystac.Collection(id="ml-aoi-index", description="ML-AOI index test.", extent=extent)
+    for index, split in enumerate([ML_AOI_Split.TRAIN, ML_AOI_Split.TRAIN, ML_AOI_Split.TEST]):
+        item = pystac.Item(
+            f"item-{index}", geometry=None, bbox=None, datetime=datetime.datetime(2024, 1, 1), properties={}
+        )
+        item.add_asset("label", pystac.Asset(href=f"label-{index}.geojson", extra_fields={"ml-aoi:role": "label"}))
+        item.add_asset("raster", pystac.Asset(href=f"raster-{index}.tif", roles=["data"], extra_fields={
+            "ml-aoi:role": ML_AOI_Role.FEATURE,
+            "ml-aoi:reference-grid": True,
+            "ml-aoi:resampling-method": "near",
+        }))
+        ML_AOI_Extension.ext(item, add_if_missing=True).split = split
+        collection.add_item(item)
+    return collection
+
+
+def test_ml_aoi_index_queries(collection: pystac.Collection) -> None:
+    index = get_ml_aoi_index(collection)
+    assert get_ml_aoi_index(collection) is index
+    assert len(index) == 3
+    assert sorted(index.get_item_ids(ML_AOI_Split.TRAIN)) == ["item-0", "item-1"]
+    assert index.get_item_ids("test") == ["item-2"]
+    assert index.get_item_ids(ML_AOI_Split.VALIDATE) == []
+    assert index.get_asset_keys("item-0") == ["label", "raster"]
+    assert index.get_asset_keys("item-0", role=ML_AOI_Role.LABEL) == ["label"]
+    assert index.get_asset_keys("item-0", role=["label", "feature"]) == ["label", "raster"]
+    assert index.get_asset_keys("item-0", role="feature", reference_grid=True) == ["raster"]
+    assert index.get_asset_keys("item-0", role="label", reference_grid=True) == []
+    assert index.get_assets_keys(reference_grid=True) == {f"item-{idx}": ["raster"] for idx in range(3)}
+    with pytest.raises(ValueError):
+        index.get_assets_keys()
+
+
+def test_ml_aoi_index_incremental_updates(collection: pystac.Collection) -> None:
+    index = get_ml_aoi_index(collection)
+    item = collection.get_item("item-1")
+    ML_AOI_Extension.ext(item).split = ML_AOI_Split.VALIDATE
+    assert index.get_item_ids(ML_AOI_Split.TRAIN) == ["item-0"]
+    assert index.get_item_ids(ML_AOI_Split.VALIDATE) == ["item-1"]
+
+    ML_AOI_Extension.ext(item.assets["raster"]).resampling_method = ML_AOI_Resampling.CUBIC
+    assert index.get_asset_keys("item-1", resampling_method="near") == []
+    assert index.get_asset_keys("item-1", resampling_method="cubic") == ["raster"]
+    assert index.get_assets_keys(resampling_method="near") == {"item-0": ["raster"], "item-2": ["raster"]}
+
+    with ml_aoi_trusted():
+        ML_AOI_Extension.ext(item).apply(split=ML_AOI_Split.TEST)
+    assert sorted(index.get_item_ids(ML_AOI_Split.TEST)) == ["item-1", "item-2"]
+
+    ML_AOI_Extension.apply_many([item], {"split": ML_AOI_Split.TRAIN})
+    assert sorted(index.get_item_ids(ML_AOI_Split.TRAIN)) == ["item-0", "item-1"]
+
+    index.remove_item("item-0")
+    assert "item-0" not in index
+    assert index.get_item_ids(ML_AOI_Split.TRAIN) == ["item-1"]
+    assert "item-0" not in index.get_assets_keys(role=ML_AOI_Role.LABEL)
+
+
+def test_ml_aoi_index_get_assets(collection: pystac.Collection) -> None:
+    item = collection.get_item("item-0")
+    ml_aoi_item = cast(ML_AOI_ItemExtension, ML_AOI_Extension.ext(item))
+    expected = {
+        "all": ml_aoi_item.get_assets(),
+        "label": ml_aoi_item.get_assets(role=ML_AOI_Role.LABEL),
+        "grid": ml_aoi_item.get_assets(reference_grid=True),
+        "data": ml_aoi_item.get_assets(role=ML_AOI_Role.FEATURE, asset_role="data"),
+    }
+    get_ml_aoi_index(collection)
+    results = {
+        "all": ml_aoi_item.get_assets(),
+        "label": ml_aoi_item.get_assets(role=ML_AOI_Role.LABEL),
+        "grid": ml_aoi_item.get_assets(reference_grid=True),
+        "data": ml_aoi_item.get_assets(role=ML_AOI_Role.FEATURE, asset_role="data"),
+    }
+    for name, assets in expected.items():
+        assert list(results[name]) == list(assets), name
+        assert all(results[name][key].href == asset.href for key, asset in assets.items()), name
+    drop_ml_aoi_index(collection)
+    assert get_ml_aoi_index(collection, create=False) is None
+
+
+def test_ml_aoi_index_get_assets_stale(collection: pystac.Collection) -> None:
+    index = get_ml_aoi_index(collection)
+    items = {item.id: item for item in collection.get_items()}
+
+    # Assets modified directly on the Item, without reporting them to the index
+    item = items["item-0"]
+    item.add_asset("other", pystac.Asset(href="other.tif", extra_fields={"ml-aoi:role": "label"}))
+    assert list(ML_AOI_Extension.ext(item).get_assets(role=ML_AOI_Role.LABEL)) == ["label", "other"]
+    del item.assets["label"]
+    assert list(ML_AOI_Extension.ext(item).get_assets(role=ML_AOI_Role.LABEL)) == ["other"]
+
+    item = items["item-1"]
+    index.remove_item(item.id)
+    assert list(ML_AOI_Extension.ext(item).get_assets()) == ["label", "raster"]
+    assert list(ML_AOI_Extension.ext(item).get_assets(role=ML_AOI_Role.LABEL)) == ["label"]
+
+
+def test_ml_aoi_index_released() -> None:
+    extent = pystac.Extent(
+        spatial=pystac.SpatialExtent(bboxes=[[-180, -90, 180, 90]]),
+        temporal=pystac.TemporalExtent(intervals=[[datetime.datetime(2024, 1, 1), None]]),
+    )
+    collection = pystac.Collection(id="ml-aoi-index", description="ML-AOI index test.", extent=extent)
+    item = pystac.Item("item", None, None, datetime.datetime(2024, 1, 1), {"ml-aoi:split": "train"})
+    collection.add_item(item)
+    index = get_ml_aoi_index(collection)
+    assert index.collection is collection and "item" in index
+    collection_ref, item_ref = weakref.ref(collection), weakref.ref(item)
+    del collection, item
+    gc.collect()
+    assert collection_ref() is None and item_ref() is None  # the attached index does not keep them alive
+    assert index.collection is None
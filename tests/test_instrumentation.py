@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the instrumentation of ML-AOI extension methods provided by :mod:`pystac_ml_aoi.instrumentation`.
+"""
+import datetime
+from typing import List, Tuple
+
+import pystac
+
+from pystac_ml_aoi.extensions.ml_aoi import (
+    ML_AOI_Extension,
+    ML_AOI_ItemExtension,
+    ML_AOI_PropertiesExtension,
+    ML_AOI_Role,
+    ML_AOI_Split
+)
+from pystac_ml_aoi.instrumentation import (
+    ML_AOI_INSTRUMENTED_METHODS,
+    disable_ml_aoi_instrumentation,
+    enable_ml_aoi_instrumentation,
+    get_ml_aoi_instrumentation_snapshot,
+    is_ml_aoi_instrumentation_enabled,
+    ml_aoi_instrumented,
+    reset_ml_aoi_instrumentation
+)
+
+
+def make_item() -> pystac.Item:
+    item = pystac.Item("item", geometry=None, bbox=None, datetime=datetime.datetime(2024, 1, 1), properties={})
+    item.add_asset("label", pystac.Asset(href="label.geojson", extra_fields={"ml-aoi:role": "label"}))
+    return item
+
+
+def test_ml_aoi_instrumentation_counters() -> None:
+    original_ext = vars(ML_AOI_Extension)["ext"]
+    original_set = vars(ML_AOI_PropertiesExtension)["set_ml_aoi_property"]
+    calls: List[Tuple[str, float]] = []
+    try:
+        reset_ml_aoi_instrumentation()
+        enable_ml_aoi_instrumentation(callback=lambda name, duration: calls.append((name, duration)))
+        assert is_ml_aoi_instrumentation_enabled()
+        item = make_item()
+        ext = ML_AOI_Extension.ext(item, add_if_missing=True)
+        ext.split = ML_AOI_Split.TRAIN
+        ext.apply(split=ML_AOI_Split.TEST)
+        assert list(ext.get_assets(role=ML_AOI_Role.LABEL)) == ["label"]
+        assert ML_AOI_Extension.ext(item) is ext
+    finally:
+        disable_ml_aoi_instrumentation()
+
+    assert not is_ml_aoi_instrumentation_enabled()
+    assert vars(ML_AOI_Extension)["ext"] is original_ext
+    assert vars(ML_AOI_PropertiesExtension)["set_ml_aoi_property"] is original_set
+    assert ML_AOI_ItemExtension.get_assets.__name__ == "get_assets"
+    assert not hasattr(ML_AOI_ItemExtension.get_assets, "__wrapped__")
+
+    snapshot = get_ml_aoi_instrumentation_snapshot()
+    assert set(snapshot) == set(ML_AOI_INSTRUMENTED_METHODS)
+    assert snapshot["ext"].calls == 2
+    assert snapshot["set_ml_aoi_property"].calls >= 1  # also employed by 'apply' property setters
+    assert snapshot["apply"].calls == 1
+    assert snapshot["get_assets"].calls == 1
+    assert snapshot["_validate_ml_aoi_property"].calls >= 1
+    assert all(stats.total_time >= 0 for stats in snapshot.values())
+    assert len(calls) == sum(stats.calls for stats in snapshot.values())
+
+    # disabled instrumentation does not accumulate anything
+    ML_AOI_Extension.ext(make_item(), add_if_missing=True).split = ML_AOI_Split.TRAIN
+    assert get_ml_aoi_instrumentation_snapshot() == snapshot
+    reset_ml_aoi_instrumentation()
+    assert all(stats.calls == 0 and stats.total_time == 0 for stats in get_ml_aoi_instrumentation_snapshot().values())
+
+
+def test_ml_aoi_instrumented_scope() -> None:
+    with ml_aoi_instrumented() as snapshot:
+        assert is_ml_aoi_instrumentation_enabled()
+        ML_AOI_Extension.ext(make_item(), add_if_missing=True).split = ML_AOI_Split.VALIDATE
+        assert not snapshot
+    assert not is_ml_aoi_instrumentation_enabled()
+    assert snapshot["ext"].calls == 1
+    assert snapshot["set_ml_aoi_property"].calls == 1
+    assert snapshot["get_assets"].calls == 0
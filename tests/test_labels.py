@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the label join utilities provided by :mod:`pystac_ml_aoi.labels`.
+"""
+import datetime
+import json
+import os
+from typing import Any, Dict, List
+
+import pystac
+import pytest
+from pystac.extensions.label import LabelExtension
+from pystac.stac_io import DefaultStacIO
+
+from pystac_ml_aoi.changes import ML_AOI_ChangeTracker
+from pystac_ml_aoi.labels import index_ml_aoi_label_items, join_ml_aoi_label_items
+
+LABEL_PROPERTIES = {
+    "label:properties": ["class"],
+    "label:classes": [{"name": "class", "classes": ["building", "field"]}],
+    "label:description": "Buildings and fields.",
+    "label:type": "vector",
+}
+
+
+class LoggingStacIO(DefaultStacIO):
+    """
+    Logs read and written locations to a file, such that operations of worker processes are also logged.
+    """
+
+    def __init__(self, log_path: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.log_path = log_path
+
+    def _log(self, operation: str, href: Any) -> None:
+        with open(self.log_path, mode="a", encoding="utf-8") as file:
+            file.write(f"{operation} {href}\n")
+
+    def read_text(self, source: Any, *args: Any, **kwargs: Any) -> str:
+        self._log("read", source)
+        return super().read_text(source, *args, **kwargs)
+
+    def write_text(self, dest: Any, txt: str, *args: Any, **kwargs: Any) -> None:
+        self._log("write", dest)
+        super().write_text(dest, txt, *args, **kwargs)
+
+
+def make_label_link(href: str) -> pystac.Link:
+    return pystac.Link(rel="derived_from", target=href, media_type=pystac.MediaType.JSON, extra_fields={
+        "ml-aoi:role": "label",
+    })
+
+
+def make_label_items(root_dir: str) -> Dict[str, Any]:
+    """
+    Generates one label Item, and ML-AOI Items linking to it with various issues, saved under the directory.
+    """
+    date = datetime.datetime(2024, 1, 1)
+    label = pystac.Item("label", None, None, date, dict(LABEL_PROPERTIES), stac_extensions=[
+        LabelExtension.get_schema_uri()
+    ])
+    label.set_self_href(os.path.join(root_dir, "labels", "label.json"))
+    label.save_object(include_self_link=False)
+    label_href = label.get_self_href()
+    items: List[pystac.Item] = []
+    for index, (links, properties) in enumerate([
+        ([label_href], {}),  # copied
+        ([], {}),  # missing
+        ([label_href, os.path.join(root_dir, "labels", "other.json")], {}),  # duplicate
+        ([os.path.join(root_dir, "labels", "other.json")], {}),  # unresolved
+        ([label_href, label_href], {"label:type": "raster", "label:tasks": ["segmentation"]}),  # updated
+        (["../labels/label.json"], dict(LABEL_PROPERTIES)),  # already joined, by relative link
+    ]):
+        item = pystac.Item(f"item-{index}", None, None, date, {"ml-aoi:split": "train", **properties})
+        item.set_self_href(os.path.join(root_dir, "items", f"item-{index}.json"))
+        for href in links:
+            item.add_link(make_label_link(href))
+        if properties == LABEL_PROPERTIES:
+            item.stac_extensions.append(LabelExtension.get_schema_uri())
+        item.save_object(include_self_link=False)
+        items.append(item)
+    return {"label": label, "items": items}
+
+
+def test_join_ml_aoi_label_items(tmp_path: Any) -> None:
+    data = make_label_items(str(tmp_path))
+    items = data["items"]
+    result = join_ml_aoi_label_items(items, [data["label"]], verify=True)
+    assert result.joined == 3
+    assert result.updated == []
+    assert result.mismatches == {
+        "item-0": ["label:classes", "label:description", "label:properties", "label:type", "stac_extensions"],
+        "item-4": [
+            "label:classes", "label:description", "label:properties", "label:tasks", "label:type", "stac_extensions"
+        ],
+    }
+    assert result.missing == ["item-1"]
+    assert list(result.duplicates) == ["item-2"] and len(result.duplicates["item-2"]) == 2
+    assert result.unresolved == {"item-3": items[3].links[-1].get_absolute_href()}
+    assert not result.valid
+    assert items[0].properties == {"ml-aoi:split": "train", "datetime": items[0].properties["datetime"]}
+
+    with ML_AOI_ChangeTracker() as tracker:
+        result = join_ml_aoi_label_items(items, [data["label"]])
+    assert result.joined == 3
+    assert result.updated == ["item-0", "item-4"]
+    assert tracker.modified == [items[0], items[4]]
+    assert not result.mismatches
+    for item in (items[0], items[4]):
+        assert {key: value for key, value in item.properties.items() if key.startswith("label:")} == LABEL_PROPERTIES
+        assert LabelExtension.get_schema_uri() in item.stac_extensions
+        assert item.properties["ml-aoi:split"] == "train"
+
+    # label Items matched by the ID of resolved links
+    item = pystac.Item("resolved", None, None, datetime.datetime(2024, 1, 1), {})
+    item.add_link(pystac.Link("derived_from", target=data["label"], extra_fields={"ml-aoi:role": "label"}))
+    index = index_ml_aoi_label_items([data["label"].get_self_href()])
+    assert len(index) == 1
+    result = join_ml_aoi_label_items([item], index)
+    assert result.updated == ["resolved"]
+    assert item.properties["label:type"] == "vector"
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_join_ml_aoi_label_hrefs(tmp_path: Any, processes: int) -> None:
+    data = make_label_items(str(tmp_path))
+    hrefs = [item.get_self_href() for item in data["items"]]
+    mtimes = [os.stat(href).st_mtime_ns for href in hrefs]
+    label_hrefs = [data["label"].get_self_href()]
+
+    result = join_ml_aoi_label_items(hrefs, label_hrefs, verify=True, processes=processes, chunk_size=2)
+    assert result.joined == 3 and list(result.mismatches) == ["item-0", "item-4"]
+    assert [os.stat(href).st_mtime_ns for href in hrefs] == mtimes
+
+    result = join_ml_aoi_label_items(hrefs, label_hrefs, processes=processes, chunk_size=2)
+    assert result.joined == 3 and result.updated == ["item-0", "item-4"]
+    assert result.missing == ["item-1"]
+    assert list(result.duplicates) == ["item-2"] and list(result.unresolved) == ["item-3"]
+    modified = [os.stat(href).st_mtime_ns != mtime for href, mtime in zip(hrefs, mtimes)]
+    assert modified == [True, False, False, False, True, False]
+    with open(hrefs[4], mode="r", encoding="utf-8") as file:
+        item = json.load(file)
+    assert {key: value for key, value in item["properties"].items() if key.startswith("label:")} == LABEL_PROPERTIES
+    assert LabelExtension.get_schema_uri() in item["stac_extensions"]
+
+    result = join_ml_aoi_label_items(hrefs, label_hrefs, verify=True, processes=processes)
+    assert result.joined == 3 and not result.mismatches
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_join_ml_aoi_label_hrefs_stac_io(tmp_path: Any, processes: int) -> None:
+    data = make_label_items(str(tmp_path / "data"))
+    hrefs = [item.get_self_href() for item in data["items"]]
+    label_href = data["label"].get_self_href()
+    log_path = str(tmp_path / "stac_io.log")
+    stac_io = LoggingStacIO(log_path)
+
+    result = join_ml_aoi_label_items(hrefs, [label_href], processes=processes, chunk_size=2, stac_io=stac_io)
+    assert result.updated == ["item-0", "item-4"]
+    with open(log_path, mode="r", encoding="utf-8") as file:
+        operations = sorted(line.split(" ", 1) for line in file.read().splitlines())
+    assert operations == sorted(
+        [["read", label_href]] + [["read", href] for href in hrefs] + [["write", hrefs[0]], ["write", hrefs[4]]]
+    )
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the concurrent loading of ML-AOI Items provided by :mod:`pystac_ml_aoi.loader`.
+"""
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_ItemExtension, ML_AOI_Split
+from pystac_ml_aoi.loader import ML_AOI_AsyncStacIO, _ML_AOI_LinkResolver, aiter_ml_aoi_items, load_ml_aoi_items
+from pystac_ml_aoi.stac_io import ML_AOI_CachedStacIO
+from tests.conftest import HTTPStandIn
+
+
+class DelayedStacIO(pystac.stac_io.DefaultStacIO):
+    """
+    Reads documents with a delay while tracking the number of concurrent reads.
+    """
+
+    def __init__(self, stac_io: pystac.StacIO, delay: float) -> None:
+        super().__init__()
+        self.stac_io = stac_io
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def read_text(self, source, *args, **kwargs) -> str:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return self.stac_io.read_text(source, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def make_item(item_id: str) -> pystac.Item:
+    return pystac.Item(item_id, geometry=None, bbox=None, datetime=datetime.datetime(2024, 1, 1), properties={})
+
+
+def write_ml_aoi_items(root: str, count: int) -> None:
+    """
+    Writes ML-AOI Items linking to one shared label Item and two feature Items, one of which is shared.
+    """
+    for item_id in ["label", "feature-shared", *[f"feature-{index}" for index in range(count)]]:
+        with open(os.path.join(root, f"{item_id}.json"), mode="w", encoding="utf-8") as file:
+            json.dump(make_item(item_id).to_dict(include_self_link=False), file)
+    for index in range(count):
+        item = make_item(f"ml-aoi-{index}")
+        ML_AOI_Extension.ext(item, add_if_missing=True).split = ML_AOI_Split.TRAIN
+        item.add_link(pystac.Link("derived_from", "./label.json", extra_fields={"ml-aoi:role": "label"}))
+        for feature in ["feature-shared", f"feature-{index}"]:
+            item.add_link(pystac.Link("derived_from", f"./{feature}.json", extra_fields={"ml-aoi:role": "feature"}))
+        item.add_link(pystac.Link("related", "./unrelated.json"))
+        with open(os.path.join(root, f"ml-aoi-{index}.json"), mode="w", encoding="utf-8") as file:
+            json.dump(item.to_dict(include_self_link=False), file)
+
+
+def test_load_ml_aoi_items(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    write_ml_aoi_items(http_stand_in.root, 20)
+    hrefs = [f"{http_stand_in.url}/ml-aoi-{index}.json" for index in range(20)]
+    stac_io = DelayedStacIO(ML_AOI_CachedStacIO(cache_dir=str(tmp_path / "cache")), delay=0.02)
+
+    started = time.perf_counter()
+    loaded = load_ml_aoi_items(hrefs, stac_io=stac_io, concurrency=4)
+    duration = time.perf_counter() - started
+    assert [result.item.item.id for result in loaded] == [f"ml-aoi-{index}" for index in range(20)]
+    assert all(isinstance(result.item, ML_AOI_ItemExtension) for result in loaded)
+    assert all(result.item.split == ML_AOI_Split.TRAIN for result in loaded)
+    assert all(result.label.id == "label" for result in loaded)
+    assert all(result.label is loaded[0].label for result in loaded)
+    assert [[feature.id for feature in result.features] for result in loaded] == [
+        ["feature-shared", f"feature-{index}"] for index in range(20)
+    ]
+
+    # links are resolved, each document is read once, and reads are concurrent within the limit
+    item = loaded[3].item.item
+    assert all(link.is_resolved() for link in item.links if "ml-aoi:role" in link.extra_fields)
+    assert item.get_single_link("derived_from").target is loaded[3].label
+    assert not item.get_single_link("related").is_resolved()
+    paths = Counter(path for path, _, _ in http_stand_in.requests)
+    assert len(paths) == 20 + 20 + 2 and set(paths.values()) == {1}
+    assert 1 < stac_io.max_active <= 4
+    assert duration < len(paths) * stac_io.delay
+
+    loaded = load_ml_aoi_items([hrefs[0]], stac_io=stac_io, resolve_links=False)
+    assert loaded[0].label is None and not loaded[0].features
+    with pytest.raises(ValueError):
+        load_ml_aoi_items(hrefs, concurrency=0)
+
+
+def test_aiter_ml_aoi_items_async_stac_io(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    write_ml_aoi_items(http_stand_in.root, 3)
+    items = [pystac.Item.from_file(f"{http_stand_in.url}/ml-aoi-{index}.json") for index in range(3)]
+    items[0].get_links("derived_from")[0].target = make_item("preloaded")
+
+    async def load():
+        async with ML_AOI_AsyncStacIO(ML_AOI_CachedStacIO(cache_dir=str(tmp_path / "cache"))) as stac_io:
+            return [loaded async for loaded in aiter_ml_aoi_items(items, stac_io=stac_io, concurrency=2)]
+
+    loaded = asyncio.run(load())
+    assert [result.item.item for result in loaded] == items
+    assert [result.label.id for result in loaded] == ["preloaded", "label", "label"]
+
+
+def test_ml_aoi_link_resolver_releases_items(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    write_ml_aoi_items(http_stand_in.root, 4)
+    hrefs = [f"{http_stand_in.url}/ml-aoi-{index}.json" for index in range(4)]
+
+    async def load():
+        async with ML_AOI_AsyncStacIO(ML_AOI_CachedStacIO(cache_dir=str(tmp_path / "cache"))) as stac_io:
+            resolver = _ML_AOI_LinkResolver(stac_io, concurrency=2)
+            shared = await asyncio.gather(*[resolver.load(href, resolve_links=True) for href in hrefs[:2]])
+            assert not resolver.pending and not resolver.references
+            sequential = [await resolver.load(href, resolve_links=True) for href in hrefs[2:]]
+            assert not resolver.pending and not resolver.references
+            return shared, sequential
+
+    shared, sequential = asyncio.run(load())
+    # the label Item is shared between concurrent loads, but not retained once they are completed
+    assert shared[0].label is shared[1].label
+    assert sequential[0].label is not sequential[1].label
+    assert sequential[0].label.id == sequential[1].label.id == "label"
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the ML-AOI training manifests provided by :mod:`pystac_ml_aoi.manifest`.
+"""
+import os
+
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Split
+from pystac_ml_aoi.manifest import get_ml_aoi_manifest_record, read_ml_aoi_manifest, write_ml_aoi_manifest
+from tests.synthetic import make_synthetic_items
+from tests.test_catalog import make_ml_aoi_catalog
+
+
+def test_ml_aoi_manifest_record() -> None:
+    item = make_synthetic_items(1, assets=3, roles={"label": 0, "feature": 1}, resampling={"near": 1})[0]
+    item.assets["asset-1"].extra_fields["ml-aoi:role"] = "label"
+    item.assets["asset-2"].extra_fields["ml-aoi:role"] = ["feature", "label"]
+    item.add_asset("thumbnail", pystac.Asset(href="./thumbnail.png"))
+    item.set_self_href("https://example.com/items/item-0.json")
+    record = get_ml_aoi_manifest_record(item)
+    assert record == {
+        "item_id": "item-0",
+        "item_href": "https://example.com/items/item-0.json",
+        "split": item.properties["ml-aoi:split"],
+        "bbox_minx": item.bbox[0],
+        "bbox_miny": item.bbox[1],
+        "bbox_maxx": item.bbox[2],
+        "bbox_maxy": item.bbox[3],
+        "label_href": "https://example.com/items/data/item-0/asset-1.tif",
+        "features": [
+            {
+                "key": f"asset-{index}",
+                "href": f"https://example.com/items/data/item-0/asset-{index}.tif",
+                "role": ["feature"] if index == 0 else ["feature", "label"],
+                "reference_grid": True if index == 0 else None,
+                "resampling_method": "near",
+            }
+            for index in [0, 2]
+        ],
+    }
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_ml_aoi_manifest_round_trip(file_format: str, tmp_path) -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    items = make_synthetic_items(1000, seed=3)
+    next(iter(items[42].assets.values())).extra_fields["ml-aoi:role"] = ["feature", "label"]
+    path = str(tmp_path / "manifest")
+    write_ml_aoi_manifest(items, path, file_format=file_format, batch_size=128)
+    assert sorted(os.listdir(path)) == ["split=test", "split=train", "split=validate"]
+
+    allocated = pyarrow.total_allocated_bytes()
+    table = read_ml_aoi_manifest(path, file_format=file_format)
+    assert table.num_rows == 1000
+    if file_format == "arrow":  # memory-mapped columns are not copied, only the partition column is allocated
+        assert pyarrow.total_allocated_bytes() - allocated < table.nbytes / 2
+    assert sorted(table.column("item_id").to_pylist()) == sorted(item.id for item in items)
+
+    train = read_ml_aoi_manifest(path, split=ML_AOI_Split.TRAIN, columns=["item_id", "split"], file_format=file_format)
+    assert train.column_names == ["item_id", "split"]
+    assert set(train.column("split").to_pylist()) == {"train"}
+    assert train.num_rows == sum(item.properties["ml-aoi:split"] == "train" for item in items)
+
+    bbox = [0, 0, 90, 45]
+    found = read_ml_aoi_manifest(path, split=["test", "validate"], bbox=bbox, file_format=file_format)
+    expected = {
+        item.id for item in items
+        if item.properties["ml-aoi:split"] != "train"
+        and item.bbox[2] >= bbox[0] and item.bbox[0] <= bbox[2] and item.bbox[3] >= bbox[1] and item.bbox[1] <= bbox[3]
+    }
+    assert expected and set(found.column("item_id").to_pylist()) == expected
+
+    filtered = read_ml_aoi_manifest(path, filter=pyarrow.dataset.field("item_id") == "item-42", file_format=file_format)
+    assert filtered.to_pylist() == [get_ml_aoi_manifest_record(items[42])]
+
+
+def test_ml_aoi_manifest_from_catalog(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    catalog = make_ml_aoi_catalog(str(tmp_path / "catalog"), items_per_split=2)
+    path = str(tmp_path / "manifest")
+    write_ml_aoi_manifest(catalog.get_self_href(), path)
+    table = read_ml_aoi_manifest(path, split="validate")
+    assert sorted(table.column("item_id").to_pylist()) == ["item-validate-0", "item-validate-1"]
+    assert all(href.endswith(".json") for href in table.column("item_href").to_pylist())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the NDJSON streaming utilities provided by :mod:`pystac_ml_aoi.ndjson`.
+"""
+import io
+import json
+from typing import Any, List
+
+import pydantic
+import pystac
+import pytest
+
+from pystac_ml_aoi import ndjson
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling, ML_AOI_Role, ML_AOI_Split
+from pystac_ml_aoi.ndjson import get_ml_aoi_ndjson_dict, iter_ml_aoi_ndjson, write_ml_aoi_ndjson
+from pystac_ml_aoi.validation import validate_ml_aoi_document
+from tests.synthetic import make_synthetic_items
+
+
+@pytest.fixture(name="json_module", params=["orjson", "json"])
+def fixture_json_module(request: Any, monkeypatch: Any) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(ndjson, "orjson", None)
+    return request.param
+
+
+def make_ndjson_items() -> List[pystac.Item]:
+    items = make_synthetic_items(100, assets=3, seed=5)
+    # values that are not yet normalized
+    items[0].properties["ml-aoi:split"] = ML_AOI_Split.TEST
+    items[0].properties["ml-aoi:other"] = "kept"
+    items[0].assets["asset-1"].extra_fields.update({
+        "ml-aoi:role": ML_AOI_Role.LABEL,
+        "ml-aoi:reference-grid": None,
+        "ml-aoi:resampling-method": ML_AOI_Resampling.CUBIC,
+    })
+    items[0].add_link(pystac.Link("derived_from", "https://example.com/label.json", extra_fields={
+        "ml-aoi:role": ML_AOI_Role.LABEL,
+    }))
+    items[1].add_link(pystac.Link("collection", "https://example.com/collection.json", extra_fields={
+        "ml-aoi:split": "train",  # not an ML-AOI field of links, but matched by the raw pre-filter
+    }))
+    items[1].properties["ml-aoi:split"] = "validate"
+    return items
+
+
+def test_ml_aoi_ndjson_round_trip(json_module: str, tmp_path: Any) -> None:
+    items = make_ndjson_items()
+    items[0].set_self_href("https://example.com/items/item-0.json")
+    path = str(tmp_path / "items.ndjson")
+    assert write_ml_aoi_ndjson(iter(items), path) == len(items)
+    assert "ml-aoi:reference-grid" in items[0].assets["asset-1"].extra_fields  # Items are left unchanged
+
+    with open(path, mode="r", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert len(lines) == len(items)
+    for line in lines:
+        data = json.loads(line)
+        assert validate_ml_aoi_document(data, data["id"]).errors == []
+    data = json.loads(lines[0])
+    assert data["properties"]["ml-aoi:split"] == "test"
+    assert data["properties"]["ml-aoi:other"] == "kept"
+    assert data["assets"]["asset-1"]["ml-aoi:role"] == "label"
+    assert data["assets"]["asset-1"]["ml-aoi:resampling-method"] == "cubic"
+    assert "ml-aoi:reference-grid" not in data["assets"]["asset-1"]
+    assert [link["href"] for link in data["links"] if link["rel"] == "self"] == [
+        "https://example.com/items/item-0.json"
+    ]
+
+    results = iter_ml_aoi_ndjson(path)
+    assert not isinstance(results, list)
+    results = list(results)
+    assert [item.id for item in results] == [item.id for item in items]
+    assert results[0].get_self_href() == "https://example.com/items/item-0.json"
+    assert results[0].assets["asset-1"].extra_fields["ml-aoi:role"] == "label"
+    for result, item in zip(results, items):
+        assert result.properties["ml-aoi:split"] == item.properties["ml-aoi:split"]
+        assert validate_ml_aoi_document(result.to_dict(transform_hrefs=False)).valid
+
+
+def test_ml_aoi_ndjson_split_filter(json_module: str, monkeypatch: Any) -> None:
+    items = make_ndjson_items()
+    buffer = io.BytesIO()
+    write_ml_aoi_ndjson(items, buffer, include_self_link=False)
+
+    parsed = []
+    loads = ndjson._loads
+    monkeypatch.setattr(ndjson, "_loads", lambda line: parsed.append(line) or loads(line))
+    buffer.seek(0)
+    results = list(iter_ml_aoi_ndjson(buffer, split=ML_AOI_Split.TRAIN))
+    expected = [item.id for item in items if item.properties["ml-aoi:split"] == "train"]
+    assert [item.id for item in results] == expected
+    assert len(parsed) == len(expected) + 1  # link split of 'item-1' matched before parsing
+
+    buffer.seek(0)
+    results = list(iter_ml_aoi_ndjson(buffer, split=["validate", "test"]))
+    assert {item.properties["ml-aoi:split"] for item in results} == {"validate", "test"}
+    assert len(results) == len(items) - len(expected)
+
+
+def test_ml_aoi_ndjson_invalid() -> None:
+    item = make_synthetic_items(1)[0]
+    item.properties["ml-aoi:split"] = "invalid"
+    with pytest.raises(pydantic.ValidationError):
+        get_ml_aoi_ndjson_dict(item)
+    with pytest.raises(pydantic.ValidationError):
+        write_ml_aoi_ndjson([item], io.BytesIO())
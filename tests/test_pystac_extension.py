@@ -3,21 +3,32 @@
 """
 Test functionalities provided by :class:`MLAOI_Extension`.
 """
+import copy
+import gc
 import unittest
-from typing import cast
+import weakref
+from typing import Any, cast
 
 import pystac
 import pytest
 import shapely
 from dateutil.parser import parse as dt_parse
+from pydantic import ValidationError
 from pystac.extensions.label import LabelExtension, LabelTask, LabelType
 
+from pystac_ml_aoi.extensions import ml_aoi
 from pystac_ml_aoi.extensions.ml_aoi import (
     ML_AOI_SCHEMA_URI,
+    ML_AOI_AssetExtension,
+    ML_AOI_CollectionExtension,
+    ML_AOI_CollectionFields,
     ML_AOI_Extension,
     ML_AOI_ItemExtension,
+    ML_AOI_Resampling,
     ML_AOI_Role,
-    ML_AOI_Split
+    ML_AOI_Split,
+    get_ml_aoi_schema,
+    ml_aoi_trusted
 )
 
 EUROSAT_EXAMPLE_BASE_URL = "https://raw.githubusercontent.com/ai-extensions/stac-data-loader/0.5.0/data/EuroSAT"
@@ -145,6 +156,15 @@ def make_base_stac_item() -> pystac.Item:
     return item
 
 
+def test_ml_aoi_schema_uri_matches_schema() -> None:
+    """
+    Validate that the predefined schema URI remains consistent with the JSON schema definition.
+    """
+    schema = get_ml_aoi_schema()
+    assert schema["$id"].split("#")[0] == ML_AOI_SCHEMA_URI
+    assert getattr(ml_aoi, "ML_AOI_SCHEMA") is schema  # lazy attribute preserved for backward compatibility
+
+
 def test_ml_aoi_pystac_collection_with_apply_method(
     collection: pystac.Collection,
     stac_validator: pystac.validation.stac_validator.JsonSchemaSTACValidator,
@@ -232,6 +252,18 @@ def test_ml_aoi_pystac_item_with_field_property(
     assert ml_aoi_item_json["properties"]["ml-aoi:split"] == "train"
 
 
+@pytest.mark.parametrize("split", ["invalid", 1, ["train"], {}])
+def test_ml_aoi_pystac_item_invalid_field_property(item: pystac.Item, split: Any) -> None:
+    """
+    Validate that invalid ML-AOI property values are rejected without modifying the STAC Item.
+    """
+    ml_aoi_item = ML_AOI_Extension.ext(item, add_if_missing=True)
+    ml_aoi_item.split = ML_AOI_Split.VALIDATE
+    with pytest.raises(ValidationError):
+        ml_aoi_item.split = split
+    assert item.properties["ml-aoi:split"] == ML_AOI_Split.VALIDATE
+
+
 def test_ml_aoi_pystac_item_filter_assets(
     item: pystac.Item,
     stac_validator: pystac.validation.stac_validator.JsonSchemaSTACValidator,
@@ -250,5 +282,205 @@ def test_ml_aoi_pystac_item_filter_assets(
     assert len(assets) == 1 and "label" in assets
 
 
+def test_ml_aoi_pystac_item_filter_assets_cache(item: pystac.Item) -> None:
+    """
+    Validate that cached Asset lookups of the ML-AOI Item are invalidated by Assets modifications.
+    """
+    ml_aoi_item = cast(ML_AOI_ItemExtension, ML_AOI_Extension.ext(item, add_if_missing=True))
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label"]
+    assert list(ml_aoi_item.get_assets(role=[ML_AOI_Role.LABEL, ML_AOI_Role.FEATURE])) == ["label", "raster"]
+    assert ml_aoi_item.get_assets(role="label")["label"] is not item.assets["label"]  # copies
+
+    ML_AOI_Extension.ext(item.assets["raster"]).role = ML_AOI_Role.LABEL
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label", "raster"]
+    assert not ML_AOI_Extension.apply_many([item.assets["raster"]], [{"role": ML_AOI_Role.FEATURE}])
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label"]
+
+    asset = item.assets["label"].clone()
+    item.add_asset("other", asset)
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label", "other"]
+    assert not ml_aoi_item.get_assets(role="label", asset_role="overview")
+
+    asset.extra_fields["ml-aoi:role"] = "feature"  # direct modification must be reported
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label", "other"]
+    ml_aoi_item.clear_assets_cache()
+    assert list(ml_aoi_item.get_assets(role="label")) == ["label"]
+
+
+def test_ml_aoi_pystac_item_filter_assets_cache_released(item: pystac.Item) -> None:
+    """
+    Validate that cached Asset lookups do not keep the ML-AOI Item alive.
+    """
+    item = item.clone()
+    assert list(ML_AOI_ItemExtension(item).get_assets(role="label")) == ["label"]
+    item_ref = weakref.ref(item)
+    del item
+    gc.collect()
+    assert item_ref() is None
+
+
+def test_ml_aoi_pystac_ext_memoized(item: pystac.Item, collection: pystac.Collection) -> None:
+    """
+    Validate that extensions are memoized per STAC object, and refreshed when the extended object changes.
+    """
+    ml_aoi_item = ML_AOI_Extension.ext(item, add_if_missing=True)
+    assert ML_AOI_Extension.ext(item) is ml_aoi_item
+    assert ML_AOI_Extension.ext(item.clone(), add_if_missing=True) is not ml_aoi_item
+
+    ML_AOI_Extension.remove_from(item)
+    with pytest.raises(pystac.ExtensionNotImplemented):
+        ML_AOI_Extension.ext(item)
+    assert ML_AOI_Extension.ext(item, add_if_missing=True) is ml_aoi_item
+    item.stac_extensions.remove(ML_AOI_SCHEMA_URI)
+    with pytest.raises(pystac.ExtensionNotImplemented):
+        ML_AOI_Extension.ext(item)
+    item.stac_extensions.append(ML_AOI_SCHEMA_URI)
+
+    item.properties = dict(item.properties)
+    ml_aoi_item = ML_AOI_Extension.ext(item)
+    assert ml_aoi_item.properties is item.properties
+    ml_aoi_item.split = ML_AOI_Split.TEST
+    assert item.properties["ml-aoi:split"] == ML_AOI_Split.TEST
+
+    asset = item.assets["raster"]
+    ml_aoi_asset = ML_AOI_Extension.ext(asset)
+    assert ML_AOI_Extension.ext(asset) is ml_aoi_asset
+    other = item.clone()
+    other.add_asset("raster", asset)  # changes the owner
+    assert ML_AOI_Extension.ext(asset) is not ml_aoi_asset
+    asset.owner = None
+    assert ML_AOI_Extension.ext(asset).properties is asset.extra_fields
+    with pytest.raises(pystac.STACError):
+        ML_AOI_Extension.ext(asset, add_if_missing=True)
+
+    ml_aoi_collection = ML_AOI_Extension.ext(collection, add_if_missing=True)
+    assert ML_AOI_Extension.ext(collection) is ml_aoi_collection
+    assert "set_self_href" not in vars(collection)  # not patched on the instance
+    assert ML_AOI_Extension.ext(copy.copy(collection)) is not ml_aoi_collection
+    assert ML_AOI_Extension.ext(copy.deepcopy(collection)) is not ml_aoi_collection
+    with pytest.raises(pystac.ExtensionTypeError):
+        ML_AOI_Extension.ext(pystac.Catalog("catalog", "catalog"))
+
+
+def test_ml_aoi_pystac_ext_memoized_released(item: pystac.Item, collection: pystac.Collection) -> None:
+    """
+    Validate that memoized extensions do not keep the extended STAC objects alive.
+    """
+    item = item.clone()
+    collection = collection.clone()
+    ML_AOI_Extension.ext(item, add_if_missing=True).split = ML_AOI_Split.TRAIN
+    ML_AOI_Extension.ext(item.assets["raster"]).role = ML_AOI_Role.FEATURE
+    ML_AOI_Extension.ext(collection, add_if_missing=True).split = [ML_AOI_Split.TRAIN]
+    assert ML_AOI_Extension.ext(item) is ML_AOI_Extension.ext(item)
+    refs = [weakref.ref(item), weakref.ref(item.assets["raster"]), weakref.ref(collection)]
+    del item, collection
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None, None]
+
+
+def test_ml_aoi_pystac_typed_fields(item: pystac.Item, collection: pystac.Collection) -> None:
+    """
+    Validate typed ML-AOI field descriptors of extensions, and that internal attributes are not written as properties.
+    """
+    ml_aoi_item = cast(ML_AOI_ItemExtension, ML_AOI_Extension.ext(item, add_if_missing=True))
+    properties = dict(item.properties)
+    ml_aoi_item.item = item
+    ml_aoi_item.properties = item.properties
+    assert item.properties == properties
+    assert ml_aoi_item.split is None
+    ml_aoi_item.split = ML_AOI_Split.TRAIN
+    assert ml_aoi_item.split is ML_AOI_Split.TRAIN
+    ml_aoi_item.split = "test"
+    assert ml_aoi_item.split is ML_AOI_Split.TEST
+    with pytest.raises(ValidationError):
+        ml_aoi_item.split = "invalid"
+
+    ml_aoi_asset = cast(ML_AOI_AssetExtension, ML_AOI_Extension.ext(item.assets["raster"]))
+    assert ml_aoi_asset.role is ML_AOI_Role.FEATURE
+    assert ml_aoi_asset.reference_grid is True
+    assert ml_aoi_asset.resampling_method is None
+    ml_aoi_asset.resampling_method = "bilinear"
+    assert ml_aoi_asset.resampling_method is ML_AOI_Resampling.BILINEAR
+    assert item.assets["raster"].extra_fields["ml-aoi:resampling-method"] == "bilinear"
+    ml_aoi_asset.reference_grid = False
+    assert item.assets["raster"].extra_fields["ml-aoi:reference-grid"] is False
+
+    ml_aoi_col = cast(ML_AOI_CollectionExtension, ML_AOI_Extension.ext(collection, add_if_missing=True))
+    assert ml_aoi_col.split is None
+    ml_aoi_col.split = [ML_AOI_Split.TRAIN, "validate"]
+    assert ml_aoi_col.split == [ML_AOI_Split.TRAIN, ML_AOI_Split.VALIDATE]
+
+
+def test_ml_aoi_pystac_apply_many(
+    item: pystac.Item,
+    collection: pystac.Collection,
+    stac_validator: pystac.validation.stac_validator.JsonSchemaSTACValidator,
+) -> None:
+    """
+    Validate extending multiple STAC objects with ML-AOI extension in a single operation.
+    """
+    items = [item.clone() for _ in range(3)]
+    for idx, _item in enumerate(items):
+        _item.id = f"{item.id}-{idx}"
+        if ML_AOI_SCHEMA_URI in _item.stac_extensions:
+            _item.stac_extensions.remove(ML_AOI_SCHEMA_URI)
+    splits = [{"split": ML_AOI_Split.TRAIN}, {"split": "test"}, {"split": "invalid"}]
+    errors = ML_AOI_Extension.apply_many(items, splits, add_if_missing=True)
+    assert list(errors) == [2]
+    assert errors[2][0]["loc"] == ("split",)
+    assert items[0].properties["ml-aoi:split"] == "train"
+    assert items[1].properties["ml-aoi:split"] == "test"
+    assert "ml-aoi:split" not in items[2].properties
+    assert all(ML_AOI_SCHEMA_URI in _item.stac_extensions for _item in items[:2])
+    assert ML_AOI_SCHEMA_URI not in items[2].stac_extensions  # left untouched when validation fails
+
+    assets = list(items[0].assets.values())
+    errors = ML_AOI_Extension.apply_many(assets, {"role": ML_AOI_Role.FEATURE, "reference_grid": False})
+    assert not errors
+    assert all(asset.extra_fields["ml-aoi:role"] == "feature" for asset in assets)
+    assert all(asset.extra_fields["ml-aoi:reference-grid"] is False for asset in assets)
+
+    errors = ML_AOI_Extension.apply_many([collection], {"split": [ML_AOI_Split.TRAIN]}, add_if_missing=True)
+    assert not errors
+    assert collection.to_dict()["summaries"] == {"ml-aoi:split": ["train"]}
+
+    with pytest.raises(pystac.ExtensionTypeError):
+        ML_AOI_Extension.apply_many([item], ML_AOI_CollectionFields(split=[ML_AOI_Split.TRAIN]))
+
+
+def test_ml_aoi_pystac_trusted_scope(
+    item: pystac.Item,
+    collection: pystac.Collection,
+) -> None:
+    """
+    Validate that ML-AOI fields are assigned without validation within a trusted scope.
+    """
+    ml_aoi_item = ML_AOI_Extension.ext(item, add_if_missing=True)
+    ml_aoi_asset = ML_AOI_Extension.ext(item.assets["raster"])
+    ml_aoi_col = ML_AOI_Extension.ext(collection, add_if_missing=True)
+    with ml_aoi_trusted():
+        ml_aoi_item.split = "not-validated"
+        ml_aoi_asset.apply(resampling_method=ML_AOI_Resampling.BILINEAR)
+        ml_aoi_col.split = ML_AOI_Split.TEST
+    assert item.properties["ml-aoi:split"] == "not-validated"
+    assert item.assets["raster"].extra_fields["ml-aoi:resampling-method"] == "bilinear"
+    assert collection.summaries.get_list("ml-aoi:split") == ["test"]
+    with pytest.raises(ValidationError):
+        ml_aoi_item.validate_ml_aoi_fields()
+    ml_aoi_asset.validate_ml_aoi_fields()
+    ml_aoi_col.validate_ml_aoi_fields()
+
+    with pytest.raises(ValidationError):
+        with ml_aoi_trusted(validate=True):
+            ml_aoi_col.split = ML_AOI_Split.TRAIN
+            ml_aoi_item.apply(split="still-not-validated")
+    assert item.properties["ml-aoi:split"] == "still-not-validated"
+    with ml_aoi_trusted(validate=True):
+        ml_aoi_item.split = ML_AOI_Split.VALIDATE
+
+    with pytest.raises(ValidationError):
+        ml_aoi_item.split = "validated"
+
+
 if __name__ == "__main__":
     unittest.main()
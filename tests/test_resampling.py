@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the resampling of raster arrays provided by :mod:`pystac_ml_aoi.resampling`.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Resampling
+from pystac_ml_aoi.resampling import ML_AOI_RESAMPLING_KERNELS, resample_ml_aoi_array
+
+AGGREGATIONS = [method for method in ML_AOI_Resampling if method not in ML_AOI_RESAMPLING_KERNELS and method != "near"]
+
+
+def reference_aggregate(data: np.ndarray, shape, method: ML_AOI_Resampling, window, nodata: Optional[float]):
+    """
+    Aggregates covered source pixels one output pixel at a time.
+    """
+    col_off, row_off, width, height = window
+    scale_x, scale_y = width / shape[1], height / shape[0]
+    result = np.full(shape, np.nan)
+    for row in range(shape[0]):
+        for col in range(shape[1]):
+            y0, y1 = row_off + row * scale_y, row_off + (row + 1) * scale_y
+            x0, x1 = col_off + col * scale_x, col_off + (col + 1) * scale_x
+            values, weights = [], []
+            for src_row in range(max(0, math.floor(y0)), min(data.shape[0], math.ceil(y1))):
+                for src_col in range(max(0, math.floor(x0)), min(data.shape[1], math.ceil(x1))):
+                    cover = (min(y1, src_row + 1) - max(y0, src_row)) * (min(x1, src_col + 1) - max(x0, src_col))
+                    value = data[src_row, src_col]
+                    if cover > 1e-9 and value != nodata:
+                        values.append(value)
+                        weights.append(cover)
+            if not values:
+                continue
+            values, weights = np.asarray(values, dtype=float), np.asarray(weights)
+            if method == ML_AOI_Resampling.AVERAGE:
+                result[row, col] = np.average(values, weights=weights)
+            elif method == ML_AOI_Resampling.RMS:
+                result[row, col] = np.sqrt(np.average(values ** 2, weights=weights))
+            elif method == ML_AOI_Resampling.SUM:
+                result[row, col] = np.sum(values * weights)
+            elif method == ML_AOI_Resampling.MIN:
+                result[row, col] = values.min()
+            elif method == ML_AOI_Resampling.MAX:
+                result[row, col] = values.max()
+            elif method == ML_AOI_Resampling.MODE:
+                uniques, counts = np.unique(values, return_counts=True)
+                result[row, col] = uniques[np.argmax(counts)]
+            else:
+                quantile = {"q1": 0.25, "med": 0.5, "q3": 0.75}[method.value]
+                result[row, col] = np.sort(values)[int(math.floor(quantile * (len(values) - 1)))]
+    return result
+
+
+@pytest.mark.parametrize("method", AGGREGATIONS)
+@pytest.mark.parametrize(
+    ["shape", "window"],
+    [
+        ((8, 8), None),  # integer factor
+        ((6, 5), None),  # fractional factors
+        ((7, 9), (1.5, 2.25, 12.0, 10.5)),  # fractional window
+        ((30, 30), None),  # upsampling
+    ],
+)
+def test_resample_aggregations_reference(method: ML_AOI_Resampling, shape, window) -> None:
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 5, size=(16, 16)).astype(np.float32)
+    data[3:9, 3:9] = -1  # nodata region covering whole output pixels
+    expected = reference_aggregate(data, shape, method, window or (0, 0, 16, 16), nodata=-1)
+    result = resample_ml_aoi_array(data, shape, method, window=window, nodata=-1)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, np.where(np.isnan(expected), -1, expected), rtol=1e-5)
+
+
+def test_resample_integer_factors() -> None:
+    data = np.arange(64, dtype=np.int16).reshape(8, 8)
+    blocks = data.reshape(4, 2, 4, 2).transpose(0, 2, 1, 3).reshape(4, 4, 4)
+    np.testing.assert_array_equal(resample_ml_aoi_array(data, (4, 4), "average"), np.rint(blocks.mean(axis=-1)))
+    np.testing.assert_array_equal(resample_ml_aoi_array(data, (4, 4), "sum"), blocks.sum(axis=-1))
+    np.testing.assert_array_equal(resample_ml_aoi_array(data, (4, 4), "max"), blocks.max(axis=-1))
+    np.testing.assert_array_equal(resample_ml_aoi_array(data, (4, 4), "near"), data[1::2, 1::2])
+    np.testing.assert_array_equal(resample_ml_aoi_array(data, (16, 16), "near"), data.repeat(2, 0).repeat(2, 1))
+    assert resample_ml_aoi_array(data, (4, 4), "sum").dtype == np.int16
+
+
+@pytest.mark.parametrize("method", list(ML_AOI_Resampling))
+def test_resample_constant_and_bands(method: ML_AOI_Resampling) -> None:
+    data = np.stack([np.full((10, 12), 3.0), np.full((10, 12), 7.0)])
+    result = resample_ml_aoi_array(data, (4, 5), method)
+    expected = [3.0, 7.0] if method != "sum" else [3.0 * 6, 7.0 * 6]
+    assert result.shape == (2, 4, 5)
+    np.testing.assert_allclose(result[:, 1:-1, 1:-1].mean(axis=(1, 2)), expected)
+    if method != "sum":
+        np.testing.assert_allclose(result, np.asarray(expected)[:, None, None] * np.ones((2, 4, 5)))
+
+
+@pytest.mark.parametrize("method", list(ML_AOI_RESAMPLING_KERNELS))
+def test_resample_kernels(method: ML_AOI_Resampling) -> None:
+    ramp = np.add.outer(np.arange(32.0), 2 * np.arange(32.0))
+    if method != ML_AOI_Resampling.CUBCSPLINE:  # the B-spline smooths rather than interpolates
+        np.testing.assert_allclose(resample_ml_aoi_array(ramp, ramp.shape, method), ramp, atol=1e-9)
+    # linear values are preserved away from the edges when upsampling with any offset, or downsampling by 2
+    for shape, window in [((64, 64), None), ((16, 16), None), ((40, 30), (3.5, 2.25, 24, 25))]:
+        col_off, row_off, width, height = window or (0, 0, 32, 32)
+        rows = row_off + (np.arange(shape[0]) + 0.5) * height / shape[0] - 0.5
+        cols = col_off + (np.arange(shape[1]) + 0.5) * width / shape[1] - 0.5
+        expected = np.add.outer(rows, 2 * cols)
+        result = resample_ml_aoi_array(ramp, shape, method, window=window)
+        margin = slice(math.ceil(shape[0] / 32 * 8), -math.ceil(shape[0] / 32 * 8))
+        atol = 0.1 if method == ML_AOI_Resampling.LANCZOS else 1e-6  # only approximately linear
+        np.testing.assert_allclose(result[margin, margin], expected[margin, margin], atol=atol)
+
+
+@pytest.mark.parametrize("method", ["near", "bilinear", "lanczos", "average", "mode", "med"])
+def test_resample_masked_chunked(method: str) -> None:
+    rng = np.random.default_rng(1)
+    data = np.ma.MaskedArray(rng.normal(size=(3, 50, 40)), mask=rng.random((3, 50, 40)) < 0.2)
+    data.mask[:, :20, :20] = True  # beyond the widened support of all kernels for the first output pixel
+    result = resample_ml_aoi_array(data, (17, 13), method)
+    assert isinstance(result, np.ma.MaskedArray)
+    assert result.mask[:, 0, 0].all() and not result.mask.all()
+    assert np.all(result.data[result.mask] == 0)
+    chunked = resample_ml_aoi_array(data, (17, 13), method, max_memory=1)
+    np.testing.assert_array_equal(chunked.mask, result.mask)
+    np.testing.assert_allclose(chunked.data, result.data)
+
+    # outside of the source extent
+    outside = resample_ml_aoi_array(data.data, (4, 4), method, window=(30, 40, 20, 20), nodata=np.nan)
+    assert np.isnan(outside[:, -1, -1]).all() and not np.isnan(outside[:, 0, 0]).any()
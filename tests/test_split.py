@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test ML-AOI split utilities provided by :mod:`pystac_ml_aoi.split`.
+"""
+import datetime
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pystac
+import pytest
+import shapely
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Split, ML_AOI_SplitType
+from pystac_ml_aoi.split import assign_spatial_splits, find_split_overlaps
+
+
+def make_split_items(footprints: List[Tuple[str, Optional[ML_AOI_SplitType], List[float]]]) -> List[pystac.Item]:
+    items = []
+    for item_id, split, bbox in footprints:
+        item = pystac.Item(
+            id=item_id,
+            geometry=shapely.geometry.mapping(shapely.box(*bbox)),
+            bbox=bbox,
+            datetime=datetime.datetime(2024, 1, 1),
+            properties={},
+        )
+        if split:
+            ML_AOI_Extension.ext(item, add_if_missing=True).split = split
+        items.append(item)
+    return items
+
+
+def test_find_split_overlaps() -> None:
+    items = make_split_items([
+        ("train-0", ML_AOI_Split.TRAIN, [0, 0, 1, 1]),
+        ("train-1", ML_AOI_Split.TRAIN, [1, 0, 2, 1]),
+        ("test-0", ML_AOI_Split.TEST, [2, 0, 3, 1]),  # touches 'train-1' only
+        ("test-1", ML_AOI_Split.TEST, [0.5, 0.5, 1.5, 1.5]),  # overlaps both 'train' by 1/4
+        ("validate-0", ML_AOI_Split.VALIDATE, [1.9, 0, 3, 1]),  # overlaps 'train-1' by 1/10, 'test-0' almost fully
+    ])
+    items.append(pystac.Item("no-split", geometry=None, bbox=[0, 0, 3, 3], datetime=items[0].datetime, properties={}))
+
+    overlaps = find_split_overlaps(items)
+    found = {(overlap.item_id, overlap.other_item_id): round(overlap.ratio, 3) for overlap in overlaps}
+    assert found == {
+        ("test-0", "validate-0"): 1.0,
+        ("test-1", "train-0"): 0.25,
+        ("test-1", "train-1"): 0.25,
+        ("train-1", "validate-0"): 0.1,
+    }
+    assert all(overlap.split != overlap.other_split for overlap in overlaps)
+
+    overlaps = find_split_overlaps(items, threshold=0.2)
+    assert len(overlaps) == 3
+    overlaps = find_split_overlaps(items, threshold=0.5, relative=False)
+    assert [(overlap.item_id, overlap.other_item_id) for overlap in overlaps] == [("test-0", "validate-0")]
+
+
+def test_find_split_overlaps_bbox_3d() -> None:
+    items = make_split_items([
+        ("train-0", ML_AOI_Split.TRAIN, [0, 0, 1, 1]),
+        ("test-0", ML_AOI_Split.TEST, [0, 0, 1, 1]),
+    ])
+    items[1].geometry = None
+    items[1].bbox = [0.5, 0, -10, 1.5, 1, 10]  # 3D bbox overlapping half of 'train-0'
+    overlaps = find_split_overlaps(items)
+    assert [(overlap.item_id, overlap.other_item_id, overlap.ratio) for overlap in overlaps] == [
+        ("test-0", "train-0", 0.5)
+    ]
+
+    items[0].properties["ml-aoi:split"] = "invalid"
+    with pytest.raises(ValueError, match="invalid"):
+        find_split_overlaps(items)
+
+
+def test_assign_spatial_splits() -> None:
+    rng = np.random.default_rng(42)
+    coords = rng.uniform(0, 100, size=(2000, 2))
+    items = make_split_items([
+        (f"item-{index}", None, [x, y, x + 0.1, y + 0.1]) for index, (x, y) in enumerate(coords)
+    ])
+    splits = assign_spatial_splits(items, block_size=10)
+    assert [item.properties["ml-aoi:split"] for item in items] == [split.value for split in splits]
+    assert all(ML_AOI_Extension.has_extension(item) for item in items)
+
+    # all items of a block share the same split
+    blocks = {}
+    for (x, y), split in zip(coords, splits):
+        blocks.setdefault((int((x + 0.05) // 10), int((y + 0.05) // 10)), set()).add(split)
+    assert all(len(block_splits) == 1 for block_splits in blocks.values())
+    counts = Counter(split for block_splits in blocks.values() for split in block_splits)
+    assert counts[ML_AOI_Split.TRAIN] > counts[ML_AOI_Split.VALIDATE] and counts[ML_AOI_Split.TRAIN] > counts["test"]
+    assert not find_split_overlaps(items)
+
+    # stable for re-runs, and for appended items within already assigned blocks
+    assert assign_spatial_splits(items, block_size=10, apply=False) == splits
+    appended = make_split_items([("appended", None, [coords[0][0], coords[0][1], coords[0][0], coords[0][1]])])
+    assert assign_spatial_splits(appended, block_size=10) == splits[:1]
+    assert assign_spatial_splits(items, block_size=10, seed=1, apply=False) != splits
+    negative = assign_spatial_splits(items, block_size=10, seed=-1, apply=False)
+    assert negative == assign_spatial_splits(items, block_size=10, seed=2 ** 64 - 1, apply=False)
+    assert negative != splits
+
+    splits = assign_spatial_splits(items, ratios={"train": 1, "test": 0}, block_size=(10, 5), apply=False)
+    assert set(splits) == {ML_AOI_Split.TRAIN}
+    with pytest.raises(ValueError):
+        assign_spatial_splits(items, ratios={"train": 0})
+
+
+def test_assign_spatial_splits_bbox_3d() -> None:
+    coords = np.random.default_rng(0).uniform(0, 100, size=(200, 2))
+    items = make_split_items([(f"item-{index}", None, [x, y, x + 1, y + 1]) for index, (x, y) in enumerate(coords)])
+    items_3d = make_split_items([(item.id, None, item.bbox) for item in items])
+    for item in items_3d:
+        minx, miny, maxx, maxy = item.bbox
+        item.bbox = [minx, miny, -1000.0, maxx, maxy, 1000.0]
+    splits = assign_spatial_splits(items, block_size=10, apply=False)
+    assert assign_spatial_splits(items_3d, block_size=10, apply=False) == splits
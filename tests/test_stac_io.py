@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test the cached STAC I/O provided by :mod:`pystac_ml_aoi.stac_io`.
+"""
+import os
+import shutil
+import urllib.error
+
+import pystac
+import pytest
+
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_Extension, ML_AOI_Split
+from pystac_ml_aoi.stac_io import ML_AOI_CachedStacIO
+from tests.conftest import HTTPStandIn
+from tests.test_validation import EXAMPLE_ITEM, EXAMPLES_DIR
+
+
+def test_cached_stac_io_conditional_requests(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    shutil.copy(os.path.join(EXAMPLES_DIR, EXAMPLE_ITEM), os.path.join(http_stand_in.root, "item.json"))
+    with open(os.path.join(http_stand_in.root, "label.geojson"), mode="w", encoding="utf-8") as file:
+        file.write("{\"type\": \"FeatureCollection\", \"features\": []}")
+    item_url = f"{http_stand_in.url}/item.json"
+    cache_dir = str(tmp_path / "cache")
+
+    with ML_AOI_CachedStacIO(cache_dir=cache_dir) as stac_io:
+        item = pystac.Item.from_file(item_url, stac_io=stac_io)
+        assert ML_AOI_Extension.ext(item).split == ML_AOI_Split.TRAIN
+        assert stac_io.is_cached(item_url)
+        label = stac_io.read_bytes(f"{http_stand_in.url}/label.geojson")
+        assert label.startswith(b"{\"type\": \"FeatureCollection\"")
+
+        # unchanged contents are not transferred again
+        pystac.Item.from_file(item_url, stac_io=stac_io)
+        assert [status for _, status, _ in http_stand_in.requests] == [200, 200, 304]
+        # single pooled connection reused across requests
+        assert len({port for _, _, port in http_stand_in.requests}) == 1
+
+        with pytest.raises(urllib.error.HTTPError):
+            stac_io.read_bytes(f"{http_stand_in.url}/missing.json")
+        assert not stac_io.is_cached(f"{http_stand_in.url}/missing.json")
+
+    # modified contents are fetched again
+    with open(os.path.join(http_stand_in.root, "label.geojson"), mode="a", encoding="utf-8") as file:
+        file.write("\n")
+    http_stand_in.requests.clear()
+    stac_io = ML_AOI_CachedStacIO(cache_dir=cache_dir)
+    assert stac_io.read_bytes(f"{http_stand_in.url}/label.geojson").endswith(b"\n")
+    assert [status for _, status, _ in http_stand_in.requests] == [200]
+
+    # cached contents are used directly without revalidation
+    stac_io = ML_AOI_CachedStacIO(cache_dir=cache_dir, revalidate=False)
+    pystac.Item.from_file(item_url, stac_io=stac_io)
+    assert len(http_stand_in.requests) == 1
+
+
+def test_cached_stac_io_offline(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    shutil.copy(os.path.join(EXAMPLES_DIR, EXAMPLE_ITEM), os.path.join(http_stand_in.root, "item.json"))
+    item_url = f"{http_stand_in.url}/item.json"
+    cache_dir = str(tmp_path / "cache")
+    with ML_AOI_CachedStacIO(cache_dir=cache_dir) as stac_io:
+        item = pystac.Item.from_file(item_url, stac_io=stac_io)
+
+    offline_io = ML_AOI_CachedStacIO(cache_dir=cache_dir, offline=True)
+    offline_item = pystac.Item.from_file(item_url, stac_io=offline_io)
+    assert offline_item.properties == item.properties and offline_item.assets.keys() == item.assets.keys()
+    assert len(http_stand_in.requests) == 1
+    with pytest.raises(FileNotFoundError):
+        offline_io.read_text(f"{http_stand_in.url}/other.json")
+
+    # local files are read directly
+    local_path = os.path.join(EXAMPLES_DIR, EXAMPLE_ITEM)
+    assert pystac.Item.from_file(local_path, stac_io=offline_io).id == item.id
+    assert not offline_io.is_cached(local_path)
+
+
+def test_cached_stac_io_lru_eviction(http_stand_in: HTTPStandIn, tmp_path) -> None:
+    for name in ["a", "b", "c", "d"]:
+        with open(os.path.join(http_stand_in.root, f"{name}.json"), mode="w", encoding="utf-8") as file:
+            file.write(f"{{\"name\": \"{name}\", \"data\": \"{name * 100}\"}}")
+    size = os.path.getsize(os.path.join(http_stand_in.root, "a.json"))
+    stac_io = ML_AOI_CachedStacIO(cache_dir=str(tmp_path / "cache"), max_size=size * 3)
+    urls = {name: f"{http_stand_in.url}/{name}.json" for name in ["a", "b", "c", "d"]}
+    for name in ["a", "b", "c"]:
+        stac_io.read_json(urls[name])
+        os.utime(stac_io.get_cached_path(urls[name]), (0, {"a": 3, "b": 1, "c": 2}[name]))
+    assert stac_io.size == size * 3
+
+    stac_io.read_json(urls["d"])  # evicts least recently used 'b'
+    assert stac_io.size == size * 3
+    assert [stac_io.is_cached(url) for url in urls.values()] == [True, False, True, True]
+    assert stac_io.read_json(urls["b"])["name"] == "b"  # fetched again
+    assert stac_io.is_cached(urls["b"]) and stac_io.size == size * 3
+
+    stac_io.clear()
+    assert stac_io.size == 0
+    assert not any(stac_io.is_cached(url) for url in urls.values())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test ML-AOI Collection summaries provided by :mod:`pystac_ml_aoi.summaries`.
+"""
+import datetime
+from typing import Any
+
+import pystac
+import pytest
+import shapely
+
+from pystac_ml_aoi.changes import ML_AOI_ChangeTracker
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_SCHEMA_URI, ML_AOI_Extension, ML_AOI_Split
+from pystac_ml_aoi.summaries import summarize_ml_aoi_collection
+
+
+@pytest.fixture(scope="function", name="collection")
+def make_summarized_collection() -> pystac.Collection:
+    extent = pystac.Extent(
+        spatial=pystac.SpatialExtent(bboxes=[[0, 0, 10, 10]]),
+        temporal=pystac.TemporalExtent(intervals=[[datetime.datetime(2024, 1, 1), None]]),
+    )
+    collection = pystac.Collection(id="ml-aoi-summaries", description="ML-AOI summaries test.", extent=extent)
+    for index, split in enumerate([ML_AOI_Split.TEST, ML_AOI_Split.TRAIN, ML_AOI_Split.TRAIN, None]):
+        item = pystac.Item(
+            id=f"item-{index}",
+            geometry=shapely.geometry.mapping(shapely.box(index, 0, index + 1, index + 1)),
+            bbox=[index, 0, index + 1, index + 1],
+            datetime=datetime.datetime(2024, 1, 1),
+            properties={"label:classes": [{"name": "class", "classes": ["Residential", "Forest"][:index % 2 + 1]}]},
+        )
+        item.add_asset("label", pystac.Asset(href=f"label-{index}.geojson", extra_fields={"ml-aoi:role": "label"}))
+        item.add_asset("raster", pystac.Asset(href=f"raster-{index}.tif", extra_fields={
+            "ml-aoi:role": "feature",
+            "ml-aoi:resampling-method": ["near", "bilinear"][index % 2],
+        }))
+        if split:
+            ML_AOI_Extension.ext(item, add_if_missing=True).split = split
+        collection.add_item(item)
+    return collection
+
+
+def check_statistics(stats: Any) -> None:
+    assert stats.splits == [ML_AOI_Split.TRAIN, ML_AOI_Split.TEST]
+    assert stats.counts == {"test": 1, "train": 2, None: 1}
+    assert stats.areas == {"test": 1.0, "train": 5.0, None: 4.0}
+    assert stats.classes == {
+        "test": {"class": {"Residential": 1}},
+        "train": {"class": {"Residential": 2, "Forest": 1}},
+        None: {"class": {"Residential": 1, "Forest": 1}},
+    }
+    assert stats.roles == {"label", "feature"}
+    assert stats.resampling_methods == {"near", "bilinear"}
+
+
+def test_summarize_ml_aoi_collection(collection: pystac.Collection) -> None:
+    stats = summarize_ml_aoi_collection(collection)
+    check_statistics(stats)
+    assert ML_AOI_SCHEMA_URI in collection.stac_extensions
+    assert collection.summaries.get_list("ml-aoi:split") == ["train", "test"]
+
+
+def test_summarize_ml_aoi_collection_tracked(collection: pystac.Collection) -> None:
+    with ML_AOI_ChangeTracker() as tracker:
+        summarize_ml_aoi_collection(collection)
+    assert tracker.get_changes(collection).fields
+    tracker.clear()
+
+    for item in list(collection.get_items()):
+        item.properties.pop("ml-aoi:split", None)
+    with ML_AOI_ChangeTracker() as tracker:
+        summarize_ml_aoi_collection(collection)
+    assert collection.summaries.get_list("ml-aoi:split") is None
+    assert tracker.get_changes(collection).fields
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_summarize_ml_aoi_collection_from_file(collection: pystac.Collection, tmp_path: Any, processes: int) -> None:
+    collection.normalize_hrefs(str(tmp_path))
+    collection.save(catalog_type=pystac.CatalogType.SELF_CONTAINED)
+    collection = pystac.Collection.from_file(collection.get_self_href())
+    stats = summarize_ml_aoi_collection(collection, processes=processes, chunk_size=1, apply=False)
+    check_statistics(stats)
+    assert collection.summaries.get_list("ml-aoi:split") is None
+    assert not any(link.is_resolved() for link in collection.get_item_links())  # Items are not kept in memory
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test catalog validation utilities provided by :mod:`pystac_ml_aoi.validation`.
+"""
+import copy
+import json
+import os
+import random
+from typing import Any, Dict
+
+import jsonschema
+import pystac
+import pytest
+
+from pystac_ml_aoi.catalog import iter_stac_hrefs
+from pystac_ml_aoi.extensions.ml_aoi import ML_AOI_SCHEMA_URI, ML_AOI_Role, ML_AOI_Split, get_ml_aoi_schema
+from pystac_ml_aoi.validation import (
+    compile_ml_aoi_schema,
+    get_ml_aoi_fast_validator,
+    iter_validate_ml_aoi_catalog,
+    validate_ml_aoi_catalog,
+    validate_ml_aoi_document
+)
+from tests.test_catalog import make_ml_aoi_catalog
+
+CUR_DIR = os.path.dirname(__file__)
+ROOT_DIR = os.path.dirname(CUR_DIR)
+EXAMPLES_DIR = os.path.join(ROOT_DIR, "examples")
+EXAMPLE_ITEM = "item_EuroSAT-subset-train-sample-42-class-Residential.geojson"
+EXAMPLE_COLLECTION = "collection_EuroSAT-subset-train.json"
+
+FUZZ_VALUES = [
+    "train", "test", "validate", "label", "feature", "near", "q3", "sum", "invalid", "", "ml-aoi:split",
+    ML_AOI_Split.TEST, ML_AOI_Role.LABEL, True, False, 0, 1, 1.0, 2.5, None, [], {}, ["train"], ["invalid"],
+    ["train", 1], [True], {"ml-aoi:split": "train"}, [ML_AOI_SCHEMA_URI], ML_AOI_SCHEMA_URI,
+]
+FUZZ_FIELDS = ["ml-aoi:split", "ml-aoi:role", "ml-aoi:reference-grid", "ml-aoi:resampling-method", "ml-aoi:other"]
+
+
+def fuzz_ml_aoi_document(rng: random.Random, documents: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Generates a random variation of an ML-AOI STAC Item or Collection.
+    """
+    data = copy.deepcopy(rng.choice(list(documents.values())))
+    for _ in range(rng.randint(0, 4)):
+        mutation = rng.randrange(6)
+        if mutation == 0:
+            target = data.get(rng.choice(["properties", "summaries"]))
+            if isinstance(target, dict):
+                target[rng.choice(FUZZ_FIELDS)] = rng.choice(FUZZ_VALUES)
+        elif mutation == 1:
+            assets = data.get(rng.choice(["assets", "item_assets"]))
+            if isinstance(assets, dict):
+                asset = assets.setdefault(rng.choice(list(assets) + ["fuzz"]), {})
+                if isinstance(asset, dict):
+                    asset[rng.choice(FUZZ_FIELDS)] = rng.choice(FUZZ_VALUES)
+                else:
+                    assets["fuzz"] = rng.choice(FUZZ_VALUES)
+        elif mutation == 2:
+            data["type"] = rng.choice(["Feature", "Collection", "Catalog", 1, None])
+        elif mutation == 3:
+            data.pop(rng.choice(["type", "properties", "assets", "item_assets", "summaries", "stac_extensions"]), None)
+        elif mutation == 4:
+            data[rng.choice(["properties", "assets", "item_assets", "summaries", "stac_extensions"])] = (
+                rng.choice(FUZZ_VALUES)
+            )
+        else:
+            extensions = data.get("stac_extensions")
+            if isinstance(extensions, list):
+                if ML_AOI_SCHEMA_URI in extensions and rng.random() < 0.5:
+                    extensions.remove(ML_AOI_SCHEMA_URI)
+                else:
+                    extensions.insert(rng.randint(0, len(extensions)), rng.choice(FUZZ_VALUES))
+    return data
+
+
+@pytest.fixture(scope="function", name="catalog")
+def make_catalog(tmp_path: Any) -> pystac.Catalog:
+    catalog = make_ml_aoi_catalog(str(tmp_path))
+    # corrupt one Item and one Collection on disk
+    item_href = catalog.get_child("collection-test").get_item("item-test-1").get_self_href()
+    with open(item_href, mode="r", encoding="utf-8") as item_file:
+        item_data = json.load(item_file)
+    item_data["properties"]["ml-aoi:split"] = "invalid"
+    with open(item_href, mode="w", encoding="utf-8") as item_file:
+        json.dump(item_data, item_file)
+    col_href = catalog.get_child("collection-train").get_self_href()
+    with open(col_href, mode="r", encoding="utf-8") as col_file:
+        col_data = json.load(col_file)
+    col_data["summaries"]["ml-aoi:split"] = ["invalid"]
+    with open(col_href, mode="w", encoding="utf-8") as col_file:
+        json.dump(col_data, col_file)
+    return catalog
+
+
+def test_validate_ml_aoi_document() -> None:
+    with open(os.path.join(EXAMPLES_DIR, EXAMPLE_ITEM), mode="r", encoding="utf-8") as item_file:
+        item_data = json.load(item_file)
+    result = validate_ml_aoi_document(item_data)
+    assert result.valid, result.errors
+
+    item_data["properties"]["ml-aoi:split"] = "invalid"
+    next(iter(item_data["assets"].values()))["ml-aoi:role"] = "invalid"
+    result = validate_ml_aoi_document(item_data, href="item.json")
+    assert not result.valid
+    paths = sorted(path for path, _ in result.errors)
+    # only errors of the Item definition are reported, not the mismatching Collection 'oneOf' definition
+    assert paths == ["/assets/*/ml-aoi:role", "/properties/ml-aoi:split"]
+
+
+def test_fast_validator_matches_jsonschema() -> None:
+    """
+    Differential test of the compiled ML-AOI schema check against the generic JSON schema validator.
+    """
+    documents = {}
+    for name in [EXAMPLE_ITEM, EXAMPLE_COLLECTION]:
+        with open(os.path.join(EXAMPLES_DIR, name), mode="r", encoding="utf-8") as example_file:
+            documents[name] = json.load(example_file)
+    validator = jsonschema.Draft7Validator(get_ml_aoi_schema())
+    fast_validator = get_ml_aoi_fast_validator()
+    rng = random.Random(42)
+    results = {True: 0, False: 0}
+    for _ in range(2000):
+        data = fuzz_ml_aoi_document(rng, documents)
+        expected = validator.is_valid(data)
+        assert fast_validator(data) is expected, json.dumps(data, default=str)
+        results[expected] += 1
+    assert all(count > 200 for count in results.values()), "fuzzing must cover both valid and invalid documents"
+
+
+@pytest.mark.parametrize(
+    ["schema", "instances"],
+    [
+        ({"type": ["integer", "null"]}, [1, 1.0, 1.5, True, None, "1"]),
+        ({"type": "number", "enum": [1, True, "a", [1]]}, [1, 1.0, True, False, "a", [1], [True]]),
+        ({"const": {"a": [False]}}, [{"a": [False]}, {"a": [0]}, {"a": []}, {}]),
+        (
+            {"patternProperties": {"^x-": {"type": "string"}}, "additionalProperties": False, "properties": {"a": {}}},
+            [{"a": 1, "x-b": "c"}, {"x-b": 1}, {"b": 1}, [], "x"],
+        ),
+        ({"items": {"oneOf": [{"type": "string"}, {"enum": ["a", 1]}]}}, [["a"], ["b", 1], [1.0], [False], {}]),
+    ],
+)
+def test_compile_ml_aoi_schema_keywords(schema: Dict[str, Any], instances: Any) -> None:
+    check = compile_ml_aoi_schema(schema)
+    validator = jsonschema.Draft7Validator(schema)
+    for instance in instances:
+        assert check(instance) is validator.is_valid(instance), instance
+
+
+def test_compile_ml_aoi_schema_unsupported() -> None:
+    with pytest.raises(NotImplementedError):
+        compile_ml_aoi_schema({"minLength": 1})
+    with pytest.raises(NotImplementedError):
+        compile_ml_aoi_schema({"$ref": "https://example.com/schema.json"})
+
+
+def test_iter_stac_hrefs(catalog: pystac.Catalog) -> None:
+    hrefs = list(iter_stac_hrefs(catalog.get_self_href()))
+    assert len(hrefs) == 1 + 3 + 9
+    assert hrefs[0] == catalog.get_self_href()
+    assert len(set(hrefs)) == len(hrefs)
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_validate_ml_aoi_catalog(catalog: pystac.Catalog, processes: Any) -> None:
+    summary = validate_ml_aoi_catalog(catalog.get_self_href(), processes=processes, chunk_size=2)
+    assert summary.total == 3 + 9  # root catalog does not declare the extension
+    assert sorted(os.path.basename(href) for href in summary.invalid) == ["collection.json", "item-test-1.json"]
+    assert summary.errors == {"/properties/ml-aoi:split": 1, "/summaries/ml-aoi:split/0": 1}
+
+    results = list(iter_validate_ml_aoi_catalog(catalog.get_self_href(), processes=processes, chunk_size=5))
+    assert len(results) == 12
+    assert sum(not result.valid for result in results) == 2